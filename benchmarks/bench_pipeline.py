@@ -0,0 +1,167 @@
+"""
+Offline benchmark of the load pipeline.
+
+Runs every stage of the pipeline against the fake pykrx in `benchmarks.fake_krx` for 
+several date-range and universe sizes and reports wall time and peak memory 
+(tracemalloc) per stage. Nothing touches the network or the user's local store.
+
+Usage:
+    python -m benchmarks.bench_pipeline
+    python -m benchmarks.bench_pipeline --days 20 250 --universe 0 50 200 --output bench_output.txt
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks import fake_krx
+
+STAGES = [
+    '_fetch_snapshots',
+    '_melt_data_one',
+    'concat',
+    '_filter_data',
+    'molten_to_single',
+    'molten_to_multi',
+    'Panel.from_snapshots',
+    'Panel.get_frame',
+    'Panel.to_multi',
+]
+
+def measure(func, *args, **kwargs) -> tuple:
+    """
+    Returns (result, wall time in seconds, peak traced memory in MiB) of one call.
+    """
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+
+    result = func(*args, **kwargs)
+
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+
+    return result, elapsed, (peak - baseline) / 2**20
+
+def run_case(
+        n_days: int,
+        universe_size: int,
+        data: list,
+        stock: fake_krx.FakeStock,
+        ) -> list:
+    from kor_quant_dataloader.cache import snapshot_cache
+    from kor_quant_dataloader.datasource.pykrx_ import PykrxOHLCV, PykrxReader
+    from kor_quant_dataloader.loader import DataLoader
+    from kor_quant_dataloader.panel import Panel
+    from kor_quant_dataloader.utils import PdOps
+
+    date_list = pd.bdate_range('2021-01-04', periods=n_days).strftime('%Y-%m-%d').tolist()
+    all_tickers = stock.get_market_ohlcv_by_ticker(date_list[0]).index
+    universe = all_tickers[::max(1, len(all_tickers) // universe_size)][:universe_size].tolist() if universe_size else None
+
+    snapshot_cache.clear()
+    PykrxReader.set_rate_limit(10**9)
+
+    rows = []
+    def record(stage: str, elapsed: float, peak: float) -> None:
+        rows.append({
+            'days': n_days,
+            'universe': universe_size or 'ALL',
+            'stage': stage,
+            'seconds': elapsed,
+            'peak_MiB': peak,
+            })
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # The loader finds its store through KQDL_DATA_DIR, so it points at the temporary 
+        # directory for this case only.
+        previous_data_dir = os.environ.get('KQDL_DATA_DIR')
+        os.environ['KQDL_DATA_DIR'] = data_dir
+        try:
+            reader = PykrxOHLCV()
+            reader.data = data
+            reader.universe = pd.Index(universe) if universe is not None else None
+
+            # Fetches every day and writes it to the (temporary) local store.
+            snapshots, elapsed, peak = measure(reader._fetch_snapshots, date_list)
+            record('_fetch_snapshots', elapsed, peak)
+
+            melts, elapsed, peak = measure(lambda: [reader._melt_data_one(snapshot, di) for di, snapshot in snapshots])
+            record('_melt_data_one', elapsed, peak)
+
+            molten, elapsed, peak = measure(PdOps.concat_molten, melts)
+            record('concat', elapsed, peak)
+            del melts
+
+            def filter_molten(molten: pd.DataFrame) -> pd.DataFrame:
+                filtered = reader._filter_data(molten)
+                if universe is not None:
+                    filtered = filtered[filtered['ticker'].isin(universe)]
+
+                return filtered
+
+            filtered, elapsed, peak = measure(filter_molten, molten)
+            record('_filter_data', elapsed, peak)
+            del molten
+
+            single = filtered[filtered['data'] == data[0]]
+            _, elapsed, peak = measure(PdOps.molten_to_single, single)
+            record('molten_to_single', elapsed, peak)
+
+            _, elapsed, peak = measure(PdOps.molten_to_multi, filtered)
+            record('molten_to_multi', elapsed, peak)
+            del single, filtered
+
+            trimmed = [(di, reader._trim_snapshot(snapshot)) for di, snapshot in snapshots]
+            panel, elapsed, peak = measure(Panel.from_snapshots, trimmed, fields=data)
+            record('Panel.from_snapshots', elapsed, peak)
+
+            _, elapsed, peak = measure(panel.get_frame, data[0])
+            record('Panel.get_frame', elapsed, peak)
+
+            _, elapsed, peak = measure(panel.to_multi)
+            record('Panel.to_multi', elapsed, peak)
+
+            loader = DataLoader('pykrx', date_list[0], date_list[-1], universe=universe)
+            snapshot_cache.clear()
+            _, elapsed, peak = measure(loader.get_data, data)
+            record('DataLoader.get_data (from disk)', elapsed, peak)
+        finally:
+            if previous_data_dir is None:
+                os.environ.pop('KQDL_DATA_DIR', None)
+            else:
+                os.environ['KQDL_DATA_DIR'] = previous_data_dir
+
+    return rows
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Offline benchmark of the kor-quant-dataloader pipeline.')
+    parser.add_argument('--days', type=int, nargs='+', default=[20, 60, 250], help='Date-range sizes in trading days.')
+    parser.add_argument('--universe', type=int, nargs='+', default=[0, 200, 50], help='Universe sizes; 0 means the full market.')
+    parser.add_argument('--data', nargs='+', default=['종가', '거래량', '거래대금'], help='OHLCV data to load.')
+    parser.add_argument('--output', default=None, help='Also write the report to this file.')
+    args = parser.parse_args()
+
+    stock = fake_krx.FakeStock()
+
+    rows = []
+    tracemalloc.start()
+    with fake_krx.install(stock):
+        for n_days in args.days:
+            for universe_size in args.universe:
+                rows += run_case(n_days, universe_size, args.data, stock)
+    tracemalloc.stop()
+
+    report = pd.DataFrame(rows).set_index(['days', 'universe', 'stage'])
+    report = report.round({'seconds': 4, 'peak_MiB': 1}).to_string()
+
+    print(report)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report + '\n')
+
+if __name__ == '__main__':
+    main()
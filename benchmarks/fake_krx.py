@@ -0,0 +1,247 @@
+"""
+An offline stand-in for the `pykrx` package used by the benchmarks.
+
+`FakeStock` mimics the `pykrx.stock` functions the readers call and returns 
+deterministic, realistically shaped full-market snapshots: about 2,700 listed tickers 
+per day (out of a larger pool that lists and delists over time), Korean column names 
+and the index names and dtypes pykrx returns. Weekends are holidays.
+"""
+import numpy as np
+import pandas as pd
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+class FakeStock:
+    def __init__(
+            self,
+            n_tickers: int=3000,
+            n_listed: int=2700,
+            start_date: str='2000-01-01',
+            end_date: str='2030-12-31',
+            seed: int=0,
+            ) -> None:
+        rng = np.random.default_rng(seed)
+
+        self.tickers = np.array([f'{code:06d}' for code in np.sort(rng.choice(999999, n_tickers, replace=False))])
+        self.names = np.array([f'종목{i}' for i in range(n_tickers)])
+        self.base_price = rng.integers(1000, 100000, n_tickers)
+        self.shares = rng.integers(10**6, 10**9, n_tickers)
+
+        # The first n_listed tickers are listed for the whole period; the others list 
+        # and delist at random dates, which gives survivorship-sensitive data.
+        start, end = pd.Timestamp(start_date).value, pd.Timestamp(end_date).value
+        self.listed_from = np.full(n_tickers, start, dtype=np.int64)
+        self.listed_until = np.full(n_tickers, end, dtype=np.int64)
+        n_changing = n_tickers - n_listed
+        self.listed_from[n_listed:] = rng.integers(start, end, n_changing)
+        self.listed_until[n_listed:] = self.listed_from[n_listed:] + rng.integers(1, 5 * 365, n_changing) * 86400 * 10**9
+
+        self.calls = 0
+
+    def _get_mask(self, date: pd.Timestamp) -> np.ndarray:
+        return (self.listed_from <= date.value) & (date.value <= self.listed_until)
+
+    def _get_prices(self, date: pd.Timestamp) -> tuple:
+        rng = np.random.default_rng(int(date.strftime('%Y%m%d')))
+        mask = self._get_mask(date)
+
+        trend = np.exp(0.0002 * (date - pd.Timestamp('2000-01-01')).days)
+        close = (self.base_price * trend * (1 + 0.02 * rng.standard_normal(len(mask)))).astype(np.int64)
+        prev_close = (close / (1 + 0.02 * rng.standard_normal(len(mask)))).astype(np.int64)
+        volume = rng.integers(0, 10**7, len(mask))
+
+        return mask, close, prev_close, volume
+
+    def _empty(self, columns: list) -> pd.DataFrame:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='티커'))
+
+    def get_market_ohlcv_by_ticker(
+            self,
+            date: str,
+            market: str='KOSPI',
+            ) -> pd.DataFrame:
+        self.calls += 1
+        columns = ['시가', '고가', '저가', '종가', '거래량', '거래대금', '등락률']
+        date = pd.Timestamp(date)
+        if date.dayofweek >= 5:
+            return self._empty(columns)
+
+        mask, close, prev_close, volume = self._get_prices(date)
+        open_ = (prev_close + close) // 2
+        snapshot = pd.DataFrame({
+            '시가': open_,
+            '고가': np.maximum(open_, close) * 101 // 100,
+            '저가': np.minimum(open_, close) * 99 // 100,
+            '종가': close,
+            '거래량': volume,
+            '거래대금': volume * close,
+            '등락률': np.round((close / prev_close - 1) * 100, 2),
+            }, index=pd.Index(self.tickers, name='티커'))
+
+        return snapshot[mask]
+
+    def get_market_price_change_by_ticker(
+            self,
+            fromdate: str,
+            todate: str,
+            market: str='KOSPI',
+            adjusted: bool=True,
+            ) -> pd.DataFrame:
+        self.calls += 1
+        columns = ['종목명', '시가', '종가', '변동폭', '등락률', '거래량', '거래대금']
+        date = pd.Timestamp(todate)
+        if date.dayofweek >= 5:
+            return self._empty(columns)
+
+        mask, close, prev_close, volume = self._get_prices(date)
+        snapshot = pd.DataFrame({
+            '종목명': self.names,
+            '시가': prev_close,
+            '종가': close,
+            '변동폭': close - prev_close,
+            '등락률': np.round((close / prev_close - 1) * 100, 2),
+            '거래량': volume,
+            '거래대금': volume * close,
+            }, index=pd.Index(self.tickers, name='티커'))
+
+        return snapshot[mask]
+
+    def get_market_cap_by_ticker(
+            self,
+            date: str,
+            market: str='KOSPI',
+            ) -> pd.DataFrame:
+        self.calls += 1
+        columns = ['종가', '시가총액', '거래량', '거래대금', '상장주식수']
+        date = pd.Timestamp(date)
+        if date.dayofweek >= 5:
+            return self._empty(columns)
+
+        mask, close, _, volume = self._get_prices(date)
+        snapshot = pd.DataFrame({
+            '종가': close,
+            '시가총액': close * self.shares,
+            '거래량': volume,
+            '거래대금': volume * close,
+            '상장주식수': self.shares,
+            }, index=pd.Index(self.tickers, name='티커'))
+
+        return snapshot[mask]
+
+    def get_market_fundamental(
+            self,
+            date: str,
+            market: str='KOSPI',
+            ) -> pd.DataFrame:
+        self.calls += 1
+        columns = ['BPS', 'PER', 'PBR', 'EPS', 'DIV', 'DPS']
+        date = pd.Timestamp(date)
+        if date.dayofweek >= 5:
+            return self._empty(columns)
+
+        mask, close, _, _ = self._get_prices(date)
+        bps = self.base_price * 2 // 3
+        eps = self.base_price // 12
+        dps = self.base_price // 50
+        snapshot = pd.DataFrame({
+            'BPS': bps,
+            'PER': np.round(close / eps, 2),
+            'PBR': np.round(close / bps, 2),
+            'EPS': eps,
+            'DIV': np.round(dps / close * 100, 2),
+            'DPS': dps,
+            }, index=pd.Index(self.tickers, name='티커'))
+
+        return snapshot[mask]
+
+    def _get_ticker_rows(
+            self,
+            get_snapshot,
+            fromdate: str,
+            todate: str,
+            ticker: str,
+            columns: list,
+            ) -> pd.DataFrame:
+        # Per-ticker endpoints answer the whole range in one request, indexed by 날짜 and
+        # without the days the ticker was not listed.
+        calls = self.calls
+        rows = {}
+        for date in pd.bdate_range(fromdate, todate):
+            snapshot = get_snapshot(date.strftime('%Y%m%d'))
+            rows[date] = snapshot.loc[snapshot.index == ticker, columns]
+        self.calls = calls + 1
+        ticker_rows = pd.concat(rows, names=['날짜', '티커']).droplevel('티커') if rows else pd.DataFrame()
+
+        # Like pykrx, a range without any row comes back as a bare DataFrame().
+        if ticker_rows.empty:
+            return pd.DataFrame()
+
+        return ticker_rows
+
+    def get_market_ohlcv_by_date(
+            self,
+            fromdate: str,
+            todate: str,
+            ticker: str,
+            adjusted: bool=True,
+            ) -> pd.DataFrame:
+        columns = ['시가', '고가', '저가', '종가', '거래량', '거래대금', '등락률']
+
+        return self._get_ticker_rows(self.get_market_ohlcv_by_ticker, fromdate, todate, ticker, columns)
+
+    def get_market_cap_by_date(
+            self,
+            fromdate: str,
+            todate: str,
+            ticker: str,
+            ) -> pd.DataFrame:
+        columns = ['시가총액', '거래량', '거래대금', '상장주식수']
+
+        return self._get_ticker_rows(self.get_market_cap_by_ticker, fromdate, todate, ticker, columns)
+
+    def get_market_fundamental_by_date(
+            self,
+            fromdate: str,
+            todate: str,
+            ticker: str,
+            ) -> pd.DataFrame:
+        columns = ['BPS', 'PER', 'PBR', 'EPS', 'DIV', 'DPS']
+
+        return self._get_ticker_rows(self.get_market_fundamental, fromdate, todate, ticker, columns)
+
+    def get_index_ohlcv(
+            self,
+            fromdate: str,
+            todate: str,
+            ticker: str='1028',
+            ) -> pd.DataFrame:
+        self.calls += 1
+        dates = pd.bdate_range(fromdate, todate, name='날짜')
+        index_ohlcv = pd.DataFrame({
+            '시가': 300.0,
+            '고가': 305.0,
+            '저가': 295.0,
+            '종가': 301.0,
+            '거래량': 10**8,
+            '거래대금': 10**12,
+            '상장시가총액': 10**15,
+            }, index=dates)
+
+        return index_ohlcv
+
+@contextmanager
+def install(stock: FakeStock=None):
+    """
+    Replaces the `pykrx` module used by the readers with a fake one for the duration 
+    of the context and yields the fake `stock` module.
+    """
+    from kor_quant_dataloader.datasource import pykrx_
+
+    stock = stock if stock is not None else FakeStock()
+    original = pykrx_.krx
+    pykrx_.krx = SimpleNamespace(stock=stock)
+    try:
+        yield stock
+    finally:
+        pykrx_.krx = original
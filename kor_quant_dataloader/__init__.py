@@ -1,5 +1,15 @@
 from . import datasource
+from .adjust import *
+from .backfill import Backfill
+from .cache import *
+from .instrument import *
+from .listing import *
 from .loader import *
+from .options import *
+from .panel import *
+from .planner import *
+from .shared import *
+from .universe import *
 from .utils import *
 
 __version__ = '0.1.0'
\ No newline at end of file
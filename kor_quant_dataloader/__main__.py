@@ -0,0 +1,5 @@
+import sys
+
+from .backfill import main
+
+sys.exit(main())
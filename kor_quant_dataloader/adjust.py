@@ -0,0 +1,254 @@
+import numpy as np
+import pandas as pd
+
+import threading
+
+from typing import List
+
+from .panel import Panel
+from .planner import FetchPlan, FetchPlanner
+from .utils import DateUtil
+from .datasource.base import BaseLocal
+from .datasource.pykrx_ import PykrxAdjPrice, PykrxOHLCV
+
+# Adjusted fields and the unadjusted fields they are derived from.
+ADJUSTED_FIELDS = {
+    '수정시가': '시가',
+    '수정고가': '고가',
+    '수정저가': '저가',
+    '수정종가': '종가',
+}
+
+# Adjusted fields are read as the unadjusted prices of the first reader and adjusted with 
+# the events derived from the base prices of the second.
+ADJUSTED_READERS = [PykrxOHLCV, PykrxAdjPrice]
+
+def plan_fetch(
+        parent_reader: type,
+        data: List[str],
+        ) -> FetchPlan:
+    """
+    Plans the readers of data like `FetchPlanner.plan`, with the adjusted fields planned 
+    on both `ADJUSTED_READERS`, since no reader provides them.
+    """
+    plan = FetchPlanner(parent_reader).plan([d for d in data if d not in ADJUSTED_FIELDS])
+
+    assigned = {reader: list(assigned_data) for reader, assigned_data in plan.assigned.items()}
+    candidates = dict(plan.candidates)
+    for d in data:
+        if d in ADJUSTED_FIELDS:
+            for reader in ADJUSTED_READERS:
+                assigned.setdefault(reader, []).append(d)
+            candidates[d] = list(ADJUSTED_READERS)
+
+    return FetchPlan(data, assigned, candidates)
+
+class AdjustmentFactors:
+    """
+    Price adjustment events of the whole market (splits, reverse splits, rights and
+    stock dividends), derived from the base price KRX sets for every trading day.
+
+    The base price (기준가) of a day is the previous close, unless a corporate action
+    changed the value of a share overnight; then it is the previous close adjusted for
+    it. Every day on which base price / previous close != 1 is an event with that ratio.
+    Only the events are kept (they are rare), together with the dates they were
+    computed for, and the cumulative factors of any period are rebuilt from them.
+    """
+    def __init__(
+            self,
+            dates: np.ndarray,
+            tickers: np.ndarray,
+            ratios: np.ndarray,
+            covered: np.ndarray,
+            ) -> None:
+        self.dates = np.asarray(dates, dtype='datetime64[D]')
+        self.tickers = np.asarray(tickers, dtype=object)
+        self.ratios = np.asarray(ratios, dtype='float64')
+        self.covered = np.unique(np.asarray(covered, dtype='datetime64[D]'))
+
+        if not len(self.dates) == len(self.tickers) == len(self.ratios):
+            raise ValueError('Adjustment events need one date, ticker and ratio each.')
+
+    @classmethod
+    def empty(cls) -> 'AdjustmentFactors':
+        return cls([], [], [], [])
+
+    @classmethod
+    def compute(
+        cls,
+        panel: Panel,
+        base_field: str='시가',
+        close_field: str='종가',
+        ) -> 'AdjustmentFactors':
+        """
+        Derives the events of every ticker and date of a panel of base prices and closes
+        in one pass. The first date has no previous close in the panel, so it is not
+        covered; a ticker's previous close is the last close it had before the date.
+        """
+        base = panel.values[panel.fields.get_loc(base_field)]
+        close = panel.values[panel.fields.get_loc(close_field)]
+        close = np.where(close > 0, close, np.nan)
+
+        # Position of each ticker's last close up to the previous date.
+        n_dates = close.shape[0]
+        last_close = np.where(np.isnan(close), -1, np.arange(n_dates)[:, None])
+        np.maximum.accumulate(last_close, axis=0, out=last_close)
+        prev_close_position = np.vstack([np.full((1, close.shape[1]), -1), last_close[:-1]])
+
+        prev_close = np.take_along_axis(close, np.maximum(prev_close_position, 0), axis=0)
+        prev_close[prev_close_position < 0] = np.nan
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = base / prev_close
+        events = np.isfinite(ratios) & (base > 0) & (ratios != 1)
+
+        date_positions, ticker_positions = np.nonzero(events)
+        dates = panel.dates.to_numpy().astype('datetime64[D]')
+        covered = dates[1:][(base[1:] > 0).any(axis=1)]
+
+        return cls(
+            dates[date_positions],
+            panel.tickers.to_numpy(dtype=object)[ticker_positions],
+            ratios[date_positions, ticker_positions],
+            covered,
+            )
+
+    def update(
+            self,
+            other: 'AdjustmentFactors',
+            ) -> 'AdjustmentFactors':
+        """
+        Returns the events of both, with those of the dates other covers taken from other.
+        """
+        keep = ~np.isin(self.dates, other.covered)
+
+        return AdjustmentFactors(
+            np.concatenate([self.dates[keep], other.dates]),
+            np.concatenate([self.tickers[keep], other.tickers]),
+            np.concatenate([self.ratios[keep], other.ratios]),
+            np.concatenate([self.covered, other.covered]),
+            )
+
+    def get_missing(
+            self,
+            dates: list,
+            ) -> list:
+        """
+        Returns the 'YYYY-MM-DD' dates whose events have not been computed.
+        """
+        return [di for di, covered in zip(dates, np.isin(DateUtil.strdates_to_datetime64(dates), self.covered)) if not covered]
+
+    def get_factors(
+            self,
+            dates: pd.Index,
+            tickers: pd.Index,
+            end_date: str=None,
+            ) -> np.ndarray:
+        """
+        Returns the (date x ticker) cumulative factors that adjust each price to the
+        basis of end_date (the last date by default): the product of the ratios of all 
+        events after the date, up to end_date.
+        """
+        calendar = pd.DatetimeIndex(dates).to_numpy().astype('datetime64[D]')
+        ratios = np.ones((len(calendar), len(tickers)))
+        if not len(calendar):
+            return ratios
+
+        basis = np.datetime64(end_date, 'D') if end_date is not None else calendar[-1]
+
+        # An event multiplies every date before it, so it goes on the last date before it;
+        # events between the last date and end_date go on the last date.
+        date_positions = np.searchsorted(calendar, self.dates, side='left') - 1
+        ticker_positions = pd.Index(tickers).get_indexer(self.tickers)
+        in_period = (date_positions >= 0) & (self.dates <= basis) & (ticker_positions >= 0)
+
+        np.multiply.at(ratios, (date_positions[in_period], ticker_positions[in_period]), self.ratios[in_period])
+
+        factors = np.cumprod(ratios[::-1], axis=0)[::-1]
+
+        return factors
+
+    def adjust(
+            self,
+            panel: Panel,
+            fields: list,
+            end_date: str=None,
+            ) -> Panel:
+        """
+        Returns the panel with the given price fields multiplied by the factors of its
+        dates and tickers to the basis of end_date (see `get_factors`); the panel itself 
+        is not modified.
+        """
+        factors = self.get_factors(panel.dates, panel.tickers, end_date)
+        positions = panel.fields.get_indexer(fields)
+
+        values = panel.values.copy()
+        values[positions] *= factors.astype(values.dtype)[None]
+
+        return Panel(values, panel.dates, panel.tickers, panel.fields)
+
+    def to_arrays(self) -> dict:
+        arrays = {
+            'dates': self.dates,
+            'tickers': self.tickers.astype(str),
+            'ratios': self.ratios,
+            'covered': self.covered,
+        }
+
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict,
+        ) -> 'AdjustmentFactors':
+        if not arrays:
+            return cls.empty()
+
+        return cls(arrays['dates'], arrays['tickers'].astype(object), arrays['ratios'], arrays['covered'])
+
+    def __repr__(self) -> str:
+        return f'AdjustmentFactors(events={len(self.ratios)}, covered_dates={len(self.covered)})'
+
+class AdjustmentCache:
+    """
+    Process-wide cache of the adjustment events of each storage root and source, in
+    front of the copy persisted as ``<root>/<source>/adjustments.npz``.
+    """
+    def __init__(self) -> None:
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            local: BaseLocal,
+            source: str,
+            ) -> AdjustmentFactors:
+        key = (local.root, source)
+        with self._lock:
+            factors = self._entries.get(key)
+        if factors is not None:
+            return factors
+
+        factors = AdjustmentFactors.from_arrays(local.read_npz(source, 'adjustments.npz'))
+        with self._lock:
+            self._entries[key] = factors
+
+        return factors
+
+    def put(
+            self,
+            local: BaseLocal,
+            source: str,
+            factors: AdjustmentFactors,
+            ) -> None:
+        with self._lock:
+            self._entries[(local.root, source)] = factors
+
+        local.write_npz(factors.to_arrays(), source, 'adjustments.npz')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+adjustment_cache = AdjustmentCache()
@@ -0,0 +1,237 @@
+"""
+Resumable bulk backfill of the local store.
+
+Usage:
+    kqdl-backfill --start 2005-01-01 --end 2024-12-31
+    python -m kor_quant_dataloader --start 2005-01-01 --data 종가 BPS --chunk Q
+"""
+import argparse
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from typing import List
+
+from .instrument import Instrumentation, get_default_instrumentation
+from .adjust import plan_fetch
+from .utils import DateUtil, load_env
+from .datasource.base import BaseLocal, reader_registry
+from .datasource.pykrx_ import PykrxReader
+
+class Backfill:
+    """
+    Fills the local store of a source's readers over a long period, chunk by chunk.
+
+    The period is split into calendar chunks (monthly by default). Each reader works
+    through its chunks in order, fetching only the trading days that are not stored
+    yet; every day is written atomically as soon as it is fetched, and at most one
+    chunk per reader is held in memory. A completed chunk is recorded in the checkpoint
+    manifest ``<root>/<source>/backfill.json``, so a run that crashed or was interrupted
+    resumes after the last completed chunk of every reader. Readers run in parallel,
+    each fetching max_workers dates at once, all sharing the KRX rate limit.
+
+    A reader stops at its first chunk that fails after the retries, so its store does
+    not run ahead of a gap that `DataLoader.update` would skip; the other readers go on
+    and the next run fills the failed chunk's missing days first. Chunks that
+    reach today or later are fetched but never checkpointed, as KRX may not have
+    published their last days yet.
+    """
+    filename = 'backfill.json'
+
+    def __init__(
+            self,
+            start_date: str,
+            end_date: str=None,
+            data: List[str]=None,
+            source: str='pykrx',
+            chunk: str='M',
+            max_parallel: int=None,
+            max_workers: int=1,
+            max_retries: int=3,
+            backoff: float=1.0,
+            local: BaseLocal=None,
+            instrument: Instrumentation=None,
+            ) -> None:
+        """
+        Parameters:
+        - start_date (str): The first date to backfill.
+        - end_date (str, optional): The last date to backfill. Defaults to yesterday.
+        - data (List[str], optional): Backfill the readers needed for these data.
+          Defaults to every reader of the source.
+        - source (str, optional): The data source. Only 'pykrx' is supported. Defaults
+          to 'pykrx'.
+        - chunk (str, optional): A pandas period frequency, e.g. 'M', 'Q' or 'Y'.
+          Defaults to 'M'.
+        - max_parallel (int, optional): The number of readers backfilled at once.
+          Defaults to all of them.
+        - max_workers (int, optional): The number of dates each reader fetches at once.
+          All requests share the KRX rate limit. Defaults to 1.
+        - max_retries (int, optional): Retries of every KRX request. Defaults to 3.
+        - backoff (float, optional): The first retry delay in seconds, doubled on every
+          retry. Defaults to 1.0.
+        """
+        if source.lower() != 'pykrx':
+            raise ValueError(f'Backfill is not supported for source: {source}')
+
+        self.source = source.lower()
+        self.start_date = start_date
+        self.end_date = end_date or DateUtil.get_last_final_date()
+        self.chunk = chunk
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        if data is None:
+            self.readers = reader_registry.get_readers(self.source)
+        else:
+            self.readers = plan_fetch(PykrxReader, list(data)).readers
+        self.max_parallel = max_parallel or len(self.readers)
+
+        self.local = local if local is not None else BaseLocal()
+        self.instrument = instrument if instrument is not None else get_default_instrumentation()
+
+        self.chunks = DateUtil.split_daterange(self.start_date, self.end_date, self.chunk)
+
+        self._lock = threading.Lock()
+
+    def run(self) -> pd.DataFrame:
+        """
+        Runs (or resumes) the backfill and returns its status (see `get_status`).
+
+        Raises:
+        - RuntimeError: If a reader failed; run again to resume from its failed chunk.
+        """
+        with ThreadPoolExecutor(max_workers=self.max_parallel) as executor:
+            list(executor.map(self._run_reader, self.readers))
+
+        status = self.get_status()
+        failed = status[status['status'] == 'failed']
+        if not failed.empty:
+            chunks = ', '.join(f"{row.reader} {row.start}~{row.end}" for row in failed.itertuples())
+            raise RuntimeError(f'Backfill failed for {chunks}. Run it again to resume.')
+
+        return status
+
+    def get_status(self) -> pd.DataFrame:
+        """
+        Returns one row per reader and chunk of the period with its status ('done',
+        'failed' or 'pending'), the number of trading days stored by the run and the
+        error of a failed chunk.
+        """
+        checkpoint = self._read_checkpoint()
+
+        rows = []
+        for reader in self.readers:
+            reader_chunks = checkpoint.get(reader.__name__, {})
+            for chunk_start, chunk_end in self.chunks:
+                entry = reader_chunks.get(self._get_key(chunk_start, chunk_end), {})
+                rows.append({
+                    'reader': reader.__name__,
+                    'start': chunk_start,
+                    'end': chunk_end,
+                    'status': entry.get('status', 'pending'),
+                    'n_dates': entry.get('n_dates'),
+                    'error': entry.get('error'),
+                    })
+
+        return pd.DataFrame(rows, columns=['reader', 'start', 'end', 'status', 'n_dates', 'error'])
+
+    def _run_reader(
+            self,
+            reader: type,
+            ) -> None:
+        reader_instance = reader(
+            local=self.local,
+            max_workers=self.max_workers,
+            max_retries=self.max_retries,
+            backoff=self.backoff,
+            instrument=self.instrument,
+            )
+        done = {key for key, entry in self._read_checkpoint().get(reader.__name__, {}).items() if entry['status'] == 'done'}
+        stored_dates = set(reader_instance._get_available_local_dates())
+        last_final_date = DateUtil.get_last_final_date()
+
+        for chunk_start, chunk_end in self.chunks:
+            key = self._get_key(chunk_start, chunk_end)
+            if key in done:
+                continue
+
+            try:
+                with self.instrument.span('backfill', reader=reader.__name__, chunk=key):
+                    date_list = [di for di in reader_instance.get_tradingdays(chunk_start, chunk_end, local=self.local) if di not in stored_dates]
+                    if date_list:
+                        # The snapshots are on disk once fetched; the returned copies are dropped.
+                        reader_instance._fetch_snapshots(date_list)
+            except Exception as error:
+                self._checkpoint(reader, key, {'status': 'failed', 'error': f'{type(error).__name__}: {error}'})
+                return
+
+            stored_dates.update(date_list)
+            if chunk_end <= last_final_date:
+                self._checkpoint(reader, key, {'status': 'done', 'n_dates': len(date_list)})
+
+    def _get_key(
+            self,
+            chunk_start: str,
+            chunk_end: str,
+            ) -> str:
+        return f'{chunk_start}~{chunk_end}'
+
+    def _read_checkpoint(self) -> dict:
+        return self.local.read_json(self.source, self.filename).get('chunks', {})
+
+    def _checkpoint(
+            self,
+            reader: type,
+            key: str,
+            entry: dict,
+            ) -> None:
+        # Readers finish chunks concurrently, so read-modify-write under the lock.
+        with self._lock:
+            checkpoint = self._read_checkpoint()
+            checkpoint.setdefault(reader.__name__, {})[key] = {**entry, 'updated_at': pd.Timestamp.now().isoformat(timespec='seconds')}
+            self.local.write_json({'chunks': checkpoint}, self.source, self.filename)
+
+    def __repr__(self) -> str:
+        readers = [reader.__name__ for reader in self.readers]
+
+        return f'Backfill({self.start_date}~{self.end_date}, chunk={self.chunk}, readers={readers})'
+
+def main(argv: List[str]=None) -> int:
+    parser = argparse.ArgumentParser(description='Backfill the local kor-quant-dataloader store, resuming from the last checkpoint.')
+    parser.add_argument('--start', required=True, help='The first date, YYYY-MM-DD.')
+    parser.add_argument('--end', default=None, help='The last date, YYYY-MM-DD. Defaults to yesterday.')
+    parser.add_argument('--data', nargs='+', default=None, help='Only backfill the readers of these data. Defaults to all readers.')
+    parser.add_argument('--source', default='pykrx', help='The data source.')
+    parser.add_argument('--chunk', default='M', help="Chunk frequency, e.g. 'M', 'Q' or 'Y'.")
+    parser.add_argument('--parallel', type=int, default=None, help='Readers backfilled at once. Defaults to all.')
+    parser.add_argument('--workers', type=int, default=1, help='Dates each reader fetches at once.')
+    parser.add_argument('--rate', type=float, default=None, help='Maximum KRX requests per second.')
+    args = parser.parse_args(argv)
+
+    load_env()
+    if args.rate is not None:
+        PykrxReader.set_rate_limit(args.rate)
+
+    backfill = Backfill(
+        args.start,
+        end_date=args.end,
+        data=args.data,
+        source=args.source,
+        chunk=args.chunk,
+        max_parallel=args.parallel,
+        max_workers=args.workers,
+        )
+    try:
+        status = backfill.run()
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        status, exit_code = backfill.get_status(), 1
+    else:
+        exit_code = 0
+
+    print(status.groupby(['reader', 'status']).size().unstack(fill_value=0).to_string())
+
+    return exit_code
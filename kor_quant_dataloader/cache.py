@@ -0,0 +1,237 @@
+import pandas as pd
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from typing import Callable, Hashable
+
+class SnapshotCache:
+    """
+    A process-wide, memory-bounded LRU cache of daily snapshots.
+
+    Entries are keyed by (storage root, reader class, date) and hold the full, untrimmed
+    snapshot, so loaders with different universes and data share them, while readers of
+    another local store never take a snapshot for one they stored. Cached snapshots must be
+    treated as read-only. When the total size exceeds `max_bytes`, the least recently
+    used entries are evicted.
+    """
+    def __init__(
+            self,
+            max_bytes: int=512 * 2**20,
+            ) -> None:
+        self.max_bytes = max_bytes
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(
+            self,
+            reader: type,
+            date: str,
+            root: str=None,
+            ) -> pd.DataFrame:
+        """
+        Returns the cached snapshot, or None if it is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get((root, reader, date))
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end((root, reader, date))
+            self.hits += 1
+
+            return entry[0]
+
+    def __contains__(
+            self,
+            key: tuple,
+            ) -> bool:
+        # Membership checks (root, reader, date) without counting a hit or a miss.
+        with self._lock:
+            return key in self._entries
+
+    def put(
+            self,
+            reader: type,
+            date: str,
+            snapshot: pd.DataFrame,
+            root: str=None,
+            ) -> None:
+        nbytes = int(snapshot.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            self._pop((root, reader, date))
+
+            self._entries[(root, reader, date)] = (snapshot, nbytes)
+            self.bytes += nbytes
+
+            self._evict(self.max_bytes)
+
+    def set_max_bytes(
+            self,
+            max_bytes: int,
+            ) -> None:
+        """
+        Sets the byte budget, evicting entries if needed. 0 disables the cache.
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict(max_bytes)
+
+    def invalidate(
+            self,
+            reader: type=None,
+            date: str=None,
+            root: str=None,
+            ) -> int:
+        """
+        Removes the entries matching reader, date and/or storage root (all entries if
+        all are None) and returns the number of removed entries.
+        """
+        with self._lock:
+            keys = [
+                key for key in self._entries
+                if (root is None or key[0] == root) and (reader is None or key[1] is reader) and (date is None or key[2] == date)
+                ]
+            for key in keys:
+                self._pop(key)
+
+        return len(keys)
+
+    def clear(self) -> None:
+        self.invalidate()
+
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            requests = self.hits + self.misses
+            stats = {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
+
+        return stats
+
+    def _pop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _evict(self, max_bytes: int) -> None:
+        while self.bytes > max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.bytes -= nbytes
+            self.evictions += 1
+
+    def __repr__(self) -> str:
+        stats = self.get_stats()
+
+        return f"SnapshotCache(entries={stats['entries']}, bytes={stats['bytes']}, max_bytes={stats['max_bytes']}, hit_rate={stats['hit_rate']:.2f})"
+
+snapshot_cache = SnapshotCache()
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls for the same key.
+
+    The first caller of a key runs the function; callers arriving while it runs wait
+    for it and share its result, or its exception, instead of running the function
+    again. Once the call returns, the key is free, so only in-flight calls coalesce.
+    Thread-safe; `executed` counts the calls run and `coalesced` the calls that waited.
+    """
+    def __init__(self) -> None:
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(
+            self,
+            key: Hashable,
+            func: Callable,
+            *args,
+            ) -> tuple:
+        """
+        Returns func(*args), or the result of the call already running for key, together
+        with whether the call was coalesced into another one.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = Future()
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            return call.result(), True
+
+        try:
+            result = func(*args)
+        except BaseException as error:
+            call.set_exception(error)
+            raise
+        else:
+            call.set_result(result)
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+        return result, False
+
+    @property
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.executed = 0
+            self.coalesced = 0
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            calls = self.executed + self.coalesced
+            stats = {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'coalesced': self.coalesced,
+                'coalesced_rate': self.coalesced / calls if calls else 0.0,
+            }
+
+        return stats
+
+    def __repr__(self) -> str:
+        stats = self.get_stats()
+
+        return f"SingleFlight(in_flight={stats['in_flight']}, executed={stats['executed']}, coalesced={stats['coalesced']})"
+
+# Shared by every reader, so concurrent loaders never fetch the same snapshot (of the same
+# local store) twice at once.
+snapshot_flight = SingleFlight()
@@ -1,11 +1,91 @@
 from abc import ABC, abstractmethod
 
+import os
+import json
+import asyncio
+import tempfile
+import threading
+
+import numpy as np
 import pandas as pd
 
+from kor_quant_dataloader.listing import ListingIndex
+from kor_quant_dataloader.utils import load_env
+
+class ReaderRegistry:
+    """
+    The concrete readers of every source and the fields they provide.
+
+    Readers register themselves when their class is defined, so the field-to-reader
+    indexes are built once instead of walking `__subclasses__()` on every request. A
+    reader class is registered if it defines `available_cols` itself; subclasses that
+    only override behaviour (e.g. in tests) are not.
+    """
+    def __init__(self) -> None:
+        self._readers = {}
+        self._reader_cols = {}
+        self._field_index = {}
+
+    def register(
+            self,
+            reader: type,
+            ) -> None:
+        self._readers.setdefault(reader.source, []).append(reader)
+        self._reader_cols[reader] = frozenset(reader.available_cols)
+
+        field_index = self._field_index.setdefault(reader.source, {})
+        for col in reader.available_cols:
+            field_index.setdefault(col, []).append(reader)
+
+    def get_readers(
+            self,
+            source: str,
+            ) -> list:
+        """
+        Returns the readers of a source in the order they were defined.
+        """
+        return list(self._readers.get(source, []))
+
+    def get_reader_cols(
+            self,
+            reader: type,
+            ) -> frozenset:
+        return self._reader_cols[reader]
+
+    def get_candidates(
+            self,
+            source: str,
+            field: str,
+            ) -> list:
+        """
+        Returns the readers of a source that provide a field.
+        """
+        return list(self._field_index.get(source, {}).get(field, []))
+
+    def get_sources(self) -> list:
+        return list(self._readers)
+
+    def get_fields(
+            self,
+            source: str,
+            ) -> list:
+        """
+        Returns the unique fields of a source in the order readers declare them.
+        """
+        return list(self._field_index.get(source, {}))
+
+reader_registry = ReaderRegistry()
+
 class BaseDataReader(ABC):
     def __init__(self) -> None:
         pass
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+
+        if 'available_cols' in cls.__dict__:
+            reader_registry.register(cls)
+
     @classmethod
     @abstractmethod
     def get_available_cols(cls) -> list:
@@ -20,11 +100,25 @@ class BaseDataReader(ABC):
         download: bool
         ) -> pd.DataFrame:
         raise NotImplementedError
-    
+
+    async def aread(
+        self,
+        data: str,
+        start_date: str,
+        end_date: str,
+        download: bool,
+        **kwargs,
+        ) -> pd.DataFrame:
+        """
+        Asynchronous version of `read`. Readers without a native implementation run 
+        `read` in the event loop's default executor.
+        """
+        return await asyncio.to_thread(self.read, data, start_date, end_date, download, **kwargs)
+
     @abstractmethod
     def _fetch_data_all(self):
         raise NotImplementedError
-    
+
     @abstractmethod
     def _fetch_local_data(self) -> pd.DataFrame:
         raise NotImplementedError
@@ -42,14 +136,333 @@ class BaseDataReader(ABC):
         raise NotImplementedError
 
 class BaseLocal:
-    def __init__(self) -> None:
-        pass
+    """
+    Local file storage shared by the data readers.
 
-    def read_json(self) -> dict:
-        pass
+    Files live under a single root directory, taken from the ``KQDL_DATA_DIR``
+    environment variable (``.env`` is supported) and defaulting to ``~/.kqdl``.
+    Readers partition their data below the root, e.g.
+    ``<root>/pykrx/PykrxOHLCV/2021-01-04.parquet``. All writes go to a temporary
+    file first and are moved into place, so a crash never leaves a half-written file.
+    """
+    def __init__(
+            self,
+            root: str=None,
+            ) -> None:
+        if root is None:
+            load_env()
+            root = os.getenv('KQDL_DATA_DIR') or os.path.join(os.path.expanduser('~'), '.kqdl')
 
-    def read_hdf(self) -> pd.DataFrame:
-        pass
+        self.root = root
+
+    def get_path(self, *parts) -> str:
+        return os.path.join(self.root, *parts)
+
+    def list_files(
+            self,
+            *parts,
+            suffix: str='',
+            ) -> list:
+        path = self.get_path(*parts)
+        if not os.path.isdir(path):
+            return []
+
+        return sorted(f for f in os.listdir(path) if f.endswith(suffix))
+
+    def read_json(
+            self,
+            *parts,
+            ) -> dict:
+        path = self.get_path(*parts)
+        if not os.path.exists(path):
+            return {}
+
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def write_json(
+            self,
+            obj: dict,
+            *parts,
+            ) -> None:
+        with self._atomic_path(*parts) as tmp_path:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(obj, f, ensure_ascii=False)
+
+    def read_parquet(
+            self,
+            *parts,
+            columns: list=None,
+            ) -> pd.DataFrame:
+        """
+        Reads a Parquet file. If columns are given, only those that are stored are read.
+        """
+        path = self.get_path(*parts)
+
+        if columns is not None:
+            import pyarrow.parquet as pq
+
+            stored_columns = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in stored_columns]
+
+        return pd.read_parquet(path, columns=columns)
+
+    def write_parquet(
+            self,
+            df: pd.DataFrame,
+            *parts,
+            ) -> None:
+        with self._atomic_path(*parts) as tmp_path:
+            df.to_parquet(tmp_path)
+
+    def read_npz(
+            self,
+            *parts,
+            ) -> dict:
+        """
+        Reads the arrays of a .npz file into a dict, or returns {} if it does not exist.
+        """
+        path = self.get_path(*parts)
+        if not os.path.exists(path):
+            return {}
+
+        with np.load(path, allow_pickle=False) as npz:
+            return {name: npz[name] for name in npz.files}
+
+    def write_npz(
+            self,
+            arrays: dict,
+            *parts,
+            ) -> None:
+        with self._atomic_path(*parts) as tmp_path:
+            with open(tmp_path, 'wb') as f:
+                np.savez(f, **arrays)
+
+    def _atomic_path(self, *parts):
+        return _AtomicPath(self.get_path(*parts))
+
+class LocalManifest:
+    """
+    A small JSON index of the daily snapshots a reader has stored locally.
+
+    The manifest lives next to the snapshots (e.g. 
+    ``<root>/pykrx/PykrxOHLCV/manifest.json``) and holds the stored dates and, per 
+    ticker, the first and last stored date, so coverage questions are answered without 
+    reading the snapshots or contacting the source. Readers `add` what they write and 
+    `flush` once per batch. Snapshots written or deleted outside the manifest are picked 
+    up on `load`, by reading only the ticker index of the new files.
+
+    Alongside, ``listing.npz`` keeps the point-in-time `ListingIndex` of the tickers 
+    present in every stored snapshot.
+    """
+    filename = 'manifest.json'
+    listing_filename = 'listing.npz'
+
+    # Serializes read-merge-write cycles of every manifest in the process.
+    _merge_lock = threading.Lock()
+
+    def __init__(
+            self,
+            local: BaseLocal,
+            *parts,
+            ) -> None:
+        self.local = local
+        self.parts = parts
+
+        self._pending = {}
+        self._lock = threading.Lock()
+
+    def add(
+            self,
+            date: str,
+            tickers: list,
+            ) -> None:
+        """
+        Records a stored snapshot. It is written to disk on the next `flush`.
+        """
+        with self._lock:
+            self._pending[date] = [str(ticker) for ticker in tickers]
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        if pending:
+            with self._merge_lock:
+                self._merge(self.local.read_json(*self.parts, self.filename), pending)
+
+    def load(self) -> dict:
+        """
+        Returns {'dates': sorted stored dates, 'tickers': {ticker: [first date, last date]}}.
+        """
+        self.flush()
+
+        with self._merge_lock:
+            return self._load()
+
+    def get_listing(self) -> ListingIndex:
+        """
+        Returns the listing index of the stored snapshots.
+        """
+        self.flush()
+
+        with self._merge_lock:
+            self._load()
+            return self._read_listing()
+
+    def _read_listing(self) -> ListingIndex:
+        return ListingIndex.from_arrays(self.local.read_npz(*self.parts, self.listing_filename))
+
+    def _load(self) -> dict:
+        manifest = self.local.read_json(*self.parts, self.filename)
+        stored_dates = [f[:-len('.parquet')] for f in self.local.list_files(*self.parts, suffix='.parquet')]
+
+        # Stores written before the listing index existed are indexed once from scratch.
+        if manifest and len(self._read_listing().dates) != len(manifest.get('dates', [])):
+            manifest = {}
+        elif manifest.get('dates', []) == stored_dates:
+            return manifest
+
+        # Rebuild from scratch if snapshots were removed, as ticker ranges cannot shrink.
+        if set(manifest.get('dates', [])) - set(stored_dates):
+            manifest = {}
+
+        indexed_dates = set(manifest.get('dates', []))
+        new = {
+            date: self.local.read_parquet(*self.parts, f'{date}.parquet', columns=[]).index.astype(str).tolist()
+            for date in stored_dates if date not in indexed_dates
+            }
+
+        return self._merge(manifest, new)
+
+    def _merge(
+            self,
+            manifest: dict,
+            new: dict,
+            ) -> dict:
+        dates = set(manifest.get('dates', []))
+        tickers = manifest.get('tickers', {})
+        for date, date_tickers in new.items():
+            dates.add(date)
+            for ticker in date_tickers:
+                first, last = tickers.get(ticker, (date, date))
+                tickers[ticker] = [min(first, date), max(last, date)]
+
+        manifest = {'dates': sorted(dates), 'tickers': dict(sorted(tickers.items()))}
+
+        # When every stored date is new (e.g. a rebuild), the listing starts over as well.
+        listing = ListingIndex.empty() if dates == set(new) else self._read_listing()
+        listing = listing.update(new)
+
+        self.local.write_npz(listing.to_arrays(), *self.parts, self.listing_filename)
+        self.local.write_json(manifest, *self.parts, self.filename)
+
+        return manifest
+
+class LocalTickerRanges:
+    """
+    The per-ticker date-range rows a reader fetched with its per-ticker endpoint.
+
+    Every fetch of a ticker is stored as its own file, e.g. 
+    ``<root>/pykrx/PykrxOHLCV/tickers/005930/2021-02-01_2021-02-26.parquet`` indexed by 
+    date, so the covered ranges are known from the file names without reading the rows. 
+    A covered range without rows for a date means the ticker had none on that date.
+    """
+    dirname = 'tickers'
+
+    def __init__(
+            self,
+            local: BaseLocal,
+            *parts,
+            ) -> None:
+        self.local = local
+        self.parts = parts
+
+    def get_tickers(self) -> list:
+        """
+        Returns the tickers with at least one stored range.
+        """
+        path = self.local.get_path(*self.parts, self.dirname)
+        if not os.path.isdir(path):
+            return []
+
+        return sorted(ticker for ticker in os.listdir(path) if self.get_ranges(ticker))
+
+    def get_ranges(
+            self,
+            ticker: str,
+            ) -> list:
+        """
+        Returns the stored (start, end) ranges of a ticker.
+        """
+        files = self.local.list_files(*self.parts, self.dirname, ticker, suffix='.parquet')
+
+        return [tuple(f[:-len('.parquet')].split('_')) for f in files]
+
+    def get_coverage(
+            self,
+            tickers: list,
+            dates: list,
+            ) -> np.ndarray:
+        """
+        Returns a (ticker x date) boolean matrix of whether a stored range of the ticker 
+        covers the 'YYYY-MM-DD' date.
+        """
+        days = np.array(dates, dtype='datetime64[D]')
+        coverage = np.zeros((len(tickers), len(days)), dtype=bool)
+        for position, ticker in enumerate(tickers):
+            ranges = np.array(self.get_ranges(ticker), dtype='datetime64[D]').reshape(-1, 2)
+            coverage[position] = ((days[:, None] >= ranges[:, 0]) & (days[:, None] <= ranges[:, 1])).any(axis=1)
+
+        return coverage
+
+    def read(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            ) -> pd.DataFrame:
+        """
+        Returns the stored rows of a ticker from start_date to end_date (inclusive).
+        """
+        files = [
+            f'{range_start}_{range_end}.parquet' for range_start, range_end in self.get_ranges(ticker)
+            if range_start <= end_date and start_date <= range_end
+            ]
+        if not files:
+            return pd.DataFrame()
+
+        rows = pd.concat([self.local.read_parquet(*self.parts, self.dirname, ticker, f) for f in files])
+        rows = rows[~rows.index.duplicated(keep='last')].sort_index()
+        dates = pd.DatetimeIndex(rows.index)
+
+        return rows[(dates >= start_date) & (dates <= end_date)]
+
+    def write(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            rows: pd.DataFrame,
+            ) -> None:
+        self.local.write_parquet(rows, *self.parts, self.dirname, ticker, f'{start_date}_{end_date}.parquet')
+
+class _AtomicPath:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.tmp_path = None
+
+    def __enter__(self) -> str:
+        dirname = os.path.dirname(self.path)
+        os.makedirs(dirname, exist_ok=True)
+
+        fd, self.tmp_path = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        os.close(fd)
+
+        return self.tmp_path
 
-    def write_hdf(self) -> None:
-        pass
\ No newline at end of file
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        elif os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
@@ -1,15 +1,45 @@
-import pykrx as krx
-
 import numpy as np
 import pandas as pd
 
-from functools import reduce
-
 import time
-from tqdm import tqdm
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from kor_quant_dataloader.cache import snapshot_cache, snapshot_flight
+from kor_quant_dataloader.planner import FetchAxisPlanner
+from kor_quant_dataloader.listing import ListingIndex
+from kor_quant_dataloader.instrument import (
+    Instrumentation,
+    get_default_instrumentation,
+)
+from kor_quant_dataloader.datasource.base import (
+    BaseDataReader,
+    BaseLocal,
+    LocalManifest,
+    LocalTickerRanges,
+    reader_registry,
+)
+from kor_quant_dataloader.utils import (
+    DateUtil,
+    PdOps,
+    TickerDictionary,
+    TokenBucket,
+)
+
+# pykrx (and the requests stack behind it) is imported on the first KRX request, not
+# when the package is imported. Assigning a module here replaces the backend, e.g.
+# with a fake one in benchmarks.
+krx = None
 
-from kor_quant_dataloader.datasource.base import BaseDataReader
-from kor_quant_dataloader.utils import DateUtil
+def get_krx():
+    global krx
+
+    if krx is None:
+        import pykrx
+        krx = pykrx
+
+    return krx
 
 # def infer_holidays(df) -> pd.DataFrame:
 
@@ -21,14 +51,217 @@ from kor_quant_dataloader.utils import DateUtil
 
 #     return holidays
 
+class PykrxCalendar:
+    """
+    Trading calendar inferred from the trading days of a KRX index (KOSPI 200 by default).
+
+    The calendar is persisted as ``<root>/pykrx/calendar_<index_code>.json`` together with 
+    the contiguous date range it covers, and is only extended from KRX for the parts of a 
+    requested range that are not covered yet. Instances are shared per storage root, so 
+    repeated lookups within a process do not touch the disk either.
+    """
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def get_instance(
+        cls,
+        local: BaseLocal=None,
+        index_code: str='1028',
+        ) -> 'PykrxCalendar':
+        local = local if local is not None else BaseLocal()
+        key = (local.root, index_code)
+
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(local, index_code)
+
+            return cls._instances[key]
+
+    def __init__(
+            self,
+            local: BaseLocal,
+            index_code: str='1028',
+            ) -> None:
+        self.local = local
+        self.index_code = index_code
+        self.filename = f'calendar_{index_code}.json'
+
+        stored = self.local.read_json('pykrx', self.filename)
+        self.covered_start = stored.get('start')
+        self.covered_end = stored.get('end')
+        self.tradingdays = stored.get('tradingdays', [])
+        self.days = DateUtil.strdates_to_datetime64(self.tradingdays)
+
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            start_date: str,
+            end_date: str,
+            download: bool=True,
+            ) -> list:
+        """
+        Returns the trading days between start_date and end_date (inclusive) as 
+        'YYYY-MM-DD' strings. With download=False, parts of the range that the 
+        calendar does not cover are returned as plain calendar days.
+        """
+        with self._lock:
+            if download:
+                self._extend(start_date, end_date)
+
+            tradingdays = self.tradingdays[DateUtil.slice_calendar(self.days, start_date, end_date)]
+
+            if not download:
+                for uncovered_start, uncovered_end in self._get_uncovered_ranges(start_date, end_date):
+                    tradingdays += DateUtil.get_daterange(uncovered_start, uncovered_end)
+
+        return sorted(set(tradingdays))
+
+    def get_array(
+            self,
+            start_date: str,
+            end_date: str,
+            download: bool=True,
+            ) -> np.ndarray:
+        """
+        Same as `get`, but returns the trading days as a datetime64[D] array.
+        """
+        return DateUtil.strdates_to_datetime64(self.get(start_date, end_date, download=download))
+
+    def offset(
+            self,
+            dates: np.ndarray,
+            n: int,
+            ) -> np.ndarray:
+        """
+        Shifts an array of dates by n trading days over the locally stored calendar (see 
+        `DateUtil.offset_dates`). Results the calendar does not cover are NaT.
+        """
+        with self._lock:
+            days = self.days
+
+        return DateUtil.offset_dates(days, dates, n)
+
+    def _get_uncovered_ranges(
+            self,
+            start_date: str,
+            end_date: str,
+            ) -> list:
+        if self.covered_start is None:
+            return [(start_date, end_date)]
+
+        uncovered = []
+        if start_date < self.covered_start:
+            uncovered.append((start_date, min(end_date, DateUtil.add_strdt(self.covered_start, -1))))
+        if end_date > self.covered_end:
+            uncovered.append((max(start_date, DateUtil.add_strdt(self.covered_end, 1)), end_date))
+
+        return uncovered
+
+    def _extend(
+            self,
+            start_date: str,
+            end_date: str,
+            ) -> None:
+        # Fetch ranges adjacent to the covered range so that it stays contiguous.
+        if self.covered_start is None:
+            fetch_ranges = [(start_date, end_date)]
+        else:
+            fetch_ranges = []
+            if start_date < self.covered_start:
+                fetch_ranges.append((start_date, DateUtil.add_strdt(self.covered_start, -1)))
+            if end_date > self.covered_end:
+                fetch_ranges.append((DateUtil.add_strdt(self.covered_end, 1), end_date))
+
+        if not fetch_ranges:
+            return
+
+        fetched = set(self.tradingdays)
+        for fetch_start, fetch_end in fetch_ranges:
+            fetched.update(self._fetch_tradingdays(fetch_start, fetch_end))
+        self.tradingdays = sorted(fetched)
+        self.days = DateUtil.strdates_to_datetime64(self.tradingdays)
+
+        # Days from today on may still change, so they are never marked as covered.
+        last_final_date = DateUtil.get_last_final_date()
+        covered_start = min(start_date, self.covered_start or start_date)
+        covered_end = max(min(end_date, last_final_date), self.covered_end or '')
+        if covered_end < covered_start:
+            return
+
+        self.covered_start = covered_start
+        self.covered_end = covered_end
+
+        self.local.write_json(
+            {
+                'start': self.covered_start,
+                'end': self.covered_end,
+                'tradingdays': self.tradingdays,
+            },
+            'pykrx',
+            self.filename,
+            )
+
+    def _fetch_tradingdays(
+            self,
+            start_date: str,
+            end_date: str,
+            ) -> list:
+        tradingdays = get_krx().stock.get_index_ohlcv(start_date, end_date, self.index_code)
+        tradingdays = DateUtil.datetime64_to_strdates(tradingdays.index.to_numpy())
+
+        return tradingdays
+
 class PykrxReader(BaseDataReader):
+    source = 'pykrx'
+
+    # Number of KRX requests needed per date; used by the fetch planner.
+    fetch_cost = 1.0
+
+    # Number of KRX requests needed per ticker for a whole date range, or None if KRX 
+    # has no per-ticker endpoint for the reader; used by the fetch axis planner.
+    ticker_fetch_cost = None
+
+    # Process-wide cache of full daily snapshots, consulted before the disk and KRX.
+    cache = snapshot_cache
+
+    # Concurrent fetches of the same (root, reader, date) from any loader or thread share one request.
+    flight = snapshot_flight
+
+    # Shared by every pykrx reader (and thread) so KRX sees one overall request rate.
+    rate_limiter = TokenBucket(rate=5, capacity=5)
+
+    # Network errors (requests' exceptions are OSErrors) are worth retrying. pykrx 
+    # catches the parse errors of a KRX error page and returns an empty frame, which 
+    # `_check_snapshot` turns back into a ValueError for trading days.
+    retry_errors = (OSError, ValueError, KeyError)
+
+    @classmethod
+    def set_rate_limit(
+        cls,
+        rate: float,
+        capacity: float=None,
+        ) -> None:
+        """
+        Sets the maximum number of KRX requests per second shared by all pykrx readers.
+        """
+        PykrxReader.rate_limiter = TokenBucket(rate=rate, capacity=capacity)
+
     @classmethod
     def get_available_cols(cls) -> list:
-        available_cols = reduce(list.__add__, [child.get_available_cols() for child in cls.__subclasses__()])
 
-        return available_cols
+        return reader_registry.get_fields(cls.source)
 
-    def __init__(self) -> None:
+    def __init__(
+            self,
+            local: BaseLocal=None,
+            max_workers: int=1,
+            max_retries: int=3,
+            backoff: float=1.0,
+            dtype: str='float64',
+            instrument: Instrumentation=None,
+            ) -> None:
         if not hasattr(self, 'available_cols'):
             raise AttributeError(f'{self.__class__.__name__}.available_cols should be defined.')
         
@@ -44,19 +277,75 @@ class PykrxReader(BaseDataReader):
         self.end_date = None
         self.download = None
 
+        self.universe = None
+
         self.date_list = []
         # self.holidays = []
 
+        self.local = local if local is not None else BaseLocal()
+        self.manifest = LocalManifest(self.local, *self._get_local_parts())
+        self.ticker_ranges = LocalTickerRanges(self.local, *self._get_local_parts())
+
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.dtype = dtype
+
+        # Pipeline events; by default only a progress bar of the KRX requests.
+        self.instrument = instrument if instrument is not None else get_default_instrumentation()
+
     def read(
         self,
         data: list,
         start_date: str,
         end_date: str,
         download: bool,
-        # remove_holidays: bool,
+        remove_holidays: bool=True,
+        universe: list=None,
         ) -> pd.DataFrame:
 
+        self._prepare_read(data, start_date, end_date, download, remove_holidays, universe)
+
+        snapshots = self._collect_snapshots()
+        fetched = PdOps.concat_molten([self._melt_data_one(snapshot, di) for di, snapshot in snapshots])
+        filtered = self._filter_data(fetched)
+
+        return filtered
+
+    def read_snapshots(
+        self,
+        data: list,
+        start_date: str,
+        end_date: str,
+        download: bool,
+        remove_holidays: bool=True,
+        universe: list=None,
+        ) -> list:
+        """
+        Same as `read`, but returns the per-day wide snapshots as a date-ordered list of 
+        (date, snapshot) pairs, each indexed by ticker and trimmed to the requested data 
+        and universe.
+        """
+        self._prepare_read(data, start_date, end_date, download, remove_holidays, universe)
+
+        snapshots = self._collect_snapshots()
+
+        return snapshots
+
+    def _prepare_read(
+        self,
+        data: list,
+        start_date: str,
+        end_date: str,
+        download: bool,
+        remove_holidays: bool,
+        universe: list,
+        ) -> None:
+        if isinstance(data, str):
+            data = [data]
+
         self.data = data
+        self.universe = pd.Index(universe) if universe is not None else None
         # if remove_holidays and ('종가' not in self.data):
         #     self.data.append('종가')
         
@@ -64,67 +353,519 @@ class PykrxReader(BaseDataReader):
         self.end_date = end_date
         self.download = download
 
-        self.date_list = DateUtil.get_daterange(
-            self.start_date,
-            self.end_date,
-            )
+        # Plan the fetch on the trading calendar so holidays are never requested.
+        if remove_holidays:
+            with self.instrument.span('calendar', reader=self.__class__.__name__):
+                self.date_list = self.get_tradingdays(
+                    self.start_date,
+                    self.end_date,
+                    download=self.download,
+                    local=self.local,
+                    )
+        else:
+            self.date_list = DateUtil.get_daterange(
+                self.start_date,
+                self.end_date,
+                )
+
+    def _collect_snapshots(self) -> list:
+        # Look in the in-process cache first, then on disk, and only go to KRX for the rest.
+        snapshots = []
+        uncached_dates = []
+        for di in self.date_list:
+            snapshot = self.cache.get(self.__class__, di, root=self.local.root)
+            if snapshot is None:
+                uncached_dates.append(di)
+            else:
+                self._emit_request(di, 'cache', 0.0)
+                snapshots.append((di, self._trim_snapshot(snapshot)))
+
+        local_dates = set(self._get_available_local_dates())
+        stored_dates = [di for di in uncached_dates if di in local_dates]
+        missing_dates = [di for di in uncached_dates if di not in local_dates]
+
+        snapshots += self._fetch_local_snapshots(stored_dates, trim=True)
+        if missing_dates:
+            ticker_snapshots, missing_dates = self._collect_ticker_snapshots(missing_dates)
+            snapshots += ticker_snapshots
+        if self.download and missing_dates:
+            snapshots += self._fetch_snapshots(missing_dates, trim=True)
+
+        snapshots.sort(key=lambda date_snapshot: date_snapshot[0])
+
+        return snapshots
+
+    def plan_axis(
+            self,
+            date_list: list,
+            ) -> 'FetchAxisPlan':
+        """
+        Returns whether the dates would be fetched per date or per ticker of the universe. 
+        Dates and tickers whose per-ticker rows are stored are not counted.
+        """
+        tickers = sorted(self.universe) if self.universe is not None else None
+        _, missing_dates, missing_tickers = self._get_ticker_coverage(date_list, tickers)
 
-        fetched = self._fetch_data_all(self.date_list)
+        return FetchAxisPlanner().plan(self.__class__, missing_dates, missing_tickers)
+
+    def _get_ticker_coverage(
+            self,
+            date_list: list,
+            tickers: list,
+            ) -> tuple:
+        """
+        Splits date_list into the dates for which every ticker has stored per-ticker rows 
+        and the others, and returns both with the tickers missing some of the others.
+        """
+        if tickers is None or self.ticker_fetch_cost is None:
+            return [], date_list, tickers
+
+        coverage = self.ticker_ranges.get_coverage(tickers, date_list)
+        stored = coverage.all(axis=0)
+
+        stored_dates = [di for di, is_stored in zip(date_list, stored) if is_stored]
+        missing_dates = [di for di, is_stored in zip(date_list, stored) if not is_stored]
+        missing_tickers = [ticker for ticker, covered in zip(tickers, coverage[:, ~stored]) if not covered.all()]
+
+        return stored_dates, missing_dates, missing_tickers
+
+    async def aread(
+        self,
+        data: list,
+        start_date: str,
+        end_date: str,
+        download: bool,
+        remove_holidays: bool=True,
+        universe: list=None,
+        max_concurrency: int=8,
+        ) -> pd.DataFrame:
+        snapshots = await self.aread_snapshots(
+            data, start_date, end_date, download, 
+            remove_holidays=remove_holidays,
+            universe=universe,
+            max_concurrency=max_concurrency,
+            )
+        fetched = PdOps.concat_molten([self._melt_data_one(snapshot, di) for di, snapshot in snapshots])
         filtered = self._filter_data(fetched)
 
         return filtered
 
+    async def aread_snapshots(
+        self,
+        data: list,
+        start_date: str,
+        end_date: str,
+        download: bool,
+        remove_holidays: bool=True,
+        universe: list=None,
+        max_concurrency: int=8,
+        semaphore: asyncio.Semaphore=None,
+        ) -> list:
+        """
+        Asynchronous version of `read_snapshots`. 
+
+        Every date is looked up (cache, disk, then KRX) in the event loop's default 
+        executor, with at most max_concurrency dates in flight; pass a shared semaphore 
+        instead to bound several readers together. Cancelling the call cancels the dates 
+        that have not started yet. KRX requests still go through the shared rate limiter.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = semaphore if semaphore is not None else asyncio.Semaphore(max_concurrency)
+
+        await loop.run_in_executor(
+            None, 
+            self._prepare_read, 
+            data, start_date, end_date, download, remove_holidays, universe,
+            )
+        local_dates = set(await loop.run_in_executor(None, self._get_available_local_dates))
+
+        # Dates served from stored or fetched per-ticker rows are read together up front; 
+        # the others one by one.
+        ticker_snapshots = []
+        date_list = self.date_list
+        missing_dates = [di for di in date_list if di not in local_dates and (self.local.root, self.__class__, di) not in self.cache]
+        if missing_dates:
+            ticker_snapshots, remaining_dates = await loop.run_in_executor(None, self._collect_ticker_snapshots, missing_dates)
+            served_dates = set(missing_dates) - set(remaining_dates)
+            date_list = [di for di in date_list if di not in served_dates]
+
+        async def get_one(di: str) -> tuple:
+            async with semaphore:
+                snapshot = await loop.run_in_executor(None, self._get_snapshot_one, di, local_dates)
+
+            return di, snapshot
+
+        try:
+            results = await asyncio.gather(*(get_one(di) for di in date_list))
+        finally:
+            self.manifest.flush()
+        snapshots = [(di, snapshot) for di, snapshot in results if snapshot is not None]
+        if ticker_snapshots:
+            snapshots = sorted(snapshots + ticker_snapshots, key=lambda date_snapshot: date_snapshot[0])
+
+        return snapshots
+
+    def _get_snapshot_one(
+            self,
+            date: str,
+            local_dates: set,
+            ) -> pd.DataFrame:
+        snapshot = self.cache.get(self.__class__, date, root=self.local.root)
+        if snapshot is not None:
+            self._emit_request(date, 'cache', 0.0)
+            return self._trim_snapshot(snapshot)
+        
+        if date in local_dates:
+            return self._fetch_local_snapshot_one(date, trim=True)
+
+        if self.download:
+            return self._fetch_snapshot_one(date, trim=True)
+
+        return None
+
+    def _emit_request(
+            self,
+            date: str,
+            source: str,
+            seconds: float,
+            **fields,
+            ) -> None:
+        self.instrument.emit(
+            'request', 
+            reader=self.__class__.__name__, 
+            date=date, 
+            source=source, 
+            seconds=seconds,
+            **fields,
+            )
+
+    def _trim_snapshot(
+            self,
+            snapshot: pd.DataFrame,
+            ) -> pd.DataFrame:
+        # Push the universe and data selection down to each daily snapshot, so that 
+        # everything downstream scales with the request rather than the whole market.
+        if self.universe is not None:
+            snapshot = snapshot[snapshot.index.isin(self.universe)]
+
+        return snapshot.reindex(columns=self.data)
+
     def _fetch_data_one(
             self,
             date: str
             ) -> pd.DataFrame:
         pass
 
+    def _fetch_ticker_range(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            ) -> pd.DataFrame:
+        # Readers with a per-ticker endpoint return the ticker's daily rows between 
+        # start_date and end_date, indexed by date.
+        raise NotImplementedError(f'{self.__class__.__name__} has no per-ticker endpoint.')
+
     def _melt_data_one(
             self,
             di_snapshot: pd.DataFrame,
             date: str
             ) -> pd.DataFrame:
+        """
+        Melts a wide snapshot into date/ticker/data/value rows with compact dtypes: 
+        datetime64 dates, categorical tickers (codes from the shared TickerDictionary), 
+        categorical data names and values of the reader's dtype.
+        """
+        data_columns = [col for col in di_snapshot.columns if col in self.available_cols]
+        n_tickers = len(di_snapshot)
+        n_columns = len(data_columns)
+
+        ticker_codes = TickerDictionary.encode(di_snapshot.index.tolist())
+        data_codes = pd.Index(self.available_cols).get_indexer(data_columns)
+        values = di_snapshot[data_columns].to_numpy(dtype=self.dtype)
+
+        # Same row order as DataFrame.melt: all tickers of the first column, then the next column.
+        melt = pd.DataFrame({
+            'date': np.full(n_tickers * n_columns, np.datetime64(date, 'ns')),
+            'ticker': pd.Categorical.from_codes(
+                np.tile(ticker_codes, n_columns),
+                dtype=TickerDictionary.get_dtype(),
+                ),
+            'data': pd.Categorical.from_codes(
+                np.repeat(data_codes, n_tickers),
+                categories=self.available_cols,
+                ),
+            'value': values.T.ravel(),
+            })
         
-        di_snapshot.reset_index(inplace=True)
-        di_snapshot.rename(columns={'티커': 'ticker'}, inplace=True)
-        di_snapshot.loc[:, 'date'] = date
-
-        data_columns = [col for col in di_snapshot.columns if col not in ['ticker', 'date']]
-
-        # Melt data for more robust data delivery. 
-        di_snapshot = di_snapshot.melt(
-            id_vars=['date', 'ticker'],
-            value_vars=data_columns,
-            var_name='data',
-            value_name='value'
-            )
-        
-        return di_snapshot
+        return melt
 
     def _fetch_data_all(
             self,
             date_list: list
             ) -> pd.DataFrame:
-        
-        di_snapshots = []
-        for di in tqdm(date_list):
-            melt = self._fetch_data_one(di)
-            melt = self._melt_data_one(melt, di)
-            di_snapshots.append(melt)
-        
-        df = pd.concat(di_snapshots, axis=0)
+        snapshots = self._fetch_snapshots(date_list)
+        df = PdOps.concat_molten([self._melt_data_one(snapshot, di) for di, snapshot in snapshots])
 
         return df
 
+    def _fetch_snapshots(
+            self,
+            date_list: list,
+            trim: bool=False,
+            ) -> list:
+        
+        def fetch_one(di: str) -> tuple:
+            return di, self._fetch_snapshot_one(di, trim)
+
+        reader = self.__class__.__name__
+        self.instrument.emit('fetch_start', reader=reader, total=len(date_list))
+
+        # executor.map yields results in the order of date_list regardless of completion order.
+        try:
+            with self.instrument.span('fetch', reader=reader):
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    snapshots = list(executor.map(fetch_one, date_list))
+        finally:
+            self.manifest.flush()
+            self.instrument.emit('fetch_end', reader=reader, total=len(date_list))
+
+        return snapshots
+
+    def _fetch_snapshot_one(
+            self,
+            date: str,
+            trim: bool=False,
+            ) -> pd.DataFrame:
+        start = time.perf_counter()
+        snapshot, coalesced = self.flight.do((self.local.root, self.__class__, date), self._fetch_and_store_one, date)
+        self._emit_request(date, 'coalesced' if coalesced else 'network', time.perf_counter() - start)
+
+        if trim:
+            snapshot = self._trim_snapshot(snapshot)
+
+        return snapshot
+
+    def _fetch_and_store_one(
+            self,
+            date: str,
+            ) -> pd.DataFrame:
+        # A fetch of the same date may have finished just before this one started.
+        if (self.local.root, self.__class__, date) in self.cache:
+            snapshot = self.cache.get(self.__class__, date, root=self.local.root)
+            if snapshot is not None:
+                return snapshot
+
+        snapshot = self._fetch_data_one_with_retry(date)
+
+        # Snapshots after the last final date may be partial or not published yet, so 
+        # they are neither stored nor cached and are fetched again on the next read.
+        if date <= DateUtil.get_last_final_date():
+            self._write_local_data(snapshot, date)
+            self.manifest.add(date, snapshot.index)
+            self.cache.put(self.__class__, date, snapshot, root=self.local.root)
+
+        return snapshot
+
+    def _check_snapshot(
+            self,
+            snapshot: pd.DataFrame,
+            date: str,
+            ) -> None:
+        # pykrx catches the parse errors of a failed KRX response and returns an empty 
+        # frame instead, which must not be stored as the (permanent) snapshot of a 
+        # trading day. The calendar is extended over the date if needed, as reads that 
+        # keep holidays never consult it. Today's snapshot may just not be published yet.
+        if (
+            snapshot.empty 
+            and date <= DateUtil.get_last_final_date() 
+            and PykrxCalendar.get_instance(self.local).get(date, date) == [date]
+            ):
+            raise ValueError(f'KRX returned an empty {self.__class__.__name__} snapshot for trading day {date}.')
+
+    def _collect_ticker_snapshots(
+            self,
+            date_list: list,
+            ) -> tuple:
+        """
+        Returns the trimmed snapshots of the dates that per-ticker rows of the universe 
+        serve, together with the dates left to the per-date snapshots.
+
+        Dates every ticker has stored rows for are read from the store. If the rest is 
+        cheaper to fetch per ticker (see `plan_axis`), one range request per ticker that 
+        is missing some of them covers them all, and the rows are stored.
+        """
+        if self.universe is None or self.ticker_fetch_cost is None:
+            return [], date_list
+
+        tickers = sorted(self.universe)
+        stored_dates, missing_dates, missing_tickers = self._get_ticker_coverage(date_list, tickers)
+
+        fetched = {}
+        if self.download and missing_dates:
+            axis_plan = FetchAxisPlanner().plan(self.__class__, missing_dates, missing_tickers)
+            if axis_plan.axis == 'ticker':
+                fetched = self._fetch_ticker_ranges(missing_tickers, missing_dates[0], missing_dates[-1])
+                stored_dates, missing_dates = date_list, []
+
+        if not stored_dates:
+            return [], missing_dates
+
+        # Rows fetched up to today are used as fetched, as the store ends at yesterday.
+        ticker_rows = {}
+        for ticker in tickers:
+            start = time.perf_counter()
+            rows = self.ticker_ranges.read(ticker, stored_dates[0], stored_dates[-1])
+            self._emit_request(f'{stored_dates[0]}~{stored_dates[-1]}', 'disk', time.perf_counter() - start, ticker=ticker)
+            if ticker in fetched:
+                rows = pd.concat([rows, fetched[ticker]])
+                rows = rows[~rows.index.duplicated(keep='last')]
+            ticker_rows[ticker] = rows
+
+        return self._ticker_rows_to_snapshots(ticker_rows, stored_dates), missing_dates
+
+    def _fetch_ticker_ranges(
+            self,
+            tickers: list,
+            start_date: str,
+            end_date: str,
+            ) -> dict:
+        """
+        Fetches and stores the rows of every ticker from start_date to end_date with one 
+        request each, and returns them by ticker.
+        """
+        # Rows from today on may still change, so the stored range ends at yesterday.
+        last_final_date = DateUtil.get_last_final_date()
+
+        def fetch_one(ticker: str) -> pd.DataFrame:
+            start = time.perf_counter()
+            rows = self._call_with_retry(self._fetch_ticker_range, ticker, start_date, end_date)
+            self._emit_request(f'{start_date}~{end_date}', 'network', time.perf_counter() - start, ticker=ticker)
+
+            # pykrx returns a bare DataFrame() for a range without any row, e.g. of a ticker 
+            # that was not listed in it. That range is still stored as covered.
+            if rows.columns.empty:
+                rows = pd.DataFrame(index=pd.DatetimeIndex([]))
+            rows.index = pd.DatetimeIndex(rows.index, name='날짜')
+
+            if start_date <= last_final_date:
+                stored_end = min(end_date, last_final_date)
+                self.ticker_ranges.write(ticker, start_date, stored_end, rows[rows.index <= stored_end])
+
+            return rows
+
+        reader = self.__class__.__name__
+        self.instrument.emit('fetch_start', reader=reader, total=len(tickers))
+        try:
+            with self.instrument.span('fetch', reader=reader):
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    ticker_rows = dict(zip(tickers, executor.map(fetch_one, tickers)))
+        finally:
+            self.instrument.emit('fetch_end', reader=reader, total=len(tickers))
+
+        return ticker_rows
+
+    def _ticker_rows_to_snapshots(
+            self,
+            ticker_rows: dict,
+            date_list: list,
+            ) -> list:
+        # The rows only cover the universe, so they are reshaped into trimmed snapshots.
+        ticker_rows = {ticker: rows for ticker, rows in ticker_rows.items() if not rows.empty}
+        snapshots = {}
+        if ticker_rows:
+            rows = pd.concat(ticker_rows, names=['티커', '날짜']).reindex(columns=self.data)
+            dates = DateUtil.datetime64_to_strdates(rows.index.get_level_values('날짜').to_numpy())
+            snapshots = {di: snapshot.droplevel('날짜') for di, snapshot in rows.groupby(dates)}
+
+        # Dates without any row (e.g. holidays) are empty snapshots, as KRX returns them per date.
+        empty = pd.DataFrame(columns=self.data, index=pd.Index([], name='티커'))
+
+        return [(di, snapshots.get(di, empty)) for di in date_list]
+
+    def _fetch_data_one_with_retry(
+            self,
+            date: str
+            ) -> pd.DataFrame:
+
+        return self._call_with_retry(self._fetch_checked_data_one, date)
+
+    def _fetch_checked_data_one(
+            self,
+            date: str,
+            ) -> pd.DataFrame:
+        snapshot = self._fetch_data_one(date)
+        self._check_snapshot(snapshot, date)
+
+        return snapshot
+
+    def _call_with_retry(
+            self,
+            fetch: callable,
+            *args,
+            ) -> pd.DataFrame:
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                return fetch(*args)
+            except self.retry_errors:
+                if attempt == self.max_retries:
+                    raise
+
+                time.sleep(self.backoff * 2 ** attempt)
+
+    def _get_local_parts(self) -> tuple:
+        return (self.source, self.__class__.__name__)
+
     def _fetch_local_data(
             self,
             date_list: list
             ) -> pd.DataFrame:
-        pass
+        snapshots = self._fetch_local_snapshots(date_list)
+        df = PdOps.concat_molten([self._melt_data_one(snapshot, di) for di, snapshot in snapshots])
+
+        return df
+
+    def _fetch_local_snapshots(
+            self,
+            date_list: list,
+            trim: bool=False,
+            ) -> list:
+        snapshots = [(di, self._fetch_local_snapshot_one(di, trim)) for di in date_list]
+
+        return snapshots
+
+    def _fetch_local_snapshot_one(
+            self,
+            date: str,
+            trim: bool=False,
+            ) -> pd.DataFrame:
+        # With the cache enabled, whole snapshots are read so that other requests can reuse them.
+        columns = self.data if (trim and not self.cache.enabled) else None
+
+        start = time.perf_counter()
+        snapshot = self.local.read_parquet(*self._get_local_parts(), f'{date}.parquet', columns=columns)
+        self._emit_request(date, 'disk', time.perf_counter() - start)
+
+        if columns is None:
+            self.cache.put(self.__class__, date, snapshot, root=self.local.root)
+        if trim:
+            snapshot = self._trim_snapshot(snapshot)
+
+        return snapshot
+
+    def _write_local_data(
+            self,
+            snapshot: pd.DataFrame,
+            date: str,
+            ) -> None:
+        self.local.write_parquet(snapshot, *self._get_local_parts(), f'{date}.parquet')
 
     def _get_available_local_dates(self) -> list:
-        pass
+        files = self.local.list_files(*self._get_local_parts(), suffix='.parquet')
+        local_dates = [f[:-len('.parquet')] for f in files]
+
+        return local_dates
 
     #TODO: Change method name because it overlaps with the method name in DataLoader. 
     def _filter_data(self, df) -> pd.DataFrame:
@@ -133,12 +874,71 @@ class PykrxReader(BaseDataReader):
         return df
 
     def _show_catalog(self) -> pd.DataFrame:
-        pass
+        """
+        Returns one row per field of the reader with what is stored locally: the first 
+        and last stored date, the number of stored dates, the stored date ranges 
+        (consecutive trading days) and the number of tickers of the daily snapshots, and 
+        the number of tickers with stored per-ticker ranges. Reads only the manifest and 
+        file names.
+        """
+        manifest = self.manifest.load()
+        dates = manifest.get('dates', [])
+        date_ranges = self._get_date_ranges(dates)
+
+        catalog = pd.DataFrame({
+            'source': self.source,
+            'reader': self.__class__.__name__,
+            'data': self.get_available_cols(),
+            'requests_per_date': self.fetch_cost,
+            'first_date': dates[0] if dates else None,
+            'last_date': dates[-1] if dates else None,
+            'n_dates': len(dates),
+            'date_ranges': [date_ranges] * len(self.get_available_cols()),
+            'n_tickers': len(manifest.get('tickers', {})),
+            'n_range_tickers': len(self.ticker_ranges.get_tickers()),
+            })
+
+        return catalog
+
+    def get_listing(self) -> ListingIndex:
+        """
+        Returns the point-in-time listing index of the snapshots stored by this reader.
+        """
+        return self.manifest.get_listing()
+
+    def _get_date_ranges(
+            self,
+            dates: list,
+            ) -> list:
+        # Stored dates are split into ranges wherever a trading day is missing. The local 
+        # calendar is used as is, so this never contacts KRX.
+        if not dates:
+            return []
+
+        tradingdays = self.get_tradingdays(dates[0], dates[-1], download=False, local=self.local)
+        calendar = pd.Index(sorted(set(tradingdays) | set(dates)))
+        positions = calendar.get_indexer(dates)
+        breaks = np.flatnonzero(np.diff(positions) > 1) + 1
+
+        starts = np.concatenate([[0], breaks])
+        ends = np.concatenate([breaks, [len(dates)]]) - 1
+
+        return [(dates[start], dates[end]) for start, end in zip(starts, ends)]
 
     @staticmethod
-    def get_tradingdays(start_date: str, end_date: str, index_code='1028') -> list:
-        tradingdays = krx.stock.get_index_ohlcv(start_date, end_date, index_code)
-        tradingdays = [dt.strftime('%Y-%m-%d') for dt in tradingdays.index.tolist()]
+    def get_tradingdays(
+        start_date: str, 
+        end_date: str, 
+        index_code='1028',
+        download: bool=True,
+        local: BaseLocal=None,
+        ) -> list:
+        """
+        Returns the trading days between start_date and end_date from the calendar 
+        stored under local (the default storage root if None).
+        """
+        calendar = PykrxCalendar.get_instance(local, index_code=index_code)
+        tradingdays = calendar.get(start_date, end_date, download=download)
 
         return tradingdays
 
@@ -157,14 +957,14 @@ class PykrxAdjPrice(PykrxReader):
 
         return cls.available_cols
     
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
     
     def _fetch_data_one(
             self, 
             date: str,
             ) -> pd.DataFrame:
-        di_snapshot = krx.stock.get_market_price_change_by_ticker(
+        di_snapshot = get_krx().stock.get_market_price_change_by_ticker(
             fromdate=date, 
             todate=date,
             market='ALL',
@@ -184,22 +984,40 @@ class PykrxOHLCV(PykrxReader):
             '등락률',
         ]
 
+    ticker_fetch_cost = 1.0
+
     @classmethod
     def get_available_cols(cls) -> list:
 
         return cls.available_cols
     
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
 
     def _fetch_data_one(
             self, 
             date: str,
             ) -> pd.DataFrame:
-        di_snapshot = krx.stock.get_market_ohlcv_by_ticker(date, market='ALL')
+        di_snapshot = get_krx().stock.get_market_ohlcv_by_ticker(date, market='ALL')
 
         return di_snapshot
 
+    def _fetch_ticker_range(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            ) -> pd.DataFrame:
+        # adjusted=False keeps the KRX endpoint, whose columns and prices match the snapshots.
+        ticker_rows = get_krx().stock.get_market_ohlcv_by_date(
+            start_date.replace('-', ''),
+            end_date.replace('-', ''),
+            ticker,
+            adjusted=False,
+            )
+
+        return ticker_rows
+
 class PykrxMarketCap(PykrxReader):
     available_cols = [
         '시가총액',
@@ -208,22 +1026,38 @@ class PykrxMarketCap(PykrxReader):
         '상장주식수',
     ]
 
+    ticker_fetch_cost = 1.0
+
     @classmethod
     def get_available_cols(cls) -> list:
 
         return cls.available_cols
     
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
 
     def _fetch_data_one(
             self, 
             date: str,
             ) -> pd.DataFrame:
-        di_snapshot = krx.stock.get_market_cap_by_ticker(date, market='ALL')
+        di_snapshot = get_krx().stock.get_market_cap_by_ticker(date, market='ALL')
 
         return di_snapshot
 
+    def _fetch_ticker_range(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            ) -> pd.DataFrame:
+        ticker_rows = get_krx().stock.get_market_cap_by_date(
+            start_date.replace('-', ''),
+            end_date.replace('-', ''),
+            ticker,
+            )
+
+        return ticker_rows
+
 class PykrxFunda(PykrxReader):
     available_cols = [
         'BPS',
@@ -234,18 +1068,34 @@ class PykrxFunda(PykrxReader):
         'DPS',
     ]
 
+    ticker_fetch_cost = 1.0
+
     @classmethod
     def get_available_cols(cls) -> list:
 
         return cls.available_cols
     
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
 
     def _fetch_data_one(
             self, 
             date: str,
             ) -> pd.DataFrame:
-        di_snapshot = krx.stock.get_market_fundamental(date, market='ALL')
+        di_snapshot = get_krx().stock.get_market_fundamental(date, market='ALL')
+
+        return di_snapshot
+
+    def _fetch_ticker_range(
+            self,
+            ticker: str,
+            start_date: str,
+            end_date: str,
+            ) -> pd.DataFrame:
+        ticker_rows = get_krx().stock.get_market_fundamental_by_date(
+            start_date.replace('-', ''),
+            end_date.replace('-', ''),
+            ticker,
+            )
 
-        return di_snapshot
\ No newline at end of file
+        return ticker_rows
\ No newline at end of file
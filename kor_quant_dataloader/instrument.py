@@ -0,0 +1,156 @@
+import pandas as pd
+
+import time
+import threading
+from contextlib import contextmanager
+
+from typing import Callable, List
+
+class Instrumentation:
+    """
+    Dispatches load pipeline events to callbacks.
+
+    Every event is a dict with an 'event' key and event-specific fields:
+    - 'span': a timed pipeline stage ('stage', 'seconds', and e.g. 'reader').
+    - 'fetch_start' / 'fetch_end': a reader starts/ends looking up 'total' dates, or
+      'total' tickers when it fetches per ticker.
+    - 'request': one date of one reader was served ('reader', 'date', 'source' being
+      'cache', 'disk', 'network' or 'coalesced' when it waited for the same fetch of 
+      another call, and 'seconds'). Per-ticker fetches also have a
+      'ticker', and 'date' is the fetched range as 'start~end'.
+    - 'rows': a stage produced 'rows' rows taking 'bytes' bytes.
+
+    Callbacks are called synchronously, possibly from fetch worker threads.
+    """
+    def __init__(
+            self,
+            callbacks: List[Callable[[dict], None]]=None,
+            ) -> None:
+        self.callbacks = list(callbacks) if callbacks else []
+
+    def emit(
+            self,
+            event: str,
+            **fields,
+            ) -> None:
+        if not self.callbacks:
+            return
+
+        payload = {'event': event, **fields}
+        for callback in self.callbacks:
+            callback(payload)
+
+    @contextmanager
+    def span(
+            self,
+            stage: str,
+            **fields,
+            ):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.emit('span', stage=stage, seconds=time.perf_counter() - start, **fields)
+
+class LoadStats:
+    """
+    A callback that aggregates the events of one or more loads.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = []
+            self.requests = []
+            self.rows = []
+
+    def __call__(
+            self,
+            event: dict,
+            ) -> None:
+        with self._lock:
+            if event['event'] == 'span':
+                self.spans.append(event)
+            elif event['event'] == 'request':
+                self.requests.append(event)
+            elif event['event'] == 'rows':
+                self.rows.append(event)
+
+    def get_spans(self) -> pd.DataFrame:
+        """
+        Returns the number of calls and total seconds per stage.
+        """
+        with self._lock:
+            spans = pd.DataFrame(self.spans, columns=['stage', 'seconds'])
+
+        return spans.groupby('stage', sort=False)['seconds'].agg(['count', 'sum']).rename(columns={'sum': 'seconds'})
+
+    def get_requests(self) -> pd.DataFrame:
+        """
+        Returns the number of dates and their latencies per reader and source.
+        """
+        with self._lock:
+            requests = pd.DataFrame(self.requests, columns=['reader', 'date', 'source', 'seconds'])
+
+        grouped = requests.groupby(['reader', 'source'])['seconds']
+
+        return grouped.agg(['count', 'mean', 'max', 'sum']).rename(columns={'mean': 'mean_seconds', 'max': 'max_seconds', 'sum': 'seconds'})
+
+    def get_rows(self) -> pd.DataFrame:
+        """
+        Returns the rows and bytes produced per stage.
+        """
+        with self._lock:
+            rows = pd.DataFrame(self.rows, columns=['stage', 'rows', 'bytes'])
+
+        return rows.groupby('stage', sort=False)[['rows', 'bytes']].sum()
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """
+        The share of dates served by the in-process snapshot cache.
+        """
+        with self._lock:
+            n_requests = len(self.requests)
+            n_hits = sum(request['source'] == 'cache' for request in self.requests)
+
+        return n_hits / n_requests if n_requests else 0.0
+
+    def __repr__(self) -> str:
+        with self._lock:
+            n_spans, n_requests = len(self.spans), len(self.requests)
+
+        return f'LoadStats(spans={n_spans}, requests={n_requests}, cache_hit_rate={self.cache_hit_rate:.2f})'
+
+class TqdmProgress:
+    """
+    A callback that shows a tqdm progress bar of the dates each reader fetches from KRX.
+    """
+    def __init__(self) -> None:
+        self._bars = {}
+        self._lock = threading.Lock()
+
+    def __call__(
+            self,
+            event: dict,
+            ) -> None:
+        if event['event'] == 'fetch_start':
+            from tqdm import tqdm
+
+            with self._lock:
+                self._bars[event['reader']] = tqdm(total=event['total'], desc=event['reader'])
+        elif event['event'] == 'request' and event['source'] in ('network', 'coalesced'):
+            with self._lock:
+                bar = self._bars.get(event['reader'])
+            if bar is not None:
+                bar.update(1)
+        elif event['event'] == 'fetch_end':
+            with self._lock:
+                bar = self._bars.pop(event['reader'], None)
+            if bar is not None:
+                bar.close()
+
+def get_default_instrumentation() -> Instrumentation:
+    return Instrumentation(callbacks=[TqdmProgress()])
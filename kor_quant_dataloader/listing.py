@@ -0,0 +1,214 @@
+import numpy as np
+import pandas as pd
+
+from typing import Union, List
+
+from .utils import DateUtil
+
+class ListingIndex:
+    """
+    Point-in-time record of which tickers were listed on which trading day.
+
+    Built from the daily snapshots readers store: a ticker is listed on a date if it
+    appears in that date's snapshot. The presence is kept as a (date x ticker) boolean
+    mask, so "listed on date d" and "is ticker t listed on d" are row and cell lookups,
+    and it compiles to listing intervals and to delisting-aware masks for any dates.
+    """
+    def __init__(
+            self,
+            mask: np.ndarray,
+            dates: Union[list, pd.Index],
+            tickers: Union[list, pd.Index],
+            ) -> None:
+        self.mask = mask
+        self.dates = pd.DatetimeIndex(dates, name='date')
+        self.tickers = pd.Index(tickers, name='ticker')
+
+        expected_shape = (len(self.dates), len(self.tickers))
+        if self.mask.shape != expected_shape:
+            raise ValueError(f'Listing mask has shape {self.mask.shape}, expected {expected_shape}')
+
+    @classmethod
+    def empty(cls) -> 'ListingIndex':
+        return cls(np.zeros((0, 0), dtype=bool), pd.DatetimeIndex([]), pd.Index([], dtype=object))
+
+    @classmethod
+    def union(
+        cls,
+        indexes: List['ListingIndex'],
+        ) -> 'ListingIndex':
+        """
+        Combines indexes, e.g. of several readers: a ticker is listed on a date if any
+        index has it listed.
+        """
+        dates = pd.DatetimeIndex(sorted(set().union(*(index.dates for index in indexes))))
+        tickers = pd.Index(sorted(set().union(*(index.tickers for index in indexes))), dtype=object)
+
+        mask = np.zeros((len(dates), len(tickers)), dtype=bool)
+        for index in indexes:
+            mask |= index.get_mask(dates, tickers)
+
+        return cls(mask, dates, tickers)
+
+    def update(
+            self,
+            listed: dict,
+            ) -> 'ListingIndex':
+        """
+        Returns a new index with the tickers listed on some dates added or replaced.
+
+        Parameters:
+        - listed (dict): {'YYYY-MM-DD': tickers in that date's snapshot}.
+        """
+        new_dates = pd.DatetimeIndex(DateUtil.strdates_to_datetime64(list(listed)).astype('datetime64[ns]'))
+        new_tickers = set(str(ticker) for tickers in listed.values() for ticker in tickers)
+
+        dates = self.dates.union(new_dates)
+        tickers = pd.Index(sorted(set(self.tickers) | new_tickers), dtype=object)
+
+        mask = np.zeros((len(dates), len(tickers)), dtype=bool)
+        mask[np.ix_(dates.get_indexer(self.dates), tickers.get_indexer(self.tickers))] = self.mask
+
+        for row, row_tickers in zip(dates.get_indexer(new_dates), listed.values()):
+            mask[row] = False
+            mask[row, tickers.get_indexer(pd.Index([str(ticker) for ticker in row_tickers], dtype=object))] = True
+
+        return ListingIndex(mask, dates, tickers)
+
+    def is_listed(
+            self,
+            date: str,
+            ticker: str,
+            ) -> bool:
+        return bool(self.mask[self.dates.get_loc(pd.Timestamp(date)), self.tickers.get_loc(ticker)])
+
+    def get_listed(
+            self,
+            date: str,
+            ) -> pd.Index:
+        """
+        Returns the tickers listed on a stored date.
+        """
+        return self.tickers[self.mask[self.dates.get_loc(pd.Timestamp(date))]]
+
+    def get_mask(
+            self,
+            dates: pd.Index,
+            tickers: pd.Index,
+            ) -> np.ndarray:
+        """
+        Returns the presence aligned to the given dates and tickers. Dates and tickers
+        the index does not know are not listed.
+        """
+        date_positions = self.dates.get_indexer(pd.DatetimeIndex(dates))
+        ticker_positions = self.tickers.get_indexer(tickers)
+        if not self.mask.size:
+            return np.zeros((len(date_positions), len(ticker_positions)), dtype=bool)
+
+        mask = self.mask[np.ix_(np.maximum(date_positions, 0), np.maximum(ticker_positions, 0))]
+        mask &= (date_positions >= 0)[:, None] & (ticker_positions >= 0)[None, :]
+
+        return mask
+
+    def get_bounds(
+            self,
+            tickers: pd.Index=None,
+            ) -> pd.DataFrame:
+        """
+        Returns the first and last listed date of each ticker. A ticker listed on the
+        first (last) date of the index may have been listed before (after), so its bound
+        is NaT there: only listings and delistings the index saw are bounded.
+        """
+        tickers = self.tickers if tickers is None else pd.Index(tickers)
+        positions = self.tickers.get_indexer(tickers)
+        mask = self.mask[:, np.maximum(positions, 0)] & (positions >= 0)[None, :]
+
+        any_listed = mask.any(axis=0)
+        first = np.where(any_listed, mask.argmax(axis=0), -1)
+        last = np.where(any_listed, len(self.dates) - 1 - mask[::-1].argmax(axis=0), -1)
+
+        dates = self.dates.to_numpy()
+        nat = np.datetime64('NaT', 'ns')
+        bounds = pd.DataFrame(
+            {
+                'first_date': np.where(any_listed & (first > 0), dates[np.maximum(first, 0)], nat),
+                'last_date': np.where(any_listed & (last < len(dates) - 1), dates[np.maximum(last, 0)], nat),
+                'listed': any_listed,
+            },
+            index=tickers,
+            )
+
+        return bounds
+
+    def get_span_mask(
+            self,
+            dates: pd.Index,
+            tickers: pd.Index,
+            ) -> np.ndarray:
+        """
+        Returns a (date x ticker) mask that is True from each ticker's listing to its
+        delisting, including holidays and suspended days in between. Tickers the index
+        never saw listed are not bounded, so they are True everywhere.
+        """
+        bounds = self.get_bounds(tickers)
+        dates = pd.DatetimeIndex(dates).to_numpy()[:, None]
+
+        # Comparisons with NaT are False, so unknown bounds never mask.
+        first = bounds['first_date'].to_numpy()[None, :]
+        last = bounds['last_date'].to_numpy()[None, :]
+
+        mask = ~(dates < first) & ~(dates > last)
+
+        return mask
+
+    def get_intervals(self) -> pd.DataFrame:
+        """
+        Returns one row per ticker and run of consecutive stored dates it was listed on,
+        with the run's first and last date.
+        """
+        padded = np.zeros((len(self.dates) + 2, len(self.tickers)), dtype=np.int8)
+        padded[1:-1] = self.mask
+        changes = np.diff(padded, axis=0)
+
+        start_dates, start_tickers = np.nonzero(changes == 1)
+        end_dates, end_tickers = np.nonzero(changes == -1)
+
+        # np.nonzero walks row by row, so sort both by ticker to pair each start with its end.
+        start_order = np.lexsort((start_dates, start_tickers))
+        end_order = np.lexsort((end_dates, end_tickers))
+
+        intervals = pd.DataFrame({
+            'ticker': self.tickers[start_tickers[start_order]],
+            'start': self.dates[start_dates[start_order]],
+            'end': self.dates[end_dates[end_order] - 1],
+            })
+
+        return intervals
+
+    def to_arrays(self) -> dict:
+        arrays = {
+            'bits': np.packbits(self.mask, axis=1),
+            'shape': np.array(self.mask.shape),
+            'dates': self.dates.to_numpy(dtype='datetime64[ns]'),
+            'tickers': self.tickers.to_numpy(dtype=str),
+        }
+
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict,
+        ) -> 'ListingIndex':
+        if not arrays:
+            return cls.empty()
+
+        n_dates, n_tickers = arrays['shape']
+        mask = np.unpackbits(arrays['bits'], axis=1, count=n_tickers).astype(bool).reshape(n_dates, n_tickers)
+
+        return cls(mask, pd.DatetimeIndex(arrays['dates']), pd.Index(arrays['tickers'].astype(object)))
+
+    def __repr__(self) -> str:
+        n_dates, n_tickers = self.mask.shape
+
+        return f'ListingIndex(dates={n_dates}, tickers={n_tickers})'
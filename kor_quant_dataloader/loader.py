@@ -1,33 +1,54 @@
 import numpy as np
 import pandas as pd
 
+import asyncio
+from functools import partial
 from itertools import starmap
+from concurrent.futures import ThreadPoolExecutor, Future
 
-from typing import Union, List
+from typing import Union, List, Iterator, Callable
 
-from .utils import (
-    CommonOps,
-    PdOps
+from .utils import DateUtil, load_env
+from .panel import Panel
+from .instrument import (
+    Instrumentation,
+    LoadStats,
+    TqdmProgress,
+)
+from .backfill import Backfill
+from .adjust import (
+    ADJUSTED_FIELDS,
+    ADJUSTED_READERS,
+    AdjustmentFactors,
+    adjustment_cache,
+    plan_fetch,
+)
+from .listing import ListingIndex
+from .options import DataOptions
+from .shared import PanelServer, attach_panel
+from .planner import FetchAxisPlanner, FetchPlan, FetchPlanner
+from .universe import (
+    LiquidityUniverse,
+    UniverseMembership,
+    membership_cache,
+)
+from .datasource.base import (
+    BaseDataReader,
+    BaseLocal,
+    reader_registry,
 )
-from .datasource.base import BaseDataReader
 from .datasource.pykrx_ import (
     PykrxReader,
+    PykrxAdjPrice,
+    PykrxOHLCV,
 )
 
-import os
-from dotenv import load_dotenv
-
-load_dotenv()
-
-env = os.getenv('ENV')
-
-if env == 'prod':
-    import warnings
-    warnings.filterwarnings('ignore')
-elif env == 'dev':
-    pass
+CATALOG_COLUMNS = [
+    'source', 'reader', 'data', 'requests_per_date', 
+    'first_date', 'last_date', 'n_dates', 'date_ranges', 'n_tickers', 'n_range_tickers',
+    ]
 
-def show_catalog() -> pd.DataFrame:
+def show_catalog(source: str=None) -> pd.DataFrame:
     """
     Displays the collection of available data in the catalog.
 
@@ -36,8 +57,41 @@ def show_catalog() -> pd.DataFrame:
     applicable optional parameters (e.g., fill='ffill'). The catalog is aggregated 
     automatically from each data source object, eliminating the need for manual updates.
 
+    The adjusted prices ('수정시가', '수정고가', '수정저가' and '수정종가') are listed as 
+    well, computed from the readers shown next to them.
+
+    Next to every data, the catalog shows what is already stored locally (first and 
+    last date, number of dates, stored date ranges and number of tickers of the daily 
+    snapshots, and the number of tickers with per-ticker ranges stored by small-universe 
+    loads). It is built from the readers' local manifests and file names and never 
+    contacts the data sources.
+
+    Parameters:
+    - source (str, optional): Only show the data of this source. Defaults to all sources.
     """    
-    pass
+    sources = [source.lower()] if source is not None else reader_registry.get_sources()
+    catalogs = [
+        reader(instrument=Instrumentation())._show_catalog()
+        for source in sources
+        for reader in reader_registry.get_readers(source)
+        ]
+
+    if not catalogs:
+        return pd.DataFrame(columns=CATALOG_COLUMNS)
+
+    catalog = pd.concat(catalogs, ignore_index=True)
+
+    # Adjusted fields are listed with the stored coverage of their unadjusted prices.
+    price_reader = ADJUSTED_READERS[0]
+    prices = catalog[catalog['reader'] == price_reader.__name__].set_index('data')
+    if not prices.empty:
+        adjusted = prices.loc[list(ADJUSTED_FIELDS.values())].reset_index()
+        adjusted['data'] = list(ADJUSTED_FIELDS)
+        adjusted['reader'] = ' + '.join(reader.__name__ for reader in ADJUSTED_READERS)
+        adjusted['requests_per_date'] = sum(reader.fetch_cost for reader in ADJUSTED_READERS)
+        catalog = pd.concat([catalog, adjusted[catalog.columns]], ignore_index=True)
+
+    return catalog
 
 class DataLoader:
     """
@@ -55,6 +109,12 @@ class DataLoader:
             end_date: str=None, 
             universe: Union[list, np.ndarray]=None, 
             remove_holidays: bool=True,
+            max_workers: int=1,
+            dtype: str='float64',
+            panel: str=None,
+            shared_panel: str=None,
+            callbacks: List[Callable[[dict], None]]=None,
+            progress: bool=True,
             ) -> None:
         """
         Initializes the DataLoader with the specified parameters for loading 
@@ -69,19 +129,52 @@ class DataLoader:
           This can be a list or numpy array, containing elements that are either strings 
           or integers. The format of stock IDs can vary; a separate utility function 
           will standardize them for consistency. Defaults to None.
+        - max_workers (int, optional): The number of dates each reader fetches concurrently. 
+          Requests are still rate-limited globally (see `PykrxReader.set_rate_limit`). 
+          Defaults to 1.
+        - dtype (str, optional): The dtype of the loaded values, either 'float64' or 'float32'. 
+          'float32' halves the memory of the loaded data at the cost of precision 
+          (about 7 significant digits). Defaults to 'float64'.
+        - panel (str, optional): The name of a panel saved with `build_panel`. If given, 
+          `get_data` slices the memory-mapped panel instead of going through the readers. 
+          Defaults to None.
+        - shared_panel (str, optional): The name of a panel published to shared memory 
+          with `share_panel`. If given, `get_data` slices read-only views of it, so any 
+          number of processes use one copy of the values. Defaults to None.
+        - callbacks (List[Callable[[dict], None]], optional): Functions called with every 
+          pipeline event (timed stages, per-date requests, produced rows; see 
+          `Instrumentation`). Aggregated statistics are always available in `self.stats`. 
+          Defaults to None.
+        - progress (bool, optional): If True, shows a progress bar of the KRX requests. 
+          Defaults to True.
         
         Note:
         Stock ID formats in the 'universe' (either strings or integers in a list or numpy array) 
         are automatically standardized by a common utility function to ensure consistency and 
         compatibility with the data source.
         """        
+        load_env()
+
         self.source = source.lower()
         self.start_date = start_date
         self.end_date = end_date
-        self.universe = universe
+        self.set_universe(universe)
         self.remove_holidays = remove_holidays
+        self.max_workers = max_workers
+
+        if dtype not in ('float64', 'float32'):
+            raise ValueError(f"Invalid dtype: {dtype}. Use 'float64' or 'float32'.")
+        self.dtype = dtype
+        self.panel = panel
+        self.shared_panel = shared_panel
+
+        self.stats = LoadStats()
+        self.instrument = Instrumentation(
+            [self.stats] + ([TqdmProgress()] if progress else []) + list(callbacks or [])
+            )
 
         self.tradingdays = []
+        self.plan = None
 
         # TODO: Validate inputs
 
@@ -89,6 +182,7 @@ class DataLoader:
             self, 
             data: Union[str, List[str]],
             download=True,
+            options: dict=None,
             ) -> pd.DataFrame:
         """
         Retrieves financial data specified by the 'data' parameter and returns it 
@@ -106,6 +200,10 @@ class DataLoader:
         - data (Union[str, List[str]]): A single data name or a list of data names.
         - download (bool, optional): If True, attempts to download the data if not 
         available locally. Defaults to True.
+        - options (dict, optional): Processing options such as fill='ffill', limit, 
+          fill_value, zero_as_nan and holidays='ffill', either for all data 
+          ({'fill': 'ffill'}) or per data ({'BPS': {'fill': 'ffill', 'limit': 60}}). 
+          See `DataOptions`. Defaults to None.
 
         Returns:
         - pd.DataFrame: A DataFrame structured according to the input:
@@ -113,6 +211,227 @@ class DataLoader:
             - List of strings 'data': MultiIndex Rows = (dates, stock IDs), Columns = data names.
         """        
 
+        data, transform = self._parse_data(data)
+        df = self._load_data(data, transform, download, self.start_date, self.end_date, options=options)
+
+        return df
+
+    def iter_data(
+            self,
+            data: Union[str, List[str]],
+            chunk: str='M',
+            download=True,
+            options: dict=None,
+            ) -> Iterator[pd.DataFrame]:
+        """
+        Iterates over the data chunk by chunk instead of loading the whole period at once.
+
+        The period from start_date to end_date is split into calendar periods of the 
+        frequency 'chunk' and one DataFrame, structured as in `get_data`, is yielded per 
+        period. The next chunk is fetched in the background while the current one is 
+        being consumed, so memory stays bounded by about two chunks.
+
+        Parameters:
+        - data (Union[str, List[str]]): A single data name or a list of data names.
+        - chunk (str, optional): A pandas period frequency, e.g. 'W', 'M', 'Q' or 'Y'. 
+          Defaults to 'M'.
+        - download (bool, optional): If True, attempts to download the data if not 
+        available locally. Defaults to True.
+        - options (dict, optional): As in `get_data`. Fills do not reach across chunks.
+
+        Yields:
+        - pd.DataFrame: The data of one chunk.
+        """
+        data, transform = self._parse_data(data)
+        chunks = DateUtil.split_daterange(self.start_date, self.end_date, chunk)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            def submit(chunk_range: tuple) -> Future:
+                return executor.submit(self._load_data, data, transform, download, *chunk_range, options=options)
+
+            future = submit(chunks[0]) if chunks else None
+            for next_chunk in chunks[1:] + [None]:
+                df = future.result()
+                if next_chunk is not None:
+                    future = submit(next_chunk)
+
+                yield df
+
+    def update(
+            self,
+            data: Union[str, List[str]]=None,
+            end_date: str=None,
+            ) -> pd.DataFrame:
+        """
+        Appends the trading days that are not stored locally yet and returns only them.
+
+        For every reader needed for 'data', the last locally stored date is looked up and 
+        only the trading days after it (or from start_date, if nothing is stored) up to 
+        end_date are fetched. Each day is written to the local store atomically, so an 
+        interrupted update can simply be run again. Meant for daily append jobs, run 
+        after the market has closed.
+
+        Parameters:
+        - data (Union[str, List[str]], optional): A single data name or a list of data 
+          names. Defaults to all data of the source.
+        - end_date (str, optional): The last date to fetch. Defaults to today.
+
+        Returns:
+        - pd.DataFrame: The newly fetched days, structured as in `get_data`.
+        """
+        parent_reader = self._get_parent_reader()
+        if data is None:
+            data = list(dict.fromkeys(parent_reader.get_available_cols()))
+        data, transform = self._parse_data(data)
+
+        if end_date is None:
+            end_date = pd.Timestamp.today().strftime('%Y-%m-%d')
+
+        assigned = self._assign_data_to_reader(parent_reader, data)
+
+        new_dates = set()
+        for child_reader in assigned:
+            reader_instance = self._get_reader_instance(child_reader)
+
+            local_dates = reader_instance._get_available_local_dates()
+            start_date = DateUtil.add_strdt(local_dates[-1], 1) if local_dates else self.start_date
+            if start_date > end_date:
+                continue
+
+            date_list = parent_reader.get_tradingdays(start_date, end_date)
+            reader_instance._fetch_snapshots(date_list)
+            new_dates.update(date_list)
+
+        if not new_dates:
+            return self._transform_data(Panel.from_snapshots([], fields=data), data, transform)
+
+        # The new days are now cached and stored, so the delta is assembled without KRX.
+        collected = self._collect_data(data, False, min(new_dates), max(new_dates))
+        collected = collected.select(dates=sorted(new_dates))
+        df = self._transform_data(collected, data, transform)
+
+        return df
+
+    def backfill(
+            self,
+            data: Union[str, List[str]]=None,
+            chunk: str='M',
+            max_parallel: int=None,
+            ) -> pd.DataFrame:
+        """
+        Fills the local store over the loader's period in resumable chunks, with the 
+        readers of 'data' (all readers by default) running in parallel, each fetching 
+        the loader's max_workers dates at once. Completed chunks are checkpointed, so 
+        after a crash the same call resumes where it stopped. See `Backfill`; the same 
+        job runs from the command line with `python -m kor_quant_dataloader`.
+
+        Returns:
+        - pd.DataFrame: The status of every reader and chunk.
+        """
+        if isinstance(data, str):
+            data = [data]
+
+        backfill = Backfill(
+            self.start_date,
+            end_date=self.end_date,
+            data=data,
+            source=self.source,
+            chunk=chunk,
+            max_parallel=max_parallel,
+            max_workers=self.max_workers,
+            instrument=self.instrument,
+            )
+
+        return backfill.run()
+
+    def build_panel(
+            self,
+            data: List[str],
+            name: str,
+            download=True,
+            ) -> Panel:
+        """
+        Loads 'data' for the whole market over the loader's period and saves it as a 
+        memory-mappable panel under `<KQDL_DATA_DIR>/<source>/panels/<name>`. 
+        
+        Loaders created with `panel=name` then serve `get_data` by slicing the dates, 
+        tickers and data of this panel without copying, and several processes on one 
+        machine share its pages through the OS page cache.
+
+        Returns:
+        - Panel: The saved panel.
+        """
+        data, _ = self._parse_data(data)
+
+        universe, self.universe = self.universe, None
+        try:
+            collected = self._collect_data(data, download, self.start_date, self.end_date)
+        finally:
+            self.universe = universe
+
+        collected.save(self._get_panel_path(name))
+
+        return collected
+
+    def share_panel(
+            self,
+            data: List[str],
+            name: str,
+            server: PanelServer,
+            download=True,
+            ) -> Panel:
+        """
+        Loads 'data' for the whole market over the loader's period once and publishes it 
+        to shared memory under `name`. 
+
+        Loaders created with `shared_panel=name`, in this or any other process on the 
+        machine, then serve `get_data` from read-only views of that single copy. The 
+        panel is available until the server unpublishes it or is closed.
+
+        Returns:
+        - Panel: The published panel.
+        """
+        data, _ = self._parse_data(data)
+
+        universe, self.universe = self.universe, None
+        try:
+            collected = self._collect_data(data, download, self.start_date, self.end_date)
+        finally:
+            self.universe = universe
+
+        server.publish(name, collected)
+
+        return collected
+
+    def _get_panel_path(
+            self,
+            name: str,
+            ) -> str:
+        return BaseLocal().get_path(self.source, 'panels', name)
+
+    def _open_panel(
+            self,
+            data: list,
+            start_date: str,
+            end_date: str,
+            ) -> Panel:
+        if self.shared_panel is not None:
+            name, panel = self.shared_panel, attach_panel(self.shared_panel)
+        else:
+            name, panel = self.panel, Panel.load(self._get_panel_path(self.panel))
+
+        not_available_col = set(data) - set(panel.fields)
+        if not_available_col:
+            raise KeyError(f'Data not available in panel {name}: {not_available_col}')
+
+        opened = panel.between(start_date, end_date).select(fields=data)
+
+        return opened
+
+    def _parse_data(
+            self,
+            data: Union[str, List[str]],
+            ) -> tuple:
         if isinstance(data, str):
             data = [data]
             transform = 'single'
@@ -121,82 +440,504 @@ class DataLoader:
         else:
             raise TypeError(f"Invalid data type for 'data': {type(data)}")
 
-        collected = self._collect_data(data, download)
-        filtered = self._filter_data(collected, options=None)
-        #TODO: apply options
+        return data, transform
 
-        if transform  == 'single':
-            df = PdOps.molten_to_single(filtered) #TODO: molten_to_single is better.
-        elif transform == 'multi':
-            df = PdOps.molten_to_multi(filtered)
+    def _load_data(
+            self,
+            data: list,
+            transform: str,
+            download: bool,
+            start_date: str,
+            end_date: str,
+            options: dict=None,
+            ) -> pd.DataFrame:
+        collected = self._collect_data(data, download, start_date, end_date)
+        df = self._transform_data(collected, data, transform, download=download, options=options)
 
         return df
-    
-    def _collect_data(
-            self, 
-            data: list, 
-            download: bool, 
+
+    async def aget_data(
+            self,
+            data: Union[str, List[str]],
+            download=True,
+            max_concurrency: int=8,
+            options: dict=None,
             ) -> pd.DataFrame:
-        
+        """
+        Asynchronous version of `get_data`, for use inside an asyncio event loop.
+
+        The dates of all readers are fetched concurrently in the loop's default executor, 
+        with at most max_concurrency dates in flight for this call, so the event loop is 
+        never blocked. Cancelling the call cancels the dates that have not started yet.
+
+        Parameters:
+        - data (Union[str, List[str]]): A single data name or a list of data names.
+        - download (bool, optional): If True, attempts to download the data if not 
+        available locally. Defaults to True.
+        - max_concurrency (int, optional): The maximum number of dates fetched at once. 
+          Defaults to 8.
+        - options (dict, optional): As in `get_data`.
+
+        Returns:
+        - pd.DataFrame: The same as `get_data`.
+        """
+        data, transform = self._parse_data(data)
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        parent_reader = self._get_parent_reader()
+        adjusted_data = [d for d in data if d in ADJUSTED_FIELDS]
+        assigned = self._get_plain_assigned(self._assign_data_to_reader(parent_reader, data))
+
+        results = await asyncio.gather(*(
+            self._get_reader_instance(child_reader).aread_snapshots(
+                assigned_data,
+                self.start_date,
+                self.end_date,
+                download,
+                remove_holidays=self.remove_holidays,
+                universe=self._get_reader_universe(),
+                semaphore=semaphore,
+                )
+            for child_reader, assigned_data in assigned.items()
+            ))
+        snapshots = [snapshot for result in results for snapshot in result]
+        if adjusted_data:
+            snapshots += await loop.run_in_executor(
+                None,
+                self._read_unadjusted_snapshots, 
+                adjusted_data, download, self.start_date, self.end_date,
+                )
+
+        if self.remove_holidays:
+            self.tradingdays = await loop.run_in_executor(
+                None, 
+                partial(parent_reader.get_tradingdays, self.start_date, self.end_date, download=download),
+                )
+
+        collected = await loop.run_in_executor(
+            None, 
+            partial(Panel.from_snapshots, snapshots, fields=data, dtype=self.dtype),
+            )
+        if adjusted_data and len(collected.dates):
+            adjustment = await loop.run_in_executor(None, self._get_adjustment, collected.dates, self.end_date, download)
+            collected = adjustment.adjust(collected, adjusted_data, self.end_date)
+        # Dynamic universes may need to fetch trading values, so they are resolved off the loop.
+        if isinstance(self.universe, str) and len(collected.dates):
+            await loop.run_in_executor(None, self._get_membership, collected.dates, download)
+        df = self._transform_data(collected, data, transform, download=download, options=options)
+
+        return df
+
+    def _transform_data(
+            self,
+            collected: Panel,
+            data: list,
+            transform: str,
+            download: bool=True,
+            options: dict=None,
+            ) -> pd.DataFrame:
+        options = DataOptions(options, data) if options else None
+        with self.instrument.span('filter'):
+            filtered = self._filter_data(collected, options=options, download=download)
+
+        with self.instrument.span('transform'):
+            if transform  == 'single':
+                df = filtered.get_frame(data[0])
+            elif transform == 'multi':
+                df = filtered.to_multi()
+
+        self.instrument.emit('rows', stage='output', rows=len(df), bytes=filtered.values.nbytes)
+
+        return df
+
+    def _get_reader_instance(
+            self,
+            child_reader: BaseDataReader,
+            ) -> BaseDataReader:
+        return child_reader(
+            max_workers=self.max_workers, 
+            dtype=self.dtype, 
+            instrument=self.instrument,
+            )
+    
+    def _get_parent_reader(self) -> BaseDataReader:
         if self.source == 'pykrx':
             parent_reader = PykrxReader
         elif self.source == ('fdr' or 'financedatareader'):
             parent_reader = None
         elif self.source == 'opendartreader':
             parent_reader = None
+
+        return parent_reader
+
+    def _collect_data(
+            self, 
+            data: list, 
+            download: bool, 
+            start_date: str, 
+            end_date: str, 
+            ) -> Panel:
+
+        if self.panel is not None or self.shared_panel is not None:
+            return self._open_panel(data, start_date, end_date)
         
-        assigned = self._assign_data_to_reader(parent_reader, data)
+        parent_reader = self._get_parent_reader()
+        
+        adjusted_data = [d for d in data if d in ADJUSTED_FIELDS]
+        assigned = self._get_plain_assigned(self._assign_data_to_reader(parent_reader, data))
         
-        collected = []
+        # Per-day wide snapshots go straight into the panel, without melting and pivoting.
+        snapshots = []
+        if adjusted_data:
+            snapshots += self._read_unadjusted_snapshots(adjusted_data, download, start_date, end_date)
         for child_reader, assigned_data in assigned.items():
-            reader_instance = child_reader()
-            collected.append(
-                reader_instance.read(
+            reader_instance = self._get_reader_instance(child_reader)
+            with self.instrument.span('read', reader=child_reader.__name__):
+                snapshots += reader_instance.read_snapshots(
                     assigned_data, 
-                    self.start_date, 
-                    self.end_date, 
+                    start_date, 
+                    end_date, 
                     download,
+                    remove_holidays=self.remove_holidays,
+                    universe=self._get_reader_universe(),
                     )
-            )
         
-        collected_df = pd.concat(collected, axis=0)
-
+        with self.instrument.span('panel'):
+            collected = Panel.from_snapshots(snapshots, fields=data, dtype=self.dtype)
+        self.instrument.emit('rows', stage='panel', rows=len(collected.dates) * len(collected.tickers), bytes=collected.values.nbytes)
+
+        # Prices are adjusted to the basis of the loader's end_date, so that the chunks of 
+        # `iter_data` are adjusted like the whole period in `get_data`.
+        if adjusted_data and len(collected.dates):
+            basis_date = max(end_date, self.end_date or end_date)
+            with self.instrument.span('adjust'):
+                adjustment = self._get_adjustment(collected.dates, basis_date, download)
+                collected = adjustment.adjust(collected, adjusted_data, basis_date)
+
+        # Readers already fetch trading days only; the calendar lookup is served from cache.
         if self.remove_holidays:
-            self.tradingdays = parent_reader.get_tradingdays(self.start_date, self.end_date)
-            collected_df = collected_df[collected_df['date'].isin(self.tradingdays)]
+            self.tradingdays = parent_reader.get_tradingdays(
+                start_date, 
+                end_date, 
+                download=download,
+                )
+
+        return collected
+
+    def _read_unadjusted_snapshots(
+            self,
+            adjusted_data: list,
+            download: bool,
+            start_date: str,
+            end_date: str,
+            ) -> list:
+        # Adjusted fields start as the unadjusted OHLCV prices, renamed to the adjusted 
+        # names so they sit next to the unadjusted ones in the panel.
+        renamed = {ADJUSTED_FIELDS[d]: d for d in adjusted_data}
+        reader_instance = self._get_reader_instance(PykrxOHLCV)
+        with self.instrument.span('read', reader=PykrxOHLCV.__name__):
+            snapshots = reader_instance.read_snapshots(
+                list(renamed),
+                start_date,
+                end_date,
+                download,
+                remove_holidays=self.remove_holidays,
+                universe=self._get_reader_universe(),
+                )
+
+        return [(di, snapshot.rename(columns=renamed)) for di, snapshot in snapshots]
+
+    def _get_adjustment(
+            self,
+            dates: pd.DatetimeIndex,
+            end_date: str,
+            download: bool,
+            ) -> AdjustmentFactors:
+        """
+        Returns the adjustment events of the whole market covering the trading days 
+        after the first of the given dates up to end_date, computing those of missing 
+        days from the base prices and closes of PykrxAdjPrice and storing them.
+        """
+        parent_reader = self._get_parent_reader()
+        start_date = DateUtil.datetime64_to_strdates(dates[[0]].to_numpy())[0]
 
-        return collected_df
+        local = BaseLocal()
+        stored = adjustment_cache.get(local, self.source)
+        missing_dates = stored.get_missing(parent_reader.get_tradingdays(start_date, end_date, download=download)[1:])
+        if not missing_dates:
+            return stored
+
+        # The ratio of the first missing day needs the close of the trading day before it.
+        lookback = parent_reader.get_tradingdays(DateUtil.add_strdt(missing_dates[0], -30), missing_dates[0], download=download)
+        history_start = lookback[-2] if len(lookback) > 1 else missing_dates[0]
+
+        reader_instance = self._get_reader_instance(PykrxAdjPrice)
+        with self.instrument.span('read', reader=PykrxAdjPrice.__name__):
+            snapshots = reader_instance.read_snapshots(['시가', '종가'], history_start, missing_dates[-1], download)
+        computed = AdjustmentFactors.compute(Panel.from_snapshots(snapshots, fields=['시가', '종가']))
+        if not len(computed.covered):
+            return stored
+
+        adjustment = stored.update(computed)
+        adjustment_cache.put(local, self.source, adjustment)
+
+        return adjustment
 
     def _assign_data_to_reader(
             self, 
             parent_reader: BaseDataReader,  
             data_list: list
             ):
-        not_available_col = set(data_list) - set(parent_reader.get_available_cols())    
-        if not_available_col:
-            raise AttributeError(f'Data not available from {self.source}: {not_available_col}')
-
-        reader_to_cols = {child_reader: child_reader.get_available_cols() for child_reader in parent_reader.__subclasses__()}
-        col_to_reader = CommonOps.invert_dict_of_lists(reader_to_cols)
-        data_to_reader = {data: col_to_reader[data] for data in data_list}
-        assigned = CommonOps.invert_Nto1_dict(data_to_reader)
+        with self.instrument.span('plan'):
+            self.plan = self._plan_data(parent_reader, data_list)
+        assigned = self.plan.assigned
 
         return assigned
+
+    def _plan_data(
+            self,
+            parent_reader: BaseDataReader,
+            data_list: list,
+            ) -> FetchPlan:
+        # Adjusted fields are planned on the readers of their prices and events (see 
+        # `plan_fetch`), which only pykrx has.
+        if parent_reader is PykrxReader:
+            return plan_fetch(parent_reader, data_list)
+
+        return FetchPlanner(parent_reader).plan(data_list)
+
+    def _get_plain_assigned(
+            self,
+            assigned: dict,
+            ) -> dict:
+        # Adjusted fields are read and adjusted on their own (see `_read_unadjusted_snapshots`).
+        plain_assigned = {}
+        for child_reader, assigned_data in assigned.items():
+            plain_data = [d for d in assigned_data if d not in ADJUSTED_FIELDS]
+            if plain_data:
+                plain_assigned[child_reader] = plain_data
+
+        return plain_assigned
+
+    def get_listing(self) -> ListingIndex:
+        """
+        Returns the point-in-time listing index of the source: the tickers present in 
+        the snapshots stored by any of its readers, per stored trading day. Nothing is 
+        fetched.
+        """
+        parent_reader = self._get_parent_reader()
+        listings = [
+            self._get_reader_instance(child_reader).get_listing() 
+            for child_reader in reader_registry.get_readers(parent_reader.source)
+            ]
+
+        return ListingIndex.union(listings)
+
+    def explain(
+            self,
+            data: Union[str, List[str]],
+            ) -> pd.DataFrame:
+        """
+        Explains which readers `get_data` would use to fetch 'data', without fetching.
+
+        Returns:
+        - pd.DataFrame: One row per data name with the chosen reader, its number of 
+          requests per date, the other data sharing its fetch and the alternative readers.
+        """
+        if isinstance(data, str):
+            data = [data]
+
+        plan = self._plan_data(self._get_parent_reader(), data)
+
+        return plan.explain()
+
+    def estimate_cost(
+            self,
+            data: Union[str, List[str]],
+            ) -> pd.DataFrame:
+        """
+        Estimates what `get_data` would have to fetch for 'data' over the loader's period, 
+        from the local manifests, per-ticker ranges and calendar only (nothing is 
+        fetched). Where the local calendar does not cover the period, every calendar day 
+        is counted, so the estimate is an upper bound.
+
+        Returns:
+        - pd.DataFrame: One row per planned reader with its data, the number of dates in 
+          the period, how many are stored locally and missing, whether the missing dates 
+          would be fetched per 'date' or per 'ticker' of the universe, the number of 
+          requests and the seconds they take at the current rate limit.
+        """
+        if isinstance(data, str):
+            data = [data]
+
+        parent_reader = self._get_parent_reader()
+        plan = self._plan_data(parent_reader, data)
+
+        end_date = self.end_date or pd.Timestamp.today().strftime('%Y-%m-%d')
+        if self.remove_holidays:
+            date_list = parent_reader.get_tradingdays(self.start_date, end_date, download=False)
+        else:
+            date_list = DateUtil.get_daterange(self.start_date, end_date)
+
+        universe = self._get_reader_universe()
+        tickers = sorted(universe) if universe is not None else None
+        rows = []
+        for child_reader, assigned_data in plan.assigned.items():
+            reader_instance = self._get_reader_instance(child_reader)
+            stored_dates = set(reader_instance.manifest.load().get('dates', []))
+            missing_dates = [di for di in date_list if di not in stored_dates]
+
+            # Stored per-ticker rows of the universe cover dates and tickers as well.
+            _, missing_dates, missing_tickers = reader_instance._get_ticker_coverage(missing_dates, tickers)
+            axis_plan = FetchAxisPlanner().plan(child_reader, missing_dates, missing_tickers)
+            n_requests = axis_plan.get_cost() if missing_dates else 0
+
+            rows.append({
+                'reader': child_reader.__name__,
+                'data': assigned_data,
+                'n_dates': len(date_list),
+                'n_stored': len(date_list) - len(missing_dates),
+                'n_missing': len(missing_dates),
+                'axis': axis_plan.axis,
+                'requests': n_requests,
+                'seconds': n_requests / child_reader.rate_limiter.rate,
+                })
+
+        return pd.DataFrame(rows, columns=['reader', 'data', 'n_dates', 'n_stored', 'n_missing', 'axis', 'requests', 'seconds'])
     
-    # TODO: Add features to filter each data with options
     def _filter_data(
         self, 
-        collected: pd.DataFrame,
-        options: dict) -> pd.DataFrame:
-        
-        # TODO: (advanced) filter by options (e.g., fill='ffill'
-        
-        if self.universe:
-            filtered = collected[collected['ticker'].isin(set(self.universe))]
-            return filtered
-        else:
+        collected: Panel,
+        options: DataOptions,
+        download: bool=True,
+        ) -> Panel:
+        # A static universe is selected first so options only touch its tickers. Options 
+        # run before a dynamic universe is applied, so fills can use the values of days 
+        # a ticker was outside the universe.
+        filtered = collected
+        if self.universe is not None and not isinstance(self.universe, str):
+            filtered = filtered.select(tickers=self.universe)
+
+        if options is not None:
+            listed = self.get_listing().get_span_mask(filtered.dates, filtered.tickers) if options.uses_fill else None
+            filtered = options.apply(
+                filtered, 
+                holidays=self._get_holidays(filtered.dates, options, download),
+                listed=listed,
+                )
+
+        if isinstance(self.universe, str):
+            filtered = self._apply_membership(filtered, download)
+
+        return filtered
+
+    def _get_holidays(
+            self,
+            dates: pd.DatetimeIndex,
+            options: DataOptions,
+            download: bool,
+            ) -> np.ndarray:
+        # Only loaders that keep holidays have any to align.
+        if self.remove_holidays or not options.uses_holidays or not len(dates):
+            return None
+
+        start_date, end_date = DateUtil.datetime64_to_strdates(dates[[0, -1]].to_numpy())
+        tradingdays = self._get_parent_reader().get_tradingdays(start_date, end_date, download=download)
+
+        return ~dates.isin(pd.DatetimeIndex(tradingdays))
+
+    def _get_reader_universe(self):
+        # Dynamic universes are applied after loading, so readers fetch the whole market.
+        return None if isinstance(self.universe, str) else self.universe
+
+    def _apply_membership(
+            self,
+            collected: Panel,
+            download: bool,
+            ) -> Panel:
+        # Values of tickers outside the universe on a date are masked, and tickers that 
+        # are never in the universe over the period are dropped.
+        if not len(collected.dates):
             return collected
 
+        mask = self._get_membership(collected.dates, download).get_mask(collected.dates, collected.tickers)
+        in_universe = mask.any(axis=0)
+
+        filtered = collected.select(tickers=collected.tickers[in_universe])
+        values = filtered.values.copy()
+        values[:, ~mask[:, in_universe]] = np.nan
+
+        return Panel(values, filtered.dates, filtered.tickers, filtered.fields)
+
+    def _get_membership(
+            self,
+            dates: pd.DatetimeIndex,
+            download: bool,
+            ) -> UniverseMembership:
+        """
+        Returns the membership of the dynamic universe for the given dates, from the 
+        in-process cache, the local store or, if needed, by ranking the trading values.
+        """
+        if self.universe == 'listed':
+            listing = self.get_listing()
+            return UniverseMembership(listing.get_span_mask(dates, listing.tickers), dates, listing.tickers)
+
+        universe = LiquidityUniverse.from_name(self.universe)
+        start_date, end_date = DateUtil.datetime64_to_strdates(dates[[0, -1]].to_numpy())
+
+        local = BaseLocal()
+        stored = membership_cache.get(local, self.source, universe.name)
+        if stored is not None and stored.covers(start_date, end_date):
+            return stored.between(start_date, end_date)
+
+        # Recompute over the union with the stored range, so the stored membership grows.
+        if stored is not None:
+            start_date, end_date = min(start_date, stored.start_date), max(end_date, stored.end_date)
+
+        with self.instrument.span('universe', universe=universe.name):
+            membership = self._compute_membership(universe, start_date, end_date, download)
+
+        # Days from today on may still change, so they are never stored.
+        last_final_date = DateUtil.get_last_final_date()
+        if start_date <= last_final_date:
+            membership_cache.put(local, self.source, universe.name, membership.between(start_date, min(end_date, last_final_date)))
+
+        return membership.between(*DateUtil.datetime64_to_strdates(dates[[0, -1]].to_numpy()))
+
+    def _compute_membership(
+            self,
+            universe: LiquidityUniverse,
+            start_date: str,
+            end_date: str,
+            download: bool,
+            ) -> UniverseMembership:
+        parent_reader = self._get_parent_reader()
+
+        # Warm up the rolling window with the trading days before start_date.
+        lookback_start = DateUtil.add_strdt(start_date, -(2 * universe.history + 30))
+        calendar = DateUtil.strdates_to_datetime64(
+            parent_reader.get_tradingdays(lookback_start, end_date, download=download)
+            )
+        first = max(np.searchsorted(calendar, np.datetime64(start_date, 'D')) - universe.history, 0)
+        history_start = DateUtil.datetime64_to_strdates(calendar[first:first + 1])[0] if len(calendar) else start_date
+
+        plan = FetchPlanner(parent_reader).plan([universe.field])
+        reader_instance = self._get_reader_instance(plan.readers[0])
+        snapshots = reader_instance.read_snapshots(
+            [universe.field],
+            history_start,
+            end_date,
+            download,
+            remove_holidays=True,
+            )
+        trading_value = Panel.from_snapshots(snapshots, fields=[universe.field]).get_frame(universe.field)
+
+        membership = universe.compute(trading_value)
+        membership = membership.between(start_date, end_date)
+
+        return membership
+
     # TODO: Make properties private and add getters
     def set_date(
             self, 
@@ -214,6 +955,9 @@ class DataLoader:
             self, 
             universe,
             ):
+        if isinstance(universe, str) and universe != 'listed':
+            LiquidityUniverse.from_name(universe)
+
         self.universe = universe
 
         return
@@ -0,0 +1,167 @@
+import numpy as np
+
+from typing import List
+
+from .panel import Panel
+
+class DataOptions:
+    """
+    Per-field options applied to a loaded panel before it is shaped into the output.
+
+    Options:
+    - fill (str): 'ffill' or 'bfill' fills missing values of a ticker from the previous
+      or next date of the loaded period.
+    - limit (int): Fill at most this many consecutive missing dates.
+    - fill_value (float): The value of whatever is still missing after filling.
+    - zero_as_nan (bool): Treat zeros as missing before filling, e.g. prices on days
+      without trading.
+    - holidays (str): With remove_holidays=False, 'ffill' carries the last trading
+      day's values onto holidays instead of leaving them missing.
+
+    Filled values never extend before a ticker's listing or after its delisting when a
+    listing mask is given.
+
+    Options are given either for all fields, e.g. {'fill': 'ffill'}, or per field, e.g.
+    {'BPS': {'fill': 'ffill'}, '종가': {'zero_as_nan': True, 'fill': 'ffill'}}. Fields
+    sharing the same options are processed together as one (field x date x ticker)
+    block, on a single copy of the panel values.
+    """
+    defaults = {
+        'fill': None,
+        'limit': None,
+        'fill_value': None,
+        'zero_as_nan': False,
+        'holidays': None,
+    }
+
+    def __init__(
+            self,
+            options: dict,
+            fields: List[str],
+            ) -> None:
+        if options and set(options) <= set(self.defaults):
+            options = {field: options for field in fields}
+
+        unknown_fields = set(options) - set(fields)
+        if unknown_fields:
+            raise ValueError(f'Options given for data that is not loaded: {unknown_fields}')
+
+        self.fields = list(fields)
+        self.options = {field: self._validate(field_options) for field, field_options in options.items()}
+
+    @classmethod
+    def _validate(
+        cls,
+        options: dict,
+        ) -> dict:
+        unknown_options = set(options) - set(cls.defaults)
+        if unknown_options:
+            raise ValueError(f'Unknown options: {unknown_options}. Available options: {list(cls.defaults)}')
+
+        options = {**cls.defaults, **options}
+        if options['fill'] not in (None, 'ffill', 'bfill'):
+            raise ValueError(f"Invalid fill: {options['fill']}. Use 'ffill' or 'bfill'.")
+        if options['holidays'] not in (None, 'ffill'):
+            raise ValueError(f"Invalid holidays: {options['holidays']}. Use 'ffill'.")
+        if options['limit'] is not None and options['limit'] < 1:
+            raise ValueError(f"limit should be at least 1: {options['limit']}")
+
+        return options
+
+    @property
+    def uses_holidays(self) -> bool:
+        return any(options['holidays'] for options in self.options.values())
+
+    @property
+    def uses_fill(self) -> bool:
+        return any(options['fill'] or options['fill_value'] is not None for options in self.options.values())
+
+    def get_groups(self) -> dict:
+        """
+        Returns the fields grouped by identical options: {options tuple: [fields]}.
+        """
+        groups = {}
+        for field, options in self.options.items():
+            if options == self.defaults:
+                continue
+            groups.setdefault(tuple(options.items()), []).append(field)
+
+        return groups
+
+    def apply(
+            self,
+            panel: Panel,
+            holidays: np.ndarray=None,
+            listed: np.ndarray=None,
+            ) -> Panel:
+        """
+        Applies the options to a panel.
+
+        Parameters:
+        - panel (Panel): The loaded panel; it is not modified.
+        - holidays (np.ndarray, optional): A boolean mask over the panel dates marking
+          holidays, required by the 'holidays' option.
+        - listed (np.ndarray, optional): A (date x ticker) mask of the days each ticker 
+          was listed; filled values outside it are reset to missing.
+        """
+        groups = self.get_groups()
+        if not groups:
+            return panel
+
+        values = panel.values.copy()
+        for options, fields in groups.items():
+            options = dict(options)
+            positions = panel.fields.get_indexer(fields)
+            block = values[positions]
+
+            if options['zero_as_nan']:
+                block[block == 0] = np.nan
+            if options['holidays'] == 'ffill' and holidays is not None:
+                self._align_holidays(block, holidays)
+            if options['fill'] == 'ffill':
+                self._ffill(block, options['limit'])
+            elif options['fill'] == 'bfill':
+                self._ffill(block[:, ::-1], options['limit'])
+            if options['fill_value'] is not None:
+                block[np.isnan(block)] = options['fill_value']
+            if listed is not None and (options['fill'] or options['fill_value'] is not None):
+                block[:, ~listed] = np.nan
+
+            values[positions] = block
+
+        return Panel(values, panel.dates, panel.tickers, panel.fields)
+
+    @staticmethod
+    def _ffill(
+        block: np.ndarray,
+        limit: int=None,
+        ) -> None:
+        # Forward-fills a (field x date x ticker) block in place along the dates, using
+        # the position of the last valid date of every cell.
+        n_dates = block.shape[1]
+        date_positions = np.arange(n_dates).reshape(1, n_dates, 1)
+
+        last_valid = np.where(np.isnan(block), -1, date_positions)
+        np.maximum.accumulate(last_valid, axis=1, out=last_valid)
+
+        fillable = np.isnan(block) & (last_valid >= 0)
+        if limit is not None:
+            fillable &= (date_positions - last_valid) <= limit
+
+        filled = np.take_along_axis(block, np.maximum(last_valid, 0), axis=1)
+        block[fillable] = filled[fillable]
+
+    @staticmethod
+    def _align_holidays(
+        block: np.ndarray,
+        holidays: np.ndarray,
+        ) -> None:
+        # Copies each holiday row from the last trading day before it.
+        date_positions = np.arange(len(holidays))
+        last_tradingday = np.maximum.accumulate(np.where(holidays, -1, date_positions))
+
+        rows = holidays & (last_tradingday >= 0)
+        block[:, rows] = block[:, last_tradingday[rows]]
+
+    def __repr__(self) -> str:
+        return f'DataOptions({self.options})'
@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+
+import os
+import shutil
+import tempfile
+
+from typing import Union, List
+
+from .utils import DateUtil
+
+class Panel:
+    """
+    A dense (field x date x ticker) panel backed by one contiguous NumPy array.
+
+    Each field is stored as a contiguous (date x ticker) block, so a single-field wide
+    frame is a zero-copy view of one block and the multi-field frame indexed by
+    (date, ticker) is a zero-copy view of the whole array.
+    """
+    def __init__(
+            self,
+            values: np.ndarray,
+            dates: Union[list, pd.Index],
+            tickers: Union[list, pd.Index],
+            fields: Union[list, pd.Index],
+            ) -> None:
+        self.values = values
+        self.dates = pd.Index(dates, name='date')
+        self.tickers = pd.Index(tickers, name='ticker')
+        self.fields = pd.Index(fields, name='data')
+
+        expected_shape = (len(self.fields), len(self.dates), len(self.tickers))
+        if self.values.shape != expected_shape:
+            raise ValueError(f'Panel values have shape {self.values.shape}, expected {expected_shape}')
+
+    @classmethod
+    def from_snapshots(
+        cls,
+        snapshots: list,
+        fields: List[str],
+        dtype: str='float64',
+        ) -> 'Panel':
+        """
+        Builds a panel from per-day wide snapshots.
+
+        Parameters:
+        - snapshots (list): (date, snapshot) pairs, where each snapshot is a DataFrame
+          indexed by ticker with (a subset of) the fields as columns. Snapshots from
+          several readers may share a date as long as they provide different fields.
+        - fields (List[str]): The fields of the panel, in output order.
+        - dtype (str, optional): The dtype of the values. Defaults to 'float64'.
+        """
+        snapshot_dates = DateUtil.strdates_to_datetime64([date for date, _ in snapshots])
+        dates = pd.DatetimeIndex(np.unique(snapshot_dates).astype('datetime64[ns]'))
+        if snapshots:
+            tickers = pd.Index(np.unique(np.concatenate(
+                [snapshot.index.to_numpy(dtype=object) for _, snapshot in snapshots]
+                ).astype(str)))
+        else:
+            tickers = pd.Index([], dtype=object)
+        fields = pd.Index(fields)
+
+        values = np.full((len(fields), len(dates), len(tickers)), np.nan, dtype=dtype)
+
+        date_positions = np.searchsorted(dates.to_numpy(), snapshot_dates.astype('datetime64[ns]'))
+        for di, (_, snapshot) in zip(date_positions, snapshots):
+            ticker_positions = tickers.get_indexer(snapshot.index)
+            for col in snapshot.columns.intersection(fields):
+                values[fields.get_loc(col), di, ticker_positions] = snapshot[col].to_numpy(dtype=dtype)
+
+        return cls(values, dates, tickers, fields)
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    def select(
+            self,
+            dates: Union[list, pd.Index]=None,
+            tickers: Union[list, pd.Index]=None,
+            fields: Union[list, pd.Index]=None,
+            ) -> 'Panel':
+        """
+        Returns a sub-panel. Labels that are not in the panel are ignored. Selections
+        that keep a contiguous range of positions are views; others are copies.
+        """
+        date_key, dates = self._get_key(self.dates, dates)
+        ticker_key, tickers = self._get_key(self.tickers, tickers)
+        field_key, fields = self._get_key(self.fields, fields, sort=False)
+
+        values = self.values[field_key][:, date_key][:, :, ticker_key]
+
+        return Panel(values, dates, tickers, fields)
+
+    @staticmethod
+    def _get_key(
+        index: pd.Index,
+        labels: Union[list, pd.Index, None],
+        sort: bool=True,
+        ) -> tuple:
+        if labels is None:
+            return slice(None), index
+
+        labels = pd.DatetimeIndex(labels) if isinstance(index, pd.DatetimeIndex) else pd.Index(labels)
+        positions = index.get_indexer(labels.unique())
+        positions = positions[positions >= 0]
+        if sort:
+            positions = np.sort(positions)
+
+        # Consecutive positions can be taken as a slice, which keeps the result a view.
+        if len(positions) and (np.diff(positions) == 1).all():
+            key = slice(positions[0], positions[-1] + 1)
+        else:
+            key = positions
+
+        return key, index[positions]
+
+    def between(
+            self,
+            start_date: str=None,
+            end_date: str=None,
+            ) -> 'Panel':
+        """
+        Returns the sub-panel of the dates from start_date to end_date (inclusive) as a view.
+        """
+        start = self.dates.searchsorted(pd.Timestamp(start_date), side='left') if start_date else 0
+        end = self.dates.searchsorted(pd.Timestamp(end_date), side='right') if end_date else len(self.dates)
+
+        return Panel(self.values[:, start:end], self.dates[start:end], self.tickers, self.fields)
+
+    def save(
+            self,
+            path: str,
+            ) -> None:
+        """
+        Saves the panel as a directory of .npy files: the (field x date x ticker) values, 
+        in which every field is one fixed-width (date x ticker) block, plus the date, 
+        ticker and field indexes. The directory is replaced atomically.
+        """
+        path = os.path.abspath(path)
+        parent = os.path.dirname(path)
+        os.makedirs(parent, exist_ok=True)
+
+        tmp_path = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+        try:
+            np.save(os.path.join(tmp_path, 'values.npy'), np.ascontiguousarray(self.values))
+            np.save(os.path.join(tmp_path, 'dates.npy'), self.dates.to_numpy(dtype='datetime64[ns]'))
+            np.save(os.path.join(tmp_path, 'tickers.npy'), self.tickers.to_numpy(dtype=str))
+            np.save(os.path.join(tmp_path, 'fields.npy'), self.fields.to_numpy(dtype=str))
+
+            old_path = None
+            if os.path.exists(path):
+                old_path = tempfile.mkdtemp(dir=parent, prefix='.old-')
+                os.rmdir(old_path)
+                os.replace(path, old_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+
+        if old_path is not None:
+            shutil.rmtree(old_path, ignore_errors=True)
+
+    @classmethod
+    def load(
+        cls,
+        path: str,
+        mmap: bool=True,
+        ) -> 'Panel':
+        """
+        Loads a panel saved with `save`. 
+        
+        With mmap=True the values are memory-mapped copy-on-write: nothing is read until 
+        it is accessed, slices of dates and fields stay zero-copy, and processes loading 
+        the same panel share the OS page cache. Writes to the returned frames stay private.
+        """
+        values = np.load(os.path.join(path, 'values.npy'), mmap_mode='c' if mmap else None)
+        dates = pd.DatetimeIndex(np.load(os.path.join(path, 'dates.npy')))
+        tickers = pd.Index(np.load(os.path.join(path, 'tickers.npy')).astype(object))
+        fields = pd.Index(np.load(os.path.join(path, 'fields.npy')).astype(object))
+
+        return cls(values, dates, tickers, fields)
+
+    def get_frame(
+            self,
+            field: str,
+            ) -> pd.DataFrame:
+        """
+        Returns a wide frame (Index = dates, Columns = tickers) of a single field
+        without copying the values.
+        """
+        wide = pd.DataFrame(
+            self.values[self.fields.get_loc(field)],
+            index=self.dates,
+            columns=self.tickers,
+            copy=False,
+            )
+
+        return wide
+
+    def to_multi(self) -> pd.DataFrame:
+        """
+        Returns a frame with MultiIndex rows (dates, tickers) and the fields as columns
+        without copying the values. Tickers without data on a date are kept as NaN rows.
+        """
+        n_fields, n_dates, n_tickers = self.values.shape
+        index = pd.MultiIndex.from_product([self.dates, self.tickers])
+
+        multi = pd.DataFrame(
+            self.values.reshape(n_fields, n_dates * n_tickers).T,
+            index=index,
+            columns=self.fields,
+            copy=False,
+            )
+
+        return multi
+
+    def __repr__(self) -> str:
+        n_fields, n_dates, n_tickers = self.values.shape
+
+        return f'Panel(fields={n_fields}, dates={n_dates}, tickers={n_tickers}, dtype={self.values.dtype})'
@@ -0,0 +1,169 @@
+import pandas as pd
+
+from typing import List
+
+from .datasource.base import BaseDataReader, reader_registry
+
+class FetchPlan:
+    """
+    The readers chosen to fetch a list of data and the data each of them provides.
+    """
+    def __init__(
+            self,
+            data: List[str],
+            assigned: dict,
+            candidates: dict,
+            ) -> None:
+        self.data = data
+        self.assigned = assigned
+        self.candidates = candidates
+
+    @property
+    def readers(self) -> list:
+        return list(self.assigned.keys())
+
+    def get_cost(self) -> float:
+        """
+        Returns the number of requests per date needed to execute the plan.
+        """
+        return sum(reader.fetch_cost for reader in self.assigned)
+
+    def explain(self) -> pd.DataFrame:
+        """
+        Returns one row per requested data and reader that fetches it, with the cost of 
+        the reader, the other data sharing its fetch and the other readers that could 
+        have provided it.
+        """
+        rows = []
+        for reader, assigned_data in self.assigned.items():
+            for data in assigned_data:
+                rows.append({
+                    'data': data,
+                    'reader': reader.__name__,
+                    'requests_per_date': reader.fetch_cost,
+                    'shared_with': [d for d in assigned_data if d != data],
+                    'alternatives': [c.__name__ for c in self.candidates[data] if data not in self.assigned.get(c, [])],
+                    })
+
+        explanation = pd.DataFrame(rows, columns=['data', 'reader', 'requests_per_date', 'shared_with', 'alternatives'])
+        explanation = explanation.set_index('data').loc[self.data].reset_index()
+
+        return explanation
+
+    def __repr__(self) -> str:
+        assigned = ', '.join(f'{reader.__name__}: {data}' for reader, data in self.assigned.items())
+
+        return f'FetchPlan({assigned}; {self.get_cost()} requests per date)'
+
+class FetchPlanner:
+    """
+    Chooses the cheapest set of readers that covers the requested data.
+
+    Readers declare their cost per date in `fetch_cost` (one request per date for every
+    pykrx reader). The planner solves the weighted set cover greedily: it repeatedly
+    takes the reader with the lowest cost per newly covered data. Ties go to the reader
+    covering more of the remaining data, then to the later-defined reader, which keeps
+    the previous field-to-reader mapping for single fields. Every data is fetched by
+    exactly one reader, so data sharing an endpoint share one fetch.
+    """
+    def __init__(
+            self,
+            parent_reader: BaseDataReader,
+            ) -> None:
+        self.parent_reader = parent_reader
+
+    def get_readers(self) -> list:
+        return reader_registry.get_readers(self.parent_reader.source)
+
+    def plan(
+            self,
+            data: List[str],
+            ) -> FetchPlan:
+        readers = self.get_readers()
+        reader_to_cols = {reader: reader_registry.get_reader_cols(reader) for reader in readers}
+        candidates = {d: reader_registry.get_candidates(self.parent_reader.source, d) for d in data}
+
+        not_available_col = {d for d, c in candidates.items() if not c}
+        if not_available_col:
+            raise AttributeError(f'Data not available from {self.parent_reader.source}: {not_available_col}')
+
+        uncovered = set(data)
+        chosen = []
+        while uncovered:
+            def score(order_reader: tuple) -> tuple:
+                order, reader = order_reader
+                n_covered = len(reader_to_cols[reader] & uncovered)
+
+                return (reader.fetch_cost / n_covered, -n_covered, -order)
+
+            eligible = [(order, reader) for order, reader in enumerate(readers) if reader_to_cols[reader] & uncovered]
+            _, best = min(eligible, key=score)
+
+            chosen.append(best)
+            uncovered -= reader_to_cols[best]
+
+        assigned = {}
+        for d in data:
+            reader = next(reader for reader in chosen if d in reader_to_cols[reader])
+            assigned.setdefault(reader, []).append(d)
+
+        return FetchPlan(data, assigned, candidates)
+
+class FetchAxisPlan:
+    """
+    How a reader fetches the dates it is missing: one full-market snapshot per date, or
+    one date-range time series per ticker of the universe.
+    """
+    def __init__(
+            self,
+            reader: type,
+            axis: str,
+            dates: List[str],
+            tickers: List[str],
+            ) -> None:
+        self.reader = reader
+        self.axis = axis
+        self.dates = dates
+        self.tickers = tickers
+
+    @property
+    def date_cost(self) -> float:
+        return len(self.dates) * self.reader.fetch_cost
+
+    @property
+    def ticker_cost(self) -> float:
+        if self.tickers is None or self.reader.ticker_fetch_cost is None:
+            return float('inf')
+
+        return len(self.tickers) * self.reader.ticker_fetch_cost
+
+    def get_cost(self) -> float:
+        """
+        Returns the number of requests of the chosen axis.
+        """
+        return self.ticker_cost if self.axis == 'ticker' else self.date_cost
+
+    def __repr__(self) -> str:
+        return f'FetchAxisPlan({self.reader.__name__}: by {self.axis}, {self.get_cost()} requests)'
+
+class FetchAxisPlanner:
+    """
+    Chooses, per reader, whether to fetch missing dates per date or per ticker.
+
+    A per-date request returns the whole market for one day (cost `fetch_cost` per date);
+    a per-ticker request returns one ticker over the whole date range (cost
+    `ticker_fetch_cost` per ticker, None if the reader has no such endpoint). Small
+    universes over long periods are cheaper per ticker, everything else per date.
+    Without a universe, every listed ticker would be needed, so dates are always used.
+    """
+    def plan(
+            self,
+            reader: type,
+            dates: List[str],
+            tickers: List[str]=None,
+            ) -> FetchAxisPlan:
+        plan = FetchAxisPlan(reader, 'date', dates, tickers)
+        if plan.ticker_cost < plan.date_cost:
+            plan.axis = 'ticker'
+
+        return plan
@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+import json
+import uuid
+import weakref
+import threading
+import multiprocessing
+from multiprocessing import resource_tracker, shared_memory
+
+from .panel import Panel
+
+# Every block starts with the byte length of its JSON header and a generation id unique
+# to the publish, then the header, then the values at the next 64-byte boundary.
+HEADER_LENGTH_BYTES = 8
+GENERATION_BYTES = 16
+HEADER_OFFSET = HEADER_LENGTH_BYTES + GENERATION_BYTES
+VALUES_ALIGNMENT = 64
+
+class PanelServer:
+    """
+    Serves panels to other processes from shared memory.
+
+    `publish` copies a panel's values once into a `multiprocessing.shared_memory` block,
+    behind a small JSON header with their shape and dtype and the date, ticker and field
+    indexes. Worker processes attach to it by name with `attach_panel` (or
+    `DataLoader(shared_panel=name)`) and get read-only views of the same physical pages,
+    so memory stays flat however many workers attach. Blocks live until they are
+    unpublished, the server is closed or the server process exits. A name can be
+    published again after it was unpublished, e.g. for a daily refresh; workers pick up
+    the new panel on their next `attach_panel`.
+    """
+    prefix = 'kqdl_'
+
+    def __init__(self) -> None:
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> list:
+        with self._lock:
+            return list(self._blocks)
+
+    def publish(
+            self,
+            name: str,
+            panel: Panel,
+            ) -> None:
+        """
+        Copies a panel into a new shared memory block named `name`.
+        """
+        values = np.ascontiguousarray(panel.values)
+        header = json.dumps({
+            'shape': list(values.shape),
+            'dtype': values.dtype.str,
+            'dates': pd.DatetimeIndex(panel.dates).asi8.tolist(),
+            'tickers': [str(ticker) for ticker in panel.tickers],
+            'fields': [str(field) for field in panel.fields],
+            }).encode()
+        offset = -(-(HEADER_OFFSET + len(header)) // VALUES_ALIGNMENT) * VALUES_ALIGNMENT
+
+        block = shared_memory.SharedMemory(name=self.prefix + name, create=True, size=offset + values.nbytes)
+        try:
+            block.buf[:HEADER_LENGTH_BYTES] = len(header).to_bytes(HEADER_LENGTH_BYTES, 'little')
+            block.buf[HEADER_LENGTH_BYTES:HEADER_OFFSET] = uuid.uuid4().bytes
+            block.buf[HEADER_OFFSET:HEADER_OFFSET + len(header)] = header
+            shared = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf, offset=offset)
+            shared[...] = values
+            del shared
+        except BaseException:
+            block.close()
+            block.unlink()
+            raise
+
+        with self._lock:
+            self._blocks[name] = block
+            _published.add(block.name)
+
+    def unpublish(
+            self,
+            name: str,
+            ) -> None:
+        """
+        Removes a published panel. Attached workers keep their views until they detach
+        and drop them; new workers can no longer attach.
+        """
+        with self._lock:
+            block = self._blocks.pop(name)
+            _published.discard(block.name)
+
+        block.close()
+        block.unlink()
+
+    def close(self) -> None:
+        for name in self.names:
+            self.unpublish(name)
+
+    def __enter__(self) -> 'PanelServer':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f'PanelServer(panels={self.names})'
+
+# Blocks published by this process, and the generation and panel of every attached name.
+_published = set()
+_attached = {}
+_attached_lock = threading.Lock()
+
+def attach_panel(name: str) -> Panel:
+    """
+    Returns a panel published by a `PanelServer` (in any process) as read-only views of
+    its shared memory block.
+
+    The panel is cached per process and name as long as the same publish is served; if
+    the name was published again since, the new panel is attached instead. A block stays
+    mapped until it is detached (see `detach_panel`) or replaced and no views of its
+    values are left.
+    """
+    block = _open_block(PanelServer.prefix + name)
+    generation = bytes(block.buf[HEADER_LENGTH_BYTES:HEADER_OFFSET])
+
+    with _attached_lock:
+        attached = _attached.get(name)
+        if attached is not None and attached[0] == generation:
+            # Nothing views the block just opened, so it can be closed right away.
+            block.close()
+            return attached[1]
+
+        panel = _read_panel(block)
+        _attached[name] = (generation, panel)
+
+        return panel
+
+def detach_panel(name: str) -> None:
+    """
+    Forgets the panel attached under name, so the next `attach_panel` attaches it again.
+    Its block is unmapped once the panel and every view of its values are gone.
+    """
+    with _attached_lock:
+        _attached.pop(name, None)
+
+def _read_panel(block: shared_memory.SharedMemory) -> Panel:
+    header_length = int.from_bytes(block.buf[:HEADER_LENGTH_BYTES], 'little')
+    header = json.loads(bytes(block.buf[HEADER_OFFSET:HEADER_OFFSET + header_length]))
+    offset = -(-(HEADER_OFFSET + header_length) // VALUES_ALIGNMENT) * VALUES_ALIGNMENT
+
+    values = np.ndarray(tuple(header['shape']), dtype=np.dtype(header['dtype']), buffer=block.buf, offset=offset)
+    values.flags.writeable = False
+
+    # Views of the values keep them alive, and closing the block under a live view would
+    # crash the process, so the block is closed only once the values are collected.
+    finalizer = weakref.finalize(values, block.close)
+    finalizer.atexit = False
+
+    panel = Panel(
+        values,
+        pd.DatetimeIndex(np.array(header['dates'], dtype='datetime64[ns]')),
+        pd.Index(header['tickers'], dtype=object),
+        pd.Index(header['fields'], dtype=object),
+        )
+
+    return panel
+
+def _open_block(name: str) -> shared_memory.SharedMemory:
+    # On Python < 3.13 attaching registers the block with this process's resource
+    # tracker, which would unlink it when the process exits. Processes started by
+    # multiprocessing share the tracker of their parent, and so does the publishing
+    # process itself, so only unrelated processes drop the registration.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    block = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None and block.name not in _published:
+        resource_tracker.unregister(block._name, 'shared_memory')
+
+    return block
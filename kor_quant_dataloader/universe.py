@@ -0,0 +1,267 @@
+import numpy as np
+import pandas as pd
+
+import re
+import threading
+
+from typing import Union
+
+from .datasource.base import BaseLocal
+
+class UniverseMembership:
+    """
+    Per-date universe membership as a (date x ticker) boolean matrix.
+
+    On disk the matrix is bit-packed (one bit per date and ticker) together with the
+    date and ticker indexes and the [start, end] range the membership was computed for.
+    """
+    def __init__(
+            self,
+            mask: np.ndarray,
+            dates: Union[list, pd.Index],
+            tickers: Union[list, pd.Index],
+            start_date: str=None,
+            end_date: str=None,
+            ) -> None:
+        self.mask = mask
+        self.dates = pd.DatetimeIndex(dates, name='date')
+        self.tickers = pd.Index(tickers, name='ticker')
+
+        self.start_date = start_date
+        self.end_date = end_date
+
+        expected_shape = (len(self.dates), len(self.tickers))
+        if self.mask.shape != expected_shape:
+            raise ValueError(f'Membership mask has shape {self.mask.shape}, expected {expected_shape}')
+
+    @property
+    def nbytes(self) -> int:
+        return self.mask.nbytes
+
+    def covers(
+            self,
+            start_date: str,
+            end_date: str,
+            ) -> bool:
+        if self.start_date is None or self.end_date is None:
+            return False
+
+        return self.start_date <= start_date and end_date <= self.end_date
+
+    def between(
+            self,
+            start_date: str=None,
+            end_date: str=None,
+            ) -> 'UniverseMembership':
+        """
+        Returns the membership of the dates from start_date to end_date (inclusive) as a view.
+        """
+        start = self.dates.searchsorted(pd.Timestamp(start_date), side='left') if start_date else 0
+        end = self.dates.searchsorted(pd.Timestamp(end_date), side='right') if end_date else len(self.dates)
+
+        return UniverseMembership(
+            self.mask[start:end],
+            self.dates[start:end],
+            self.tickers,
+            start_date=start_date or self.start_date,
+            end_date=end_date or self.end_date,
+            )
+
+    def get_mask(
+            self,
+            dates: pd.Index,
+            tickers: pd.Index,
+            ) -> np.ndarray:
+        """
+        Returns the membership aligned to the given dates and tickers. Dates and tickers
+        the membership does not know are not members.
+        """
+        date_positions = self.dates.get_indexer(pd.DatetimeIndex(dates))
+        ticker_positions = self.tickers.get_indexer(tickers)
+        if not self.mask.size:
+            return np.zeros((len(date_positions), len(ticker_positions)), dtype=bool)
+
+        mask = self.mask[np.ix_(np.maximum(date_positions, 0), np.maximum(ticker_positions, 0))]
+        mask &= (date_positions >= 0)[:, None] & (ticker_positions >= 0)[None, :]
+
+        return mask
+
+    def get_tickers(
+            self,
+            date: str,
+            ) -> pd.Index:
+        """
+        Returns the members on a date.
+        """
+        return self.tickers[self.mask[self.dates.get_loc(pd.Timestamp(date))]]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.mask, index=self.dates, columns=self.tickers, copy=False)
+
+    def to_arrays(self) -> dict:
+        arrays = {
+            'bits': np.packbits(self.mask, axis=1),
+            'shape': np.array(self.mask.shape),
+            'dates': self.dates.to_numpy(dtype='datetime64[ns]'),
+            'tickers': self.tickers.to_numpy(dtype=str),
+            'range': np.array([self.start_date, self.end_date], dtype=str),
+        }
+
+        return arrays
+
+    @classmethod
+    def from_arrays(
+        cls,
+        arrays: dict,
+        ) -> 'UniverseMembership':
+        n_dates, n_tickers = arrays['shape']
+        mask = np.unpackbits(arrays['bits'], axis=1, count=n_tickers).astype(bool)
+        start_date, end_date = arrays['range'].tolist()
+
+        return cls(
+            mask,
+            pd.DatetimeIndex(arrays['dates']),
+            pd.Index(arrays['tickers'].astype(object)),
+            start_date=start_date,
+            end_date=end_date,
+            )
+
+    def __repr__(self) -> str:
+        n_dates, n_tickers = self.mask.shape
+
+        return f'UniverseMembership(dates={n_dates}, tickers={n_tickers}, range={self.start_date}~{self.end_date})'
+
+class LiquidityUniverse:
+    """
+    The top n tickers by mean trading value (거래대금) over the last `window` trading
+    days, re-ranked every trading day. Named 'top<n>_liquidity', e.g. 'top500_liquidity'.
+
+    The ranking for a date only uses trading values up to `lag` trading days before it
+    (the previous day by default), so the universe is known before the market opens.
+    Only tickers that are listed on a date are ranked for it, so delisted tickers are
+    members for the days they traded and drop out afterwards, without survivorship bias.
+    """
+    field = '거래대금'
+    pattern = re.compile(r'^top(\d+)_liquidity(?:_w(\d+))?(?:_l(\d+))?$')
+
+    def __init__(
+            self,
+            n: int,
+            window: int=20,
+            lag: int=1,
+            ) -> None:
+        if n <= 0 or window <= 0 or lag < 0:
+            raise ValueError(f'Invalid liquidity universe: n={n}, window={window}, lag={lag}')
+
+        self.n = n
+        self.window = window
+        self.lag = lag
+
+    @classmethod
+    def from_name(
+        cls,
+        name: str,
+        ) -> 'LiquidityUniverse':
+        """
+        Parses 'top<n>_liquidity', optionally followed by '_w<window>' and '_l<lag>'.
+        """
+        match = cls.pattern.match(name)
+        if match is None:
+            raise ValueError(f"Unknown universe: {name}. Use a list of tickers or e.g. 'top500_liquidity'.")
+
+        n, window, lag = match.groups()
+
+        return cls(
+            int(n),
+            window=int(window) if window else 20,
+            lag=int(lag) if lag else 1,
+            )
+
+    @property
+    def name(self) -> str:
+        name = f'top{self.n}_liquidity'
+        if self.window != 20:
+            name += f'_w{self.window}'
+        if self.lag != 1:
+            name += f'_l{self.lag}'
+
+        return name
+
+    @property
+    def history(self) -> int:
+        """
+        The number of trading days before the first date needed to rank it.
+        """
+        return self.window + self.lag - 1
+
+    def compute(
+            self,
+            trading_value: pd.DataFrame,
+            ) -> UniverseMembership:
+        """
+        Computes the membership from a wide frame of trading values (Index = trading
+        days, Columns = tickers, NaN where a ticker is not listed).
+        """
+        values = trading_value.to_numpy(dtype='float64')
+        listed = ~np.isnan(values)
+
+        liquidity = pd.DataFrame(values).rolling(self.window, min_periods=1).mean().shift(self.lag)
+        liquidity = liquidity.where(listed)
+
+        ranks = liquidity.rank(axis=1, ascending=False, method='first').to_numpy()
+        mask = ranks <= self.n
+
+        return UniverseMembership(mask, trading_value.index, trading_value.columns)
+
+    def __repr__(self) -> str:
+        return f'LiquidityUniverse(n={self.n}, window={self.window}, lag={self.lag})'
+
+class MembershipCache:
+    """
+    Process-wide cache of universe memberships, keyed by storage root, source and
+    universe name, in front of the copies persisted under
+    ``<root>/<source>/universes/<name>.npz``.
+    """
+    def __init__(self) -> None:
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(
+            self,
+            local: BaseLocal,
+            source: str,
+            name: str,
+            ) -> UniverseMembership:
+        key = (local.root, source, name)
+        with self._lock:
+            membership = self._entries.get(key)
+        if membership is not None:
+            return membership
+
+        arrays = local.read_npz(source, 'universes', f'{name}.npz')
+        if not arrays:
+            return None
+
+        membership = UniverseMembership.from_arrays(arrays)
+        with self._lock:
+            self._entries[key] = membership
+
+        return membership
+
+    def put(
+            self,
+            local: BaseLocal,
+            source: str,
+            name: str,
+            membership: UniverseMembership,
+            ) -> None:
+        with self._lock:
+            self._entries[(local.root, source, name)] = membership
+
+        local.write_npz(membership.to_arrays(), source, 'universes', f'{name}.npz')
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+membership_cache = MembershipCache()
@@ -1,9 +1,37 @@
 import numpy as np
 import pandas as pd
 
+from pandas.api.types import union_categoricals
+
 from collections import defaultdict
+from functools import lru_cache
+
+import os
+import time
+import threading
+
+@lru_cache(maxsize=None)
+def load_env() -> None:
+    """
+    Loads the ``.env`` file and applies the ENV setting (ENV=prod silences warnings).
+
+    Called on first use by the loader and the local storage rather than at import, so
+    importing the package stays cheap. Runs once per process.
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    if os.getenv('ENV') == 'prod':
+        import warnings
+        warnings.filterwarnings('ignore')
 
 class DateUtil:
+    """
+    Date helpers. Scalar dates are 'YYYY-MM-DD' strings or yyyymmdd ints; the array 
+    helpers work on whole NumPy arrays of yyyymmdd ints or datetime64[D] values, and 
+    trading calendars are sorted datetime64[D] arrays.
+    """
     @staticmethod
     def get_daterange(
         start_date: str,
@@ -12,9 +40,34 @@ class DateUtil:
         DateUtil.validate_date(start_date)
         DateUtil.validate_date(end_date)
         
-        return pd.date_range(start_date, end_date).strftime('%Y-%m-%d').tolist()
+        dates = np.arange(np.datetime64(start_date, 'D'), np.datetime64(end_date, 'D') + 1)
+
+        return np.datetime_as_string(dates, unit='D').tolist()
         
 
+    @staticmethod
+    def split_daterange(
+        start_date: str,
+        end_date: str,
+        freq: str,
+        ) -> list:
+        """
+        Splits the dates from start_date to end_date into consecutive calendar periods 
+        of frequency freq (e.g. 'M') and returns the (first, last) date of each.
+        """
+        DateUtil.validate_date(start_date)
+        DateUtil.validate_date(end_date)
+
+        dates = pd.date_range(start_date, end_date)
+        periods = dates.to_period(freq)
+        is_first = np.r_[True, periods[1:] != periods[:-1]]
+        is_last = np.r_[is_first[1:], True]
+
+        firsts = dates[is_first].strftime('%Y-%m-%d')
+        lasts = dates[is_last].strftime('%Y-%m-%d')
+
+        return list(zip(firsts, lasts))
+
     @staticmethod
     def intdate_to_strdate(
         intdate: int
@@ -42,9 +95,102 @@ class DateUtil:
         return pd.to_datetime(DateUtil.intdate_to_strdate(intdate))
 
     @staticmethod
+    def intdates_to_datetime64(
+        intdates: np.ndarray,
+        ) -> np.ndarray:
+        """
+        Converts an array of yyyymmdd ints to datetime64[D] without parsing strings.
+        Raises ValueError for ints that are not valid dates (e.g. 20210230).
+        """
+        intdates = np.asarray(intdates, dtype=np.int64)
+        years = intdates // 10000 - 1970
+        months = intdates // 100 % 100 - 1
+        days = intdates % 100 - 1
+
+        dates = (
+            years.astype('datetime64[Y]').astype('datetime64[M]')
+            + months.astype('timedelta64[M]')
+        ).astype('datetime64[D]') + days.astype('timedelta64[D]')
+
+        invalid = (months < 0) | (months > 11) | (days < 0) | (DateUtil.datetime64_to_intdates(dates) != intdates)
+        if invalid.any():
+            raise ValueError(f'Invalid dates: {intdates[invalid][:5].tolist()}')
+
+        return dates
+
+    @staticmethod
+    def datetime64_to_intdates(
+        dates: np.ndarray,
+        ) -> np.ndarray:
+        """
+        Converts an array of datetime64 values to yyyymmdd ints.
+        """
+        dates = np.asarray(dates).astype('datetime64[D]')
+        months = dates.astype('datetime64[M]')
+
+        years = months.astype('datetime64[Y]').astype(np.int64) + 1970
+        month_of_year = months.astype(np.int64) % 12 + 1
+        day_of_month = (dates - months.astype('datetime64[D]')).astype(np.int64) + 1
+
+        return years * 10000 + month_of_year * 100 + day_of_month
+
+    @staticmethod
+    def strdates_to_datetime64(
+        strdates: list,
+        ) -> np.ndarray:
+        """
+        Converts 'YYYY-MM-DD' strings to datetime64[D] in one pass.
+        """
+        return np.asarray(strdates, dtype='datetime64[D]')
+
+    @staticmethod
+    def datetime64_to_strdates(
+        dates: np.ndarray,
+        ) -> list:
+        return np.datetime_as_string(np.asarray(dates).astype('datetime64[D]'), unit='D').tolist()
+
+    @staticmethod
+    def slice_calendar(
+        calendar: np.ndarray,
+        start_date: str,
+        end_date: str,
+        ) -> slice:
+        """
+        Returns the slice of a sorted calendar array with the days from start_date to 
+        end_date (inclusive).
+        """
+        start = np.searchsorted(calendar, np.datetime64(start_date, 'D'), side='left')
+        end = np.searchsorted(calendar, np.datetime64(end_date, 'D'), side='right')
+
+        return slice(start, end)
+
+    @staticmethod
+    def offset_dates(
+        calendar: np.ndarray,
+        dates: np.ndarray,
+        n: int,
+        ) -> np.ndarray:
+        """
+        Shifts dates by n days of a sorted calendar (e.g. n trading days). Dates that are 
+        not in the calendar are first rolled back to the previous calendar day, so 
+        n=0 returns the last trading day as of each date. Results outside the calendar 
+        are NaT.
+        """
+        dates = np.asarray(dates).astype('datetime64[D]')
+        positions = np.searchsorted(calendar, dates, side='right') - 1 + n
+
+        valid = (positions >= 0) & (positions < len(calendar)) & ~np.isnat(dates)
+        shifted = np.full(dates.shape, np.datetime64('NaT'), dtype='datetime64[D]')
+        shifted[valid] = calendar[positions[valid]]
+
+        return shifted
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
     def validate_date(
         date: str
         ) -> bool:
+        # Cached: the same few dates are validated again and again.
         assert pd.to_datetime(date, format='%Y-%m-%d'), f'Invalid date format: {date}'
     
     @staticmethod
@@ -54,8 +200,102 @@ class DateUtil:
         ) -> str:
         DateUtil.validate_date(strdt)
 
-        return (pd.to_datetime(strdt) + pd.Timedelta(days=days)).strftime('%Y-%m-%d')
+        return str(np.datetime64(strdt, 'D') + days)
+
+    @staticmethod
+    def get_last_final_date() -> str:
+        """
+        Returns the last date whose data can no longer change (yesterday). Data of today 
+        or later may be partial or not published yet, so it is never stored.
+        """
+        return DateUtil.add_strdt(pd.Timestamp.today().strftime('%Y-%m-%d'), -1)
     
+class TokenBucket:
+    """
+    Thread-safe token bucket rate limiter.
+
+    Up to ``capacity`` calls may burst at once; after that ``acquire`` blocks so that 
+    the sustained rate stays at ``rate`` calls per second.
+    """
+    def __init__(
+        self,
+        rate: float,
+        capacity: float=None,
+        ) -> None:
+        if rate <= 0:
+            raise ValueError(f'rate should be positive: {rate}')
+
+        self.rate = rate
+        self.capacity = max(1.0, capacity if capacity is not None else rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        tokens: float=1,
+        ) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+
+                wait = (tokens - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+class TickerDictionary:
+    """
+    Process-wide, append-only dictionary of tickers.
+
+    Codes never change once assigned, so categoricals built from it at different times 
+    and by different readers only differ by trailing categories and can be combined 
+    without re-encoding strings.
+    """
+    _codes = {}
+    _tickers = []
+    _dtype = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def encode(
+        cls,
+        tickers,
+        ) -> np.ndarray:
+        with cls._lock:
+            for ticker in tickers:
+                if ticker not in cls._codes:
+                    cls._codes[ticker] = len(cls._tickers)
+                    cls._tickers.append(ticker)
+                    cls._dtype = None
+
+            codes = np.fromiter((cls._codes[ticker] for ticker in tickers), dtype=np.int32, count=len(tickers))
+
+        return codes
+
+    @classmethod
+    def get_dtype(cls) -> pd.CategoricalDtype:
+        with cls._lock:
+            if cls._dtype is None:
+                cls._dtype = pd.CategoricalDtype(categories=list(cls._tickers))
+
+            return cls._dtype
+
+    @classmethod
+    def to_categorical(
+        cls,
+        tickers,
+        ) -> pd.Categorical:
+        codes = cls.encode(tickers)
+
+        return pd.Categorical.from_codes(codes, dtype=cls.get_dtype())
+
 class CommonOps:
     @staticmethod
     def invert_dict(
@@ -81,6 +321,26 @@ class CommonOps:
         return dict(dd)
 
 class PdOps:
+    MOLTEN_COLUMNS = ['date', 'ticker', 'data', 'value']
+
+    @staticmethod
+    def concat_molten(
+        melt_dfs: list,
+        ) -> pd.DataFrame:
+        if not melt_dfs:
+            return pd.DataFrame(columns=PdOps.MOLTEN_COLUMNS)
+
+        # Concatenating categoricals with different categories would fall back to 
+        # Python objects, so they are combined separately.
+        columns = melt_dfs[0].columns
+        cat_cols = [col for col in columns if isinstance(melt_dfs[0][col].dtype, pd.CategoricalDtype)]
+
+        concat = pd.concat([melt_df.drop(columns=cat_cols) for melt_df in melt_dfs], axis=0, ignore_index=True)
+        for col in cat_cols:
+            concat[col] = union_categoricals([melt_df[col] for melt_df in melt_dfs])
+
+        return concat[columns]
+
     @staticmethod
     def molten_to_single(
         melt_df: pd.DataFrame,
@@ -97,7 +357,7 @@ class PdOps:
         melt_df: pd.DataFrame,
         ) -> pd.DataFrame:
 
-        multi = melt_df.pivot_table(index=['date', 'ticker'], columns='data', values='value')
+        multi = melt_df.pivot_table(index=['date', 'ticker'], columns='data', values='value', observed=True)
         multi.sort_index(inplace=True)
 
         return multi
\ No newline at end of file
@@ -0,0 +1,23 @@
+import pytest
+
+from kor_quant_dataloader.cache import snapshot_cache
+from kor_quant_dataloader.datasource.pykrx_ import PykrxReader
+from kor_quant_dataloader.utils import TokenBucket
+
+@pytest.fixture(autouse=True)
+def local_data_dir(tmp_path, monkeypatch):
+    # Keep the local store of every test inside its own temporary directory.
+    data_dir = tmp_path / 'kqdl'
+    monkeypatch.setenv('KQDL_DATA_DIR', str(data_dir))
+
+    return data_dir
+
+@pytest.fixture(autouse=True)
+def empty_snapshot_cache():
+    snapshot_cache.clear()
+    yield
+    snapshot_cache.clear()
+
+@pytest.fixture(autouse=True)
+def fast_rate_limit(monkeypatch):
+    monkeypatch.setattr(PykrxReader, 'rate_limiter', TokenBucket(rate=10000))
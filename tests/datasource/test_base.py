@@ -0,0 +1,102 @@
+import os
+
+import pandas as pd
+
+from kor_quant_dataloader.datasource.base import BaseLocal, LocalManifest, reader_registry
+from kor_quant_dataloader.datasource.pykrx_ import (
+    PykrxReader,
+    PykrxAdjPrice,
+    PykrxOHLCV,
+)
+
+class TestBaseLocal:
+    def test_root_from_env(self, local_data_dir):
+        assert BaseLocal().root == str(local_data_dir)
+
+    def test_parquet_roundtrip(self, tmp_path):
+        local = BaseLocal(root=str(tmp_path))
+        df = pd.DataFrame(
+            {'종가': [100, 200]},
+            index=pd.Index(['005930', '000020'], name='티커'),
+            )
+
+        local.write_parquet(df, 'pykrx', 'PykrxOHLCV', '2021-01-04.parquet')
+
+        assert local.list_files('pykrx', 'PykrxOHLCV', suffix='.parquet') == ['2021-01-04.parquet']
+        pd.testing.assert_frame_equal(
+            local.read_parquet('pykrx', 'PykrxOHLCV', '2021-01-04.parquet'),
+            df,
+            )
+
+    def test_failed_write_leaves_no_file(self, tmp_path):
+        local = BaseLocal(root=str(tmp_path))
+
+        try:
+            local.write_json({'bad': object()}, 'manifest.json')
+        except TypeError:
+            pass
+
+        assert os.listdir(tmp_path) == []
+        assert local.read_json('manifest.json') == {}
+
+    def test_read_parquet_stored_columns_only(self, tmp_path):
+        local = BaseLocal(root=str(tmp_path))
+        local.write_parquet(pd.DataFrame({'종가': [1], '시가': [2]}), 'x.parquet')
+
+        assert local.read_parquet('x.parquet', columns=['종가', 'BPS']).columns.tolist() == ['종가']
+
+class TestLocalManifest:
+    def test_add_and_sync(self, tmp_path):
+        local = BaseLocal(root=str(tmp_path))
+        manifest = LocalManifest(local, 'pykrx', 'PykrxOHLCV')
+        snapshot = pd.DataFrame({'종가': [100, 200]}, index=pd.Index(['005930', '000020'], name='티커'))
+
+        for date in ['2021-01-04', '2021-01-05']:
+            local.write_parquet(snapshot, 'pykrx', 'PykrxOHLCV', f'{date}.parquet')
+            manifest.add(date, snapshot.index)
+        manifest.flush()
+
+        assert manifest.load() == {
+            'dates': ['2021-01-04', '2021-01-05'],
+            'tickers': {'000020': ['2021-01-04', '2021-01-05'], '005930': ['2021-01-04', '2021-01-05']},
+            }
+
+        # Snapshots written or removed behind the manifest's back are picked up.
+        local.write_parquet(snapshot.iloc[:1], 'pykrx', 'PykrxOHLCV', '2021-01-06.parquet')
+        assert manifest.load()['tickers']['005930'] == ['2021-01-04', '2021-01-06']
+
+        os.remove(local.get_path('pykrx', 'PykrxOHLCV', '2021-01-04.parquet'))
+        assert manifest.load() == {
+            'dates': ['2021-01-05', '2021-01-06'],
+            'tickers': {'000020': ['2021-01-05', '2021-01-05'], '005930': ['2021-01-05', '2021-01-06']},
+            }
+
+        listing = manifest.get_listing()
+        assert listing.dates.strftime('%Y-%m-%d').tolist() == ['2021-01-05', '2021-01-06']
+        assert listing.get_listed('2021-01-06').tolist() == ['005930']
+
+    def test_listing_of_old_store(self, tmp_path):
+        local = BaseLocal(root=str(tmp_path))
+        snapshot = pd.DataFrame({'종가': [100]}, index=pd.Index(['005930'], name='티커'))
+        local.write_parquet(snapshot, 'pykrx', 'PykrxOHLCV', '2021-01-04.parquet')
+        local.write_json({'dates': ['2021-01-04'], 'tickers': {'005930': ['2021-01-04', '2021-01-04']}}, 'pykrx', 'PykrxOHLCV', 'manifest.json')
+
+        listing = LocalManifest(local, 'pykrx', 'PykrxOHLCV').get_listing()
+
+        assert listing.get_listed('2021-01-04').tolist() == ['005930']
+
+class TestReaderRegistry:
+    def test_field_index(self):
+        assert reader_registry.get_readers('pykrx')[:2] == [PykrxAdjPrice, PykrxOHLCV]
+        assert reader_registry.get_candidates('pykrx', '종가') == [PykrxAdjPrice, PykrxOHLCV]
+        assert reader_registry.get_candidates('pykrx', '없는필드') == []
+
+        fields = PykrxReader.get_available_cols()
+        assert len(fields) == len(set(fields))
+        assert {'변동폭', '고가', '시가총액', 'BPS'} <= set(fields)
+
+    def test_subclass_without_fields_is_not_registered(self):
+        class CustomOHLCV(PykrxOHLCV):
+            pass
+
+        assert CustomOHLCV not in reader_registry.get_readers('pykrx')
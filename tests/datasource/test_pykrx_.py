@@ -1,13 +1,192 @@
+import shutil
+
+import numpy as np
 import pandas as pd
+import pytest
 
+from kor_quant_dataloader.cache import snapshot_cache
+from kor_quant_dataloader.datasource.base import BaseLocal
+from kor_quant_dataloader.utils import TickerDictionary
 from kor_quant_dataloader.datasource.pykrx_ import (
+    PykrxCalendar,
     PykrxReader,
     PykrxOHLCV,
 )
 
+@pytest.fixture(autouse=True)
+def weekday_calendar(monkeypatch):
+    def fake_fetch_tradingdays(self, start_date, end_date):
+        return pd.bdate_range(start_date, end_date).strftime('%Y-%m-%d').tolist()
+
+    monkeypatch.setattr(PykrxCalendar, '_fetch_tradingdays', fake_fetch_tradingdays)
+
+def make_ohlcv_snapshot(date: str) -> pd.DataFrame:
+    price = int(date.replace('-', '')) % 1000
+    snapshot = pd.DataFrame(
+        {col: [price, price + 1] for col in PykrxOHLCV.available_cols},
+        index=pd.Index(['005930', '000020'], name='티커'),
+        )
+
+    return snapshot
+
+class FakeOHLCV(PykrxOHLCV):
+    fetched = []
+
+    def _fetch_data_one(self, date: str) -> pd.DataFrame:
+        FakeOHLCV.fetched.append(date)
+
+        return make_ohlcv_snapshot(date)
+
 class TestPykrxReader:
     def test_read(self):
         pass
+
+    def test_read_fetches_only_missing_dates(self):
+        FakeOHLCV.fetched = []
+        reader = FakeOHLCV()
+
+        reader.read(['종가'], '2021-01-04', '2021-01-05', download=True)
+        assert FakeOHLCV.fetched == ['2021-01-04', '2021-01-05']
+        assert reader._get_available_local_dates() == ['2021-01-04', '2021-01-05']
+
+        df = reader.read(['종가'], '2021-01-04', '2021-01-06', download=True)
+        assert FakeOHLCV.fetched == ['2021-01-04', '2021-01-05', '2021-01-06']
+        assert df['date'].tolist() == pd.to_datetime(['2021-01-04'] * 2 + ['2021-01-05'] * 2 + ['2021-01-06'] * 2).tolist()
+        assert set(df['data']) == {'종가'}
+
+    def test_read_without_download_serves_from_disk(self):
+        FakeOHLCV.fetched = []
+        FakeOHLCV().read(['종가'], '2021-01-04', '2021-01-04', download=True)
+
+        df = FakeOHLCV().read(['종가', '거래량'], '2021-01-04', '2021-01-05', download=False)
+
+        assert FakeOHLCV.fetched == ['2021-01-04']
+        assert df['date'].unique().tolist() == [pd.Timestamp('2021-01-04')]
+        assert len(df) == 4
+
+    def test_concurrent_fetch_keeps_date_order(self):
+        FakeOHLCV.fetched = []
+        reader = FakeOHLCV(max_workers=4)
+
+        df = reader._fetch_data_all(['2021-01-04', '2021-01-05', '2021-01-06', '2021-01-07'])
+
+        assert sorted(FakeOHLCV.fetched) == ['2021-01-04', '2021-01-05', '2021-01-06', '2021-01-07']
+        assert df['date'].unique().tolist() == pd.to_datetime(['2021-01-04', '2021-01-05', '2021-01-06', '2021-01-07']).tolist()
+
+    def test_fetch_retries_transient_errors(self):
+        class FlakyOHLCV(PykrxOHLCV):
+            attempts = 0
+
+            def _fetch_data_one(self, date: str) -> pd.DataFrame:
+                FlakyOHLCV.attempts += 1
+                if FlakyOHLCV.attempts < 3:
+                    raise ConnectionError('KRX reset the connection')
+
+                return make_ohlcv_snapshot(date)
+
+        reader = FlakyOHLCV(max_retries=3, backoff=0)
+        snapshot = reader._fetch_data_one_with_retry('2021-01-04')
+
+        assert FlakyOHLCV.attempts == 3
+        assert len(snapshot) == 2
+
+        FlakyOHLCV.attempts = -10
+        with pytest.raises(ConnectionError):
+            FlakyOHLCV(max_retries=1, backoff=0)._fetch_data_one_with_retry('2021-01-04')
+
+    def test_fetch_retries_empty_snapshots_of_tradingdays(self):
+        class EmptyOnceOHLCV(PykrxOHLCV):
+            attempts = 0
+
+            def _fetch_data_one(self, date: str) -> pd.DataFrame:
+                EmptyOnceOHLCV.attempts += 1
+                if EmptyOnceOHLCV.attempts == 1:
+                    return pd.DataFrame()
+
+                return make_ohlcv_snapshot(date)
+
+        reader = EmptyOnceOHLCV(max_retries=1, backoff=0)
+        df = reader.read(['종가'], '2021-01-04', '2021-01-04', download=True)
+
+        assert EmptyOnceOHLCV.attempts == 2
+        assert len(df) == 2
+
+    def test_empty_snapshot_of_tradingday_is_not_stored(self):
+        class EmptyOHLCV(PykrxOHLCV):
+            def _fetch_data_one(self, date: str) -> pd.DataFrame:
+                # pykrx returns an empty frame when it cannot parse the KRX response.
+                return pd.DataFrame()
+
+        reader = EmptyOHLCV(max_retries=0)
+        with pytest.raises(ValueError):
+            reader.read(['종가'], '2021-01-04', '2021-01-04', download=True)
+        assert reader._get_available_local_dates() == []
+
+        # Days the calendar does not know as trading days are stored empty.
+        df = reader.read(['종가'], '2021-01-09', '2021-01-09', download=True, remove_holidays=False)
+        assert df.empty
+        assert reader._get_available_local_dates() == ['2021-01-09']
+
+    def test_empty_snapshot_checks_calendar_beyond_its_range(self):
+        class EmptyOHLCV(PykrxOHLCV):
+            def _fetch_data_one(self, date: str) -> pd.DataFrame:
+                return pd.DataFrame()
+
+        # Reads that keep holidays never extend the calendar themselves.
+        reader = EmptyOHLCV(max_retries=0)
+        with pytest.raises(ValueError):
+            reader.read(['종가'], '2021-01-05', '2021-01-05', download=True, remove_holidays=False)
+        assert reader._get_available_local_dates() == []
+
+    def test_snapshots_of_today_are_not_stored(self):
+        class EmptyOHLCV(PykrxOHLCV):
+            def _fetch_data_one(self, date: str) -> pd.DataFrame:
+                return pd.DataFrame()
+
+        today = pd.Timestamp.today().strftime('%Y-%m-%d')
+        for reader in [EmptyOHLCV(max_retries=0), FakeOHLCV()]:
+            reader.read(['종가'], today, today, download=True, remove_holidays=False)
+
+            assert reader._get_available_local_dates() == []
+            assert today not in reader.manifest.load().get('dates', [])
+            assert (reader.local.root, reader.__class__, today) not in snapshot_cache
+
+    def test_read_pushes_down_universe_and_data(self):
+        reader = FakeOHLCV()
+        reader.read(['종가'], '2021-01-04', '2021-01-04', download=True)
+
+        fetched = reader.read_snapshots(['종가', '거래량'], '2021-01-04', '2021-01-05', download=True, universe=['000020'])
+        for _, snapshot in fetched:
+            assert snapshot.index.tolist() == ['000020']
+            assert snapshot.columns.tolist() == ['종가', '거래량']
+
+        df = reader.read(['거래량'], '2021-01-04', '2021-01-05', download=False, universe=['005930', '999999'])
+        assert df['ticker'].unique().tolist() == ['005930']
+        assert df['data'].unique().tolist() == ['거래량']
+        assert len(df) == 2
+
+    def test_read_uses_snapshot_cache(self, local_data_dir):
+        FakeOHLCV.fetched = []
+        FakeOHLCV().read(['종가'], '2021-01-04', '2021-01-05', download=True)
+
+        # Even without the local store, the second loader is served from memory.
+        shutil.rmtree(local_data_dir / 'pykrx' / 'FakeOHLCV')
+        df = FakeOHLCV().read(['거래량'], '2021-01-04', '2021-01-05', download=True, universe=['005930'])
+
+        assert FakeOHLCV.fetched == ['2021-01-04', '2021-01-05']
+        assert df['value'].tolist() == [104, 105]
+        assert snapshot_cache.get_stats()['hits'] == 2
+
+    def test_read_compact_dtypes(self):
+        df = FakeOHLCV(dtype='float32').read(['종가', '거래량'], '2021-01-04', '2021-01-05', download=True)
+
+        assert df['date'].dtype == 'datetime64[ns]'
+        assert isinstance(df['ticker'].dtype, pd.CategoricalDtype)
+        assert isinstance(df['data'].dtype, pd.CategoricalDtype)
+        assert df['value'].dtype == 'float32'
+        assert df['ticker'].cat.categories.equals(TickerDictionary.get_dtype().categories)
+        assert df.loc[(df['ticker'] == '000020') & (df['data'] == '거래량'), 'value'].tolist() == [105, 106]
+
 class TestPykrxOHLCV:
     def test_read(self):
         reader = PykrxOHLCV()
@@ -27,4 +206,64 @@ class TestPykrxOHLCV:
             download=False
             )
 
-        assert isinstance(df, pd.DataFrame)
\ No newline at end of file
+        assert isinstance(df, pd.DataFrame)
+
+class TestPykrxCalendar:
+    @pytest.fixture
+    def fetch_log(self, monkeypatch):
+        fetch_log = []
+        tradingdays = ['2021-01-04', '2021-01-05', '2021-01-06', '2021-01-07', '2021-01-08', '2021-01-11']
+
+        def fake_fetch_tradingdays(self, start_date, end_date):
+            fetch_log.append((start_date, end_date))
+            return [dt for dt in tradingdays if start_date <= dt <= end_date]
+
+        monkeypatch.setattr(PykrxCalendar, '_fetch_tradingdays', fake_fetch_tradingdays)
+
+        return fetch_log
+
+    def test_extends_incrementally(self, fetch_log):
+        calendar = PykrxCalendar(BaseLocal())
+
+        assert calendar.get('2021-01-05', '2021-01-07') == ['2021-01-05', '2021-01-06', '2021-01-07']
+        assert calendar.get('2021-01-06', '2021-01-07') == ['2021-01-06', '2021-01-07']
+        assert calendar.get('2021-01-01', '2021-01-10') == ['2021-01-04', '2021-01-05', '2021-01-06', '2021-01-07', '2021-01-08']
+        assert fetch_log == [
+            ('2021-01-05', '2021-01-07'),
+            ('2021-01-01', '2021-01-04'),
+            ('2021-01-08', '2021-01-10'),
+            ]
+
+    def test_persisted_and_offline(self, fetch_log):
+        PykrxCalendar(BaseLocal()).get('2021-01-04', '2021-01-06')
+        calendar = PykrxCalendar(BaseLocal())
+
+        assert calendar.get('2021-01-04', '2021-01-06', download=False) == ['2021-01-04', '2021-01-05', '2021-01-06']
+        # Uncovered days fall back to calendar days when offline.
+        assert calendar.get('2021-01-06', '2021-01-08', download=False) == ['2021-01-06', '2021-01-07', '2021-01-08']
+        assert len(fetch_log) == 1
+
+    def test_offset(self, fetch_log):
+        calendar = PykrxCalendar(BaseLocal())
+        calendar.get('2021-01-04', '2021-01-11')
+
+        shifted = calendar.offset(np.array(['2021-01-08', '2021-01-09'], dtype='datetime64[D]'), 1)
+
+        assert shifted.tolist() == np.array(['2021-01-11', '2021-01-11'], dtype='datetime64[D]').tolist()
+        assert calendar.get_array('2021-01-07', '2021-01-10').astype(str).tolist() == ['2021-01-07', '2021-01-08']
+
+    def test_reader_fetches_tradingdays_only(self, fetch_log, monkeypatch):
+        monkeypatch.setattr(PykrxCalendar, '_instances', {})
+        FakeOHLCV.fetched = []
+
+        FakeOHLCV().read(['종가'], '2021-01-08', '2021-01-11', download=True)
+
+        assert FakeOHLCV.fetched == ['2021-01-08', '2021-01-11']
+
+    def test_reader_uses_calendar_of_its_store(self, fetch_log, tmp_path, local_data_dir):
+        local = BaseLocal(root=str(tmp_path / 'custom'))
+
+        FakeOHLCV(local=local).read(['종가'], '2021-01-08', '2021-01-11', download=True)
+
+        assert local.read_json('pykrx', 'calendar_1028.json')['tradingdays'] == ['2021-01-08', '2021-01-11']
+        assert not (local_data_dir / 'pykrx' / 'calendar_1028.json').exists()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+import kor_quant_dataloader as kqdl
+
+def make_panel():
+    # A splits 1:2 on the third day; B is listed on the second day and never adjusts.
+    dates = pd.bdate_range('2021-01-04', periods=4)
+    close = np.array([
+        [100.0, np.nan],
+        [110.0, 20.0],
+        [50.0, 21.0],
+        [52.0, 22.0],
+        ])
+    base = np.array([
+        [100.0, np.nan],
+        [100.0, 15.0],
+        [55.0, 20.0],
+        [50.0, 21.0],
+        ])
+
+    return kqdl.Panel(np.stack([base, close]), dates, ['A', 'B'], ['시가', '종가'])
+
+class TestAdjustmentFactors:
+    def test_compute(self):
+        factors = kqdl.AdjustmentFactors.compute(make_panel())
+
+        assert factors.tickers.tolist() == ['A']
+        assert factors.ratios.tolist() == [0.5]
+        assert factors.dates.tolist() == [pd.Timestamp('2021-01-06').date()]
+        assert len(factors.covered) == 3
+
+    def test_get_factors(self):
+        panel = make_panel()
+        factors = kqdl.AdjustmentFactors.compute(panel)
+
+        assert factors.get_factors(panel.dates, ['A', 'B']).tolist() == [[0.5, 1.0], [0.5, 1.0], [1.0, 1.0], [1.0, 1.0]]
+        # Relative to the last date of the period: the split is after it.
+        assert factors.get_factors(panel.dates[:2], ['A']).tolist() == [[1.0], [1.0]]
+        assert factors.get_factors(panel.dates[:2], ['A'], '2021-01-07').tolist() == [[0.5], [0.5]]
+
+        adjusted = factors.adjust(panel, ['종가'])
+        assert adjusted.get_frame('종가')['A'].tolist() == [50.0, 55.0, 50.0, 52.0]
+        assert panel.get_frame('종가')['A'].tolist() == [100.0, 110.0, 50.0, 52.0]
+
+    def test_update_and_arrays_roundtrip(self):
+        panel = make_panel()
+        factors = kqdl.AdjustmentFactors.compute(panel)
+
+        # Recomputing the split day without the split replaces its event.
+        recomputed = kqdl.AdjustmentFactors([], [], [], [np.datetime64('2021-01-06')])
+        assert len(factors.update(recomputed).ratios) == 0
+
+        restored = kqdl.AdjustmentFactors.from_arrays(factors.to_arrays())
+        assert restored.get_factors(panel.dates, panel.tickers).tolist() == factors.get_factors(panel.dates, panel.tickers).tolist()
+        assert restored.get_missing(['2021-01-04', '2021-01-05']) == ['2021-01-04']
@@ -0,0 +1,99 @@
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+from kor_quant_dataloader.backfill import main
+from kor_quant_dataloader.datasource.pykrx_ import (
+    PykrxCalendar,
+    PykrxReader,
+    PykrxAdjPrice,
+    PykrxOHLCV,
+    PykrxFunda,
+)
+
+@pytest.fixture
+def fake_pykrx(monkeypatch):
+    fetched = []
+    failing = set()
+
+    def fake_fetch_tradingdays(self, start_date, end_date):
+        return pd.bdate_range(start_date, end_date).strftime('%Y-%m-%d').tolist()
+
+    def fake_fetch_data_one(self, date):
+        if (self.__class__.__name__, date) in failing:
+            raise OSError('KRX is down')
+
+        fetched.append((self.__class__.__name__, date))
+        return pd.DataFrame(
+            {col: [int(date[-2:])] for col in self.available_cols},
+            index=pd.Index(['005930'], name='티커'),
+            )
+
+    monkeypatch.setattr(PykrxCalendar, '_fetch_tradingdays', fake_fetch_tradingdays)
+    for child_reader in PykrxReader.__subclasses__():
+        monkeypatch.setattr(child_reader, '_fetch_data_one', fake_fetch_data_one)
+
+    return fetched, failing
+
+class TestBackfill:
+    def test_run_and_resume(self, fake_pykrx):
+        fetched, failing = fake_pykrx
+        failing.add(('PykrxFunda', '2021-02-10'))
+        backfill = kqdl.Backfill('2021-01-01', '2021-03-31', data=['종가', 'BPS'], max_retries=0)
+
+        with pytest.raises(RuntimeError):
+            backfill.run()
+
+        status = backfill.get_status().set_index(['reader', 'start'])['status']
+        assert status['PykrxOHLCV'].tolist() == ['done', 'done', 'done']
+        assert status['PykrxFunda'].tolist() == ['done', 'failed', 'pending']
+        stored_dates = PykrxFunda()._get_available_local_dates()
+        assert '2021-02-10' not in stored_dates
+        assert max(stored_dates) < '2021-03-01'
+
+        # The rerun only fetches what the failed reader had not stored yet.
+        failing.clear()
+        fetched.clear()
+        status = kqdl.Backfill('2021-01-01', '2021-03-31', data=['종가', 'BPS']).run()
+
+        assert (status['status'] == 'done').all()
+        assert {reader for reader, _ in fetched} == {'PykrxFunda'}
+        assert min(date for _, date in fetched) == '2021-02-10'
+        assert len(PykrxOHLCV()._get_available_local_dates()) == len(PykrxFunda()._get_available_local_dates()) == 64
+
+    def test_loader_backfill(self, fake_pykrx):
+        fetched, _ = fake_pykrx
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-15', progress=False)
+
+        status = loader.backfill('종가', chunk='W')
+
+        assert status['reader'].unique().tolist() == ['PykrxOHLCV']
+        assert status['n_dates'].tolist() == [5, 5]
+
+        fetched.clear()
+        loader.get_data('종가')
+        assert fetched == []
+
+        # Adjusted prices need the prices and the base prices of the adjustment events.
+        assert loader.backfill('수정종가', chunk='W')['reader'].unique().tolist() == ['PykrxOHLCV', 'PykrxAdjPrice']
+
+    def test_custom_store(self, fake_pykrx, tmp_path):
+        fetched, _ = fake_pykrx
+        kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-08', progress=False).get_data('종가')
+        fetched.clear()
+
+        # Snapshots cached for the default store are fetched again for another store.
+        local = kqdl.BaseLocal(root=str(tmp_path / 'custom'))
+        status = kqdl.Backfill('2021-01-04', '2021-01-08', data=['종가'], local=local, max_workers=4).run()
+
+        assert status['n_dates'].tolist() == [5]
+        assert len(fetched) == 5
+        assert len(PykrxOHLCV(local=local)._get_available_local_dates()) == 5
+        assert local.read_json('pykrx', 'calendar_1028.json')
+
+    def test_cli(self, fake_pykrx, capsys):
+        fetched, _ = fake_pykrx
+
+        assert main(['--start', '2021-01-04', '--end', '2021-01-08', '--workers', '2']) == 0
+        assert {reader for reader, _ in fetched} == {'PykrxAdjPrice', 'PykrxOHLCV', 'PykrxMarketCap', 'PykrxFunda'}
+        assert 'PykrxFunda' in capsys.readouterr().out
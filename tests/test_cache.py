@@ -0,0 +1,94 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+
+def make_snapshot(n: int) -> pd.DataFrame:
+    return pd.DataFrame({'종가': range(n)}, index=pd.Index([f'{i:06d}' for i in range(n)], name='티커'))
+
+class TestSnapshotCache:
+    def test_get_put_and_stats(self):
+        cache = kqdl.SnapshotCache()
+        snapshot = make_snapshot(3)
+
+        assert cache.get(object, '2021-01-04') is None
+        cache.put(object, '2021-01-04', snapshot)
+        assert cache.get(object, '2021-01-04') is snapshot
+        assert cache.get(object, '2021-01-04', root='/other') is None
+
+        stats = cache.get_stats()
+        assert (stats['entries'], stats['hits'], stats['misses']) == (1, 1, 2)
+        assert stats['hit_rate'] == 1 / 3
+
+    def test_lru_eviction(self):
+        nbytes = int(make_snapshot(10).memory_usage(index=True, deep=True).sum())
+        cache = kqdl.SnapshotCache(max_bytes=2 * nbytes)
+
+        cache.put(object, '2021-01-04', make_snapshot(10))
+        cache.put(object, '2021-01-05', make_snapshot(10))
+        cache.get(object, '2021-01-04')
+        cache.put(object, '2021-01-06', make_snapshot(10))
+
+        assert cache.get(object, '2021-01-05') is None
+        assert cache.get(object, '2021-01-04') is not None
+        assert cache.get_stats()['evictions'] == 1
+        assert cache.bytes == 2 * nbytes
+
+    def test_invalidate(self):
+        cache = kqdl.SnapshotCache()
+        cache.put(int, '2021-01-04', make_snapshot(1))
+        cache.put(int, '2021-01-05', make_snapshot(1))
+        cache.put(str, '2021-01-04', make_snapshot(1))
+        cache.put(str, '2021-01-04', make_snapshot(1), root='/other')
+
+        assert cache.invalidate(root='/other') == 1
+        assert cache.invalidate(date='2021-01-04') == 2
+        assert cache.invalidate(reader=int) == 1
+        assert cache.get_stats()['entries'] == 0
+        assert cache.bytes == 0
+
+    def test_disabled(self):
+        cache = kqdl.SnapshotCache(max_bytes=0)
+        cache.put(object, '2021-01-04', make_snapshot(1))
+
+        assert not cache.enabled
+        assert cache.get(object, '2021-01-04') is None
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_one_execution(self):
+        flight = kqdl.SingleFlight()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def fetch(date):
+            calls.append(date)
+            started.set()
+            release.wait()
+            return date.upper()
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            leader = executor.submit(flight.do, 'key', fetch, 'a')
+            started.wait()
+            followers = [executor.submit(flight.do, 'key', fetch, 'a') for _ in range(3)]
+            while flight.get_stats()['coalesced'] < 3:
+                time.sleep(0.001)
+            release.set()
+
+        assert leader.result() == ('A', False)
+        assert [follower.result() for follower in followers] == [('A', True)] * 3
+        assert calls == ['a']
+        assert (flight.executed, flight.coalesced, flight.in_flight) == (1, 3, 0)
+
+    def test_exception_is_shared_and_key_released(self):
+        flight = kqdl.SingleFlight()
+
+        def fail():
+            raise OSError('KRX down')
+
+        with pytest.raises(OSError):
+            flight.do('key', fail)
+        assert flight.do('key', lambda: 1) == (1, False)
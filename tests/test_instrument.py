@@ -0,0 +1,34 @@
+import kor_quant_dataloader as kqdl
+
+class TestInstrumentation:
+    def test_span_and_emit(self):
+        events = []
+        instrument = kqdl.Instrumentation([events.append])
+
+        with instrument.span('panel', reader='PykrxOHLCV'):
+            pass
+        instrument.emit('rows', stage='panel', rows=3, bytes=24)
+
+        assert [event['event'] for event in events] == ['span', 'rows']
+        assert events[0]['stage'] == 'panel'
+        assert events[0]['reader'] == 'PykrxOHLCV'
+        assert events[0]['seconds'] >= 0
+
+class TestLoadStats:
+    def test_aggregates(self):
+        stats = kqdl.LoadStats()
+        instrument = kqdl.Instrumentation([stats])
+
+        instrument.emit('span', stage='read', seconds=1.0)
+        instrument.emit('span', stage='read', seconds=2.0)
+        instrument.emit('request', reader='PykrxOHLCV', date='2021-01-04', source='network', seconds=0.5)
+        instrument.emit('request', reader='PykrxOHLCV', date='2021-01-05', source='cache', seconds=0.0)
+        instrument.emit('rows', stage='output', rows=10, bytes=80)
+
+        assert stats.get_spans().loc['read'].tolist() == [2, 3.0]
+        assert stats.get_requests().loc[('PykrxOHLCV', 'network'), 'count'] == 1
+        assert stats.get_rows().loc['output', 'bytes'] == 80
+        assert stats.cache_hit_rate == 0.5
+
+        stats.reset()
+        assert stats.get_spans().empty
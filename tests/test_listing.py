@@ -0,0 +1,59 @@
+import pandas as pd
+
+import kor_quant_dataloader as kqdl
+
+def make_listing():
+    return kqdl.ListingIndex.empty().update({
+        '2021-01-04': ['A', 'B'],
+        '2021-01-05': ['A', 'B', 'C'],
+        '2021-01-06': ['B', 'C'],
+        '2021-01-07': ['A', 'C'],
+        })
+
+class TestListingIndex:
+    def test_lookups(self):
+        listing = make_listing()
+
+        assert listing.get_listed('2021-01-06').tolist() == ['B', 'C']
+        assert listing.is_listed('2021-01-05', 'C')
+        assert not listing.is_listed('2021-01-06', 'A')
+
+    def test_update_replaces_dates(self):
+        listing = make_listing().update({'2021-01-06': ['A'], '2021-01-08': ['D']})
+
+        assert listing.get_listed('2021-01-06').tolist() == ['A']
+        assert listing.get_listed('2021-01-08').tolist() == ['D']
+        assert len(listing.dates) == 5
+
+    def test_intervals(self):
+        intervals = make_listing().get_intervals()
+
+        assert intervals.values.tolist() == [
+            ['A', pd.Timestamp('2021-01-04'), pd.Timestamp('2021-01-05')],
+            ['A', pd.Timestamp('2021-01-07'), pd.Timestamp('2021-01-07')],
+            ['B', pd.Timestamp('2021-01-04'), pd.Timestamp('2021-01-06')],
+            ['C', pd.Timestamp('2021-01-05'), pd.Timestamp('2021-01-07')],
+            ]
+
+    def test_span_mask(self):
+        listing = make_listing()
+        dates = pd.to_datetime(['2021-01-04', '2021-01-06', '2021-01-09'])
+
+        mask = listing.get_span_mask(dates, pd.Index(['A', 'B', 'C', 'Z']))
+
+        # B is delisted after 01-06, C listed on 01-05; A's gap and unknown Z are not masked.
+        assert mask.tolist() == [
+            [True, True, False, True],
+            [True, True, True, True],
+            [True, False, True, True],
+            ]
+
+    def test_arrays_roundtrip_and_union(self):
+        listing = make_listing()
+        loaded = kqdl.ListingIndex.from_arrays(listing.to_arrays())
+
+        assert (loaded.mask == listing.mask).all()
+        assert loaded.tickers.tolist() == ['A', 'B', 'C']
+
+        union = kqdl.ListingIndex.union([listing, kqdl.ListingIndex.empty().update({'2021-01-06': ['A']})])
+        assert union.get_listed('2021-01-06').tolist() == ['A', 'B', 'C']
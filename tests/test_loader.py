@@ -1,9 +1,76 @@
+import sys
+import time
+import asyncio
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
+import pytest
+
 import kor_quant_dataloader as kqdl
+from kor_quant_dataloader.datasource.pykrx_ import (
+    PykrxCalendar,
+    PykrxReader,
+    PykrxAdjPrice,
+    PykrxOHLCV,
+)
+from kor_quant_dataloader.utils import DateUtil
+
+@pytest.fixture
+def fake_pykrx(monkeypatch):
+    fetched = []
+
+    def fake_fetch_tradingdays(self, start_date, end_date):
+        return pd.bdate_range(start_date, end_date).strftime('%Y-%m-%d').tolist()
+
+    def fake_fetch_data_one(self, date):
+        fetched.append((self.__class__.__name__, date))
+        base = int(date[-2:])
+        snapshot = pd.DataFrame(
+            {col: [base, base + 100, base + 200] for col in self.available_cols},
+            index=pd.Index(['000020', '000660', '005930'], name='티커'),
+            )
+
+        return snapshot
+
+    def fake_fetch_ticker_range(self, ticker, start_date, end_date):
+        fetched.append((self.__class__.__name__, ticker))
+        # Like pykrx, a ticker without rows in the range comes back as a bare DataFrame().
+        offsets = {'000020': 0, '000660': 100, '005930': 200}
+        if ticker not in offsets:
+            return pd.DataFrame()
+
+        offset = offsets[ticker]
+        dates = pd.date_range(start_date, end_date, name='날짜')
+        ticker_rows = pd.DataFrame({col: dates.day + offset for col in self.available_cols}, index=dates)
+
+        return ticker_rows
+
+    monkeypatch.setattr(PykrxCalendar, '_fetch_tradingdays', fake_fetch_tradingdays)
+    for child_reader in PykrxReader.__subclasses__():
+        monkeypatch.setattr(child_reader, '_fetch_data_one', fake_fetch_data_one)
+        if child_reader.ticker_fetch_cost is not None:
+            monkeypatch.setattr(child_reader, '_fetch_ticker_range', fake_fetch_ticker_range)
+
+    return fetched
 
 def test_show_catalog():
     assert isinstance(kqdl.show_catalog(), pd.DataFrame)
 
+def test_show_catalog_local_coverage(fake_pykrx):
+    kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-06').get_data('종가')
+    kqdl.DataLoader(source='pykrx', start_date='2021-01-11', end_date='2021-01-12').get_data('종가')
+    fake_pykrx.clear()
+
+    catalog = kqdl.show_catalog('pykrx').set_index(['reader', 'data'])
+
+    assert catalog.columns.tolist() == kqdl.CATALOG_COLUMNS[:1] + kqdl.CATALOG_COLUMNS[3:]
+    assert catalog.loc[('PykrxOHLCV', '종가'), 'n_dates'] == 5
+    assert catalog.loc[('PykrxOHLCV', '종가'), 'date_ranges'] == [('2021-01-04', '2021-01-06'), ('2021-01-11', '2021-01-12')]
+    assert catalog.loc[('PykrxOHLCV', '고가'), 'n_tickers'] == 3
+    assert catalog.loc[('PykrxFunda', 'BPS'), 'n_dates'] == 0
+    assert fake_pykrx == []
+
 class TestDataLoader:
     def test_get_data(self):
         pykrx_loader = kqdl.DataLoader(
@@ -19,4 +86,440 @@ class TestDataLoader:
             download=False,
             )
         
-        assert isinstance(df, pd.DataFrame)
\ No newline at end of file
+        assert isinstance(df, pd.DataFrame)
+
+    def test_get_data_single(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-02',
+            end_date='2021-01-05',
+            universe=['005930', '000020'],
+            )
+
+        df = loader.get_data('종가')
+
+        assert df.index.tolist() == pd.to_datetime(['2021-01-04', '2021-01-05']).tolist()
+        assert df.columns.tolist() == ['000020', '005930']
+        assert df.loc['2021-01-05', '005930'] == 205
+
+    def test_get_data_multi(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-05',
+            )
+
+        df = loader.get_data(['종가', 'BPS'])
+
+        assert df.columns.tolist() == ['종가', 'BPS']
+        assert df.index.names == ['date', 'ticker']
+        assert len(df) == 6
+        assert df.loc[('2021-01-04', '000660'), 'BPS'] == 104
+
+    def test_get_data_float32(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-05',
+            dtype='float32',
+            )
+
+        assert loader.get_data('거래량').dtypes.unique().tolist() == ['float32']
+
+        with pytest.raises(ValueError):
+            kqdl.DataLoader(source='pykrx', start_date='2021-01-04', dtype='int64')
+
+    def test_explain(self, fake_pykrx):
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-05')
+
+        explanation = loader.explain(['종가', '거래량'])
+        loader.get_data(['종가', '거래량'])
+
+        assert explanation['reader'].unique().tolist() == ['PykrxOHLCV']
+        assert {reader for reader, _ in fake_pykrx} == {'PykrxOHLCV'}
+
+    def test_iter_data(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-25',
+            end_date='2021-03-05',
+            universe=['005930'],
+            )
+
+        chunks = list(loader.iter_data('종가', chunk='M'))
+
+        assert len(chunks) == 3
+        assert [chunk.index.month.unique().tolist() for chunk in chunks] == [[1], [2], [3]]
+        pd.testing.assert_frame_equal(pd.concat(chunks), loader.get_data('종가'))
+
+    def test_iter_data_multi(self, fake_pykrx):
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-25', end_date='2021-02-05')
+
+        chunks = list(loader.iter_data(['종가', 'BPS'], chunk='W'))
+
+        assert len(chunks) == 2
+        assert all(chunk.columns.tolist() == ['종가', 'BPS'] for chunk in chunks)
+
+    def test_aget_data(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-15',
+            universe=['005930', '000660'],
+            )
+
+        df = asyncio.run(loader.aget_data(['종가', 'BPS'], max_concurrency=3))
+
+        pd.testing.assert_frame_equal(df, loader.get_data(['종가', 'BPS']))
+        # 2 tickers are cheaper than 10 dates, and the second load reads the stored rows.
+        assert len(fake_pykrx) == 2 * 2
+
+    def test_aget_data_cancel(self, fake_pykrx, monkeypatch):
+        def slow_fetch_data_one(self, date):
+            time.sleep(0.05)
+            fake_pykrx.append((self.__class__.__name__, date))
+
+            return pd.DataFrame({'종가': [1.0]}, index=pd.Index(['005930'], name='티커'))
+
+        monkeypatch.setattr(PykrxOHLCV, '_fetch_data_one', slow_fetch_data_one)
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-03-31')
+
+        async def cancel_soon():
+            task = asyncio.ensure_future(loader.aget_data('종가', max_concurrency=2))
+            await asyncio.sleep(0.12)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_soon())
+
+        assert len(fake_pykrx) < 10
+
+    def test_panel(self, fake_pykrx):
+        kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-15',
+            ).build_panel(['종가', 'BPS', '시가총액'], name='test')
+        n_fetched = len(fake_pykrx)
+
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-06',
+            end_date='2021-01-08',
+            universe=['005930'],
+            panel='test',
+            )
+        df = loader.get_data(['BPS', '종가'])
+
+        assert len(fake_pykrx) == n_fetched
+        assert df.columns.tolist() == ['BPS', '종가']
+        assert df.index.get_level_values('date').unique().tolist() == pd.to_datetime(['2021-01-06', '2021-01-07', '2021-01-08']).tolist()
+        assert df.loc[('2021-01-07', '005930'), 'BPS'] == 207
+
+        with pytest.raises(KeyError):
+            loader.get_data('PER')
+
+    def test_shared_panel(self, fake_pykrx):
+        with kqdl.PanelServer() as server:
+            kqdl.DataLoader(
+                source='pykrx',
+                start_date='2021-01-04',
+                end_date='2021-01-15',
+                ).share_panel(['종가', 'BPS'], name='test_loader', server=server)
+            fake_pykrx.clear()
+
+            loader = kqdl.DataLoader(
+                source='pykrx',
+                start_date='2021-01-06',
+                end_date='2021-01-08',
+                universe=['005930'],
+                shared_panel='test_loader',
+                )
+            df = loader.get_data(['BPS', '종가'], options={'fill': 'ffill'})
+
+            assert fake_pykrx == []
+            assert df.loc[('2021-01-07', '005930'), 'BPS'] == 207
+            assert not kqdl.attach_panel('test_loader').values.flags.writeable
+
+    def test_update(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-08',
+            universe=['005930'],
+            )
+        loader.update(['종가', 'BPS'], end_date='2021-01-08')
+        fake_pykrx.clear()
+
+        delta = loader.update(['종가', 'BPS'], end_date='2021-01-12')
+
+        assert sorted(fake_pykrx) == [
+            ('PykrxFunda', '2021-01-11'), ('PykrxFunda', '2021-01-12'),
+            ('PykrxOHLCV', '2021-01-11'), ('PykrxOHLCV', '2021-01-12'),
+            ]
+        assert delta.index.get_level_values('date').unique().tolist() == pd.to_datetime(['2021-01-11', '2021-01-12']).tolist()
+        assert delta.index.get_level_values('ticker').unique().tolist() == ['005930']
+        assert delta.loc[('2021-01-12', '005930'), 'BPS'] == 212
+
+        fake_pykrx.clear()
+        assert loader.update(['종가', 'BPS'], end_date='2021-01-12').empty
+        assert fake_pykrx == []
+
+    def test_liquidity_universe(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-11',
+            end_date='2021-01-15',
+            universe='top2_liquidity_w3',
+            )
+
+        df = loader.get_data('BPS')
+
+        # Trading values rank 005930 > 000660 > 000020 every day, and the window is 
+        # warmed up with the days before start_date.
+        assert df.columns.tolist() == ['000660', '005930']
+        assert df.notna().all().all()
+        assert ('PykrxOHLCV', '2021-01-06') in fake_pykrx
+
+        fake_pykrx.clear()
+        top1_loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-12', end_date='2021-01-14', universe='top1_liquidity_w3')
+        assert top1_loader.get_data('종가').columns.tolist() == ['005930']
+        assert {reader for reader, _ in fake_pykrx} <= {'PykrxOHLCV'}
+
+        fake_pykrx.clear()
+        kqdl.universe.membership_cache.clear()
+        assert loader.get_data('BPS').columns.tolist() == ['000660', '005930']
+        assert fake_pykrx == []
+
+    def test_options(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-08',
+            end_date='2021-01-11',
+            universe=['005930'],
+            remove_holidays=False,
+            )
+
+        df = loader.get_data(['종가', 'BPS'], options={'BPS': {'holidays': 'ffill'}})
+
+        assert df.xs('005930', level='ticker')['BPS'].tolist() == [208, 208, 208, 211]
+        assert df.xs('005930', level='ticker')['종가'].tolist() == [208, 209, 210, 211]
+        assert loader.get_data('BPS', options={'holidays': 'ffill'})['005930'].tolist() == [208, 208, 208, 211]
+
+        with pytest.raises(ValueError):
+            loader.get_data('BPS', options={'PER': {'fill': 'ffill'}})
+
+    def test_listing(self, fake_pykrx, monkeypatch):
+        fake_fetch_data_one = PykrxOHLCV._fetch_data_one
+
+        def delisting_fetch_data_one(self, date):
+            snapshot = fake_fetch_data_one(self, date)
+            # 000020 is delisted after 2021-01-06 and has no BPS after 2021-01-05.
+            if date > '2021-01-06':
+                snapshot = snapshot.drop('000020')
+            if 'BPS' in snapshot and date > '2021-01-05':
+                snapshot.loc[snapshot.index == '000020', 'BPS'] = float('nan')
+            return snapshot
+
+        for child_reader in PykrxReader.__subclasses__():
+            monkeypatch.setattr(child_reader, '_fetch_data_one', delisting_fetch_data_one)
+
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-08')
+        df = loader.get_data('BPS', options={'fill': 'ffill'})
+
+        # The fill stops at the delisting instead of carrying 000020 forward.
+        assert df['000020'].tolist()[:3] == [4, 5, 5]
+        assert df['000020'].iloc[3:].isna().all()
+
+        listing = loader.get_listing()
+        assert listing.get_listed('2021-01-07').tolist() == ['000660', '005930']
+        assert listing.get_intervals().set_index('ticker').loc['000020', 'end'] == pd.Timestamp('2021-01-06')
+
+        loader.set_universe('listed')
+        assert loader.get_data('BPS', options={'fill': 'ffill'})['000020'].iloc[3:].isna().all()
+
+    def test_invalid_universe(self):
+        with pytest.raises(ValueError):
+            kqdl.DataLoader(source='pykrx', start_date='2021-01-04', universe='top_liquidity')
+
+    def test_estimate_cost(self, fake_pykrx):
+        kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-06').get_data('종가')
+        fake_pykrx.clear()
+
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-08')
+        estimate = loader.estimate_cost(['종가', 'BPS']).set_index('reader')
+
+        assert estimate.loc['PykrxOHLCV', ['n_dates', 'n_stored', 'n_missing', 'axis', 'requests']].tolist() == [5, 3, 2, 'date', 2]
+        assert estimate.loc['PykrxFunda', 'n_missing'] == 5
+        assert estimate.loc['PykrxFunda', 'seconds'] == 5 / PykrxReader.rate_limiter.rate
+        assert fake_pykrx == []
+
+    def test_fetch_axis(self, fake_pykrx, monkeypatch):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-15',
+            universe=['005930', '000020'],
+            )
+        assert loader.estimate_cost(['고가', '변동폭']).set_index('reader')['axis'].to_dict() == {
+            'PykrxOHLCV': 'ticker', 
+            'PykrxAdjPrice': 'date',
+            }
+
+        df = loader.get_data(['종가', 'BPS'])
+
+        assert sorted(fake_pykrx) == [
+            ('PykrxFunda', '000020'), ('PykrxFunda', '005930'),
+            ('PykrxOHLCV', '000020'), ('PykrxOHLCV', '005930'),
+            ]
+        assert PykrxOHLCV().ticker_ranges.get_ranges('005930') == [('2021-01-04', '2021-01-15')]
+
+        # The stored rows serve later loads, also without downloading.
+        fake_pykrx.clear()
+        pd.testing.assert_frame_equal(df, loader.get_data(['종가', 'BPS'], download=False))
+        assert loader.estimate_cost(['종가', 'BPS'])['requests'].tolist() == [0, 0]
+        catalog = kqdl.show_catalog('pykrx').set_index(['reader', 'data'])
+        assert catalog.loc[('PykrxOHLCV', '종가'), 'n_range_tickers'] == 2
+
+        # A new ticker is the only one fetched.
+        wider = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-15', universe=['005930', '000020', '000660'])
+        assert wider.estimate_cost('종가')['requests'].tolist() == [1]
+        wider.get_data('종가')
+        assert fake_pykrx == [('PykrxOHLCV', '000660')]
+
+        # The same frame as from the per-date snapshots.
+        monkeypatch.setattr(PykrxReader, 'ticker_fetch_cost', None)
+        for child_reader in PykrxReader.__subclasses__():
+            monkeypatch.setattr(child_reader, 'ticker_fetch_cost', None)
+        fake_pykrx.clear()
+
+        pd.testing.assert_frame_equal(df, loader.get_data(['종가', 'BPS']))
+        assert len(fake_pykrx) == 10 * 2
+
+    def test_fetch_axis_unlisted_ticker(self, fake_pykrx):
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-15',
+            universe=['005930', '000010'],
+            )
+        df = loader.get_data('종가')
+
+        assert df.columns.tolist() == ['005930']
+        assert PykrxOHLCV().ticker_ranges.get_ranges('000010') == [('2021-01-04', '2021-01-15')]
+
+        # The empty range is covered, so it is not fetched again.
+        fake_pykrx.clear()
+        pd.testing.assert_frame_equal(df, loader.get_data('종가'))
+        assert fake_pykrx == []
+
+    def test_adjusted_prices(self, fake_pykrx, monkeypatch):
+        # 005930 splits 1:2 on 2021-01-06: its base price is half the previous close.
+        closes = {'2021-01-04': 100, '2021-01-05': 110, '2021-01-06': 50, '2021-01-07': 52, '2021-01-08': 54, '2021-01-11': 56}
+
+        def fetch_ohlcv(self, date):
+            fake_pykrx.append((self.__class__.__name__, date))
+            return pd.DataFrame({'종가': [closes[date]], '시가': [closes[date] - 1]}, index=pd.Index(['005930'], name='티커'))
+
+        def fetch_adj_price(self, date):
+            fake_pykrx.append((self.__class__.__name__, date))
+            base = {'2021-01-06': 55}.get(date, closes.get(DateUtil.add_strdt(date, -1), closes[date]))
+            return pd.DataFrame({'시가': [base], '종가': [closes[date]]}, index=pd.Index(['005930'], name='티커'))
+
+        monkeypatch.setattr(PykrxOHLCV, '_fetch_data_one', fetch_ohlcv)
+        monkeypatch.setattr(PykrxAdjPrice, '_fetch_data_one', fetch_adj_price)
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-08')
+
+        df = loader.get_data(['종가', '수정종가', '수정시가'])
+
+        assert df['종가'].tolist() == [100, 110, 50, 52, 54]
+        assert df['수정종가'].tolist() == [50, 55, 50, 52, 54]
+        assert df['수정시가'].tolist() == [49.5, 54.5, 49, 51, 53]
+        assert kqdl.adjustment_cache.get(kqdl.BaseLocal(), 'pykrx').covered.tolist() == pd.to_datetime(list(closes)[1:-1]).date.tolist()
+
+        # The stored events serve later loads without reading the base prices again.
+        fake_pykrx.clear()
+        single = kqdl.DataLoader(source='pykrx', start_date='2021-01-05', end_date='2021-01-08').get_data('수정종가')
+        assert single['005930'].tolist() == [55, 50, 52, 54]
+        assert fake_pykrx == []
+
+        # Chunks before the split are adjusted to the loader's end_date, not their own.
+        chunks = list(loader.iter_data(['종가', '수정종가', '수정시가'], chunk='D'))
+        pd.testing.assert_frame_equal(pd.concat(chunks), df)
+
+        # Planning, estimates, updates and the catalog know the adjusted fields too.
+        explanation = loader.explain(['종가', '수정종가'])
+        assert explanation['data'].tolist() == ['종가', '수정종가', '수정종가']
+        assert explanation['reader'].tolist() == ['PykrxOHLCV', 'PykrxOHLCV', 'PykrxAdjPrice']
+        assert explanation['alternatives'].tolist() == [['PykrxAdjPrice'], [], []]
+        assert loader.estimate_cost('수정종가')['requests'].tolist() == [0, 0]
+
+        delta = loader.update('수정종가', end_date='2021-01-11')
+        assert sorted(fake_pykrx) == [('PykrxAdjPrice', '2021-01-11'), ('PykrxOHLCV', '2021-01-11')]
+        assert delta.index.tolist() == [pd.Timestamp('2021-01-11')]
+
+        catalog = kqdl.show_catalog('pykrx').set_index('data')
+        assert catalog.loc['수정종가', 'reader'] == 'PykrxOHLCV + PykrxAdjPrice'
+        assert catalog.loc['수정종가', 'n_dates'] == 6
+
+    def test_concurrent_loads_fetch_once(self, fake_pykrx, monkeypatch):
+        fetch_data_one = PykrxOHLCV._fetch_data_one
+
+        def slow_fetch_data_one(self, date):
+            time.sleep(0.02)
+            return fetch_data_one(self, date)
+
+        monkeypatch.setattr(PykrxOHLCV, '_fetch_data_one', slow_fetch_data_one)
+        loaders = [kqdl.DataLoader(source='pykrx', start_date='2021-01-04', end_date='2021-01-15', progress=False) for _ in range(3)]
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            frames = list(executor.map(lambda loader: loader.get_data('종가'), loaders))
+
+        assert sorted(fake_pykrx) == sorted(set(fake_pykrx))
+        assert len(fake_pykrx) == 10
+        assert all(frame.equals(frames[0]) for frame in frames)
+
+        sources = pd.concat([loader.stats.get_requests() for loader in loaders])['count'].groupby(level='source').sum()
+        assert sources.get('network', 0) == 10
+        assert sources.sum() == 30
+
+    def test_update_all_readers(self, fake_pykrx):
+        loader = kqdl.DataLoader(source='pykrx', start_date='2021-01-04')
+
+        delta = loader.update(end_date='2021-01-05')
+
+        assert {reader for reader, _ in fake_pykrx} == {'PykrxAdjPrice', 'PykrxOHLCV', 'PykrxMarketCap', 'PykrxFunda'}
+        assert len(delta) == 6
+
+    def test_stats_and_callbacks(self, fake_pykrx):
+        events = []
+        loader = kqdl.DataLoader(
+            source='pykrx',
+            start_date='2021-01-04',
+            end_date='2021-01-08',
+            callbacks=[events.append],
+            progress=False,
+            )
+
+        loader.get_data(['종가', 'BPS'])
+        loader.get_data('종가')
+
+        spans = loader.stats.get_spans()
+        assert {'calendar', 'plan', 'read', 'fetch', 'panel', 'filter', 'transform'} <= set(spans.index)
+        requests = loader.stats.get_requests()['count']
+        assert requests[('PykrxFunda', 'network')] == 5
+        assert requests[('PykrxOHLCV', 'network')] == 5
+        assert requests[('PykrxOHLCV', 'cache')] == 5
+        assert loader.stats.cache_hit_rate == 5 / 15
+        assert loader.stats.get_rows().loc['output', 'rows'] == 15 + 5
+        assert any(event['event'] == 'fetch_start' for event in events)
+
+def test_import_is_lazy():
+    code = (
+        'import sys, kor_quant_dataloader; '
+        'print(sorted(m for m in ("pykrx", "tqdm", "dotenv") if m in sys.modules))'
+        )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+
+    assert output.strip() == '[]'
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+
+@pytest.fixture
+def panel():
+    nan = np.nan
+    values = np.array([
+        [[1.0, nan], [nan, 2.0], [nan, nan], [nan, nan], [4.0, 0.0]], # BPS
+        [[0.0, 5.0], [6.0, nan], [nan, nan], [7.0, nan], [nan, 8.0]], # 종가
+        ])
+
+    return kqdl.Panel(values, pd.bdate_range('2021-01-04', periods=5), ['000660', '005930'], ['BPS', '종가'])
+
+class TestDataOptions:
+    def test_ffill_limit(self, panel):
+        filled = kqdl.DataOptions({'BPS': {'fill': 'ffill', 'limit': 2}}, ['BPS', '종가']).apply(panel)
+
+        assert np.array_equal(filled.values[0, :, 0], [1.0, 1.0, 1.0, np.nan, 4.0], equal_nan=True)
+        assert np.array_equal(filled.values[0, :, 1], [np.nan, 2.0, 2.0, 2.0, 0.0], equal_nan=True)
+        # Other fields and the input panel are untouched.
+        assert np.isnan(filled.values[1, 2, 0])
+        assert np.isnan(panel.values[0, 1, 0])
+
+    def test_bfill_and_fill_value(self, panel):
+        filled = kqdl.DataOptions({'fill': 'bfill', 'fill_value': -1.0}, ['BPS', '종가']).apply(panel)
+
+        assert filled.get_frame('BPS')['000660'].tolist() == [1.0, 4.0, 4.0, 4.0, 4.0]
+        assert filled.get_frame('종가')['005930'].tolist() == [5.0, 8.0, 8.0, 8.0, 8.0]
+        assert filled.get_frame('종가')['000660'].tolist() == [0.0, 6.0, 7.0, 7.0, -1.0]
+
+    def test_zero_as_nan(self, panel):
+        filled = kqdl.DataOptions({'종가': {'zero_as_nan': True, 'fill': 'ffill'}}, ['BPS', '종가']).apply(panel)
+
+        assert np.isnan(filled.values[1, 0, 0])
+        assert filled.get_frame('종가')['000660'].tolist()[1:] == [6.0, 6.0, 7.0, 7.0]
+
+    def test_holidays(self, panel):
+        holidays = np.array([False, False, True, False, False])
+        filled = kqdl.DataOptions({'holidays': 'ffill'}, ['BPS', '종가']).apply(panel, holidays=holidays)
+
+        assert np.array_equal(filled.values[:, 2], panel.values[:, 1], equal_nan=True)
+        assert np.array_equal(filled.values[:, 3], panel.values[:, 3], equal_nan=True)
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            kqdl.DataOptions({'fill': 'interpolate'}, ['BPS'])
+        with pytest.raises(ValueError):
+            kqdl.DataOptions({'PER': {'fill': 'ffill'}}, ['BPS'])
+        with pytest.raises(ValueError):
+            kqdl.DataOptions({'BPS': {'method': 'ffill'}}, ['BPS'])
+
+    def test_groups(self):
+        options = kqdl.DataOptions(
+            {'BPS': {'fill': 'ffill'}, 'PER': {'fill': 'ffill'}, '종가': {}},
+            ['BPS', 'PER', '종가'],
+            )
+
+        assert list(options.get_groups().values()) == [['BPS', 'PER']]
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+
+def make_snapshot(tickers: list, **cols) -> pd.DataFrame:
+    return pd.DataFrame(cols, index=pd.Index(tickers, name='티커'))
+
+@pytest.fixture
+def panel():
+    snapshots = [
+        ('2021-01-04', make_snapshot(['005930', '000020'], 종가=[100, 10], 거래량=[1, 2])),
+        ('2021-01-04', make_snapshot(['005930', '000020'], BPS=[5, 6])),
+        ('2021-01-05', make_snapshot(['005930', '000660'], 종가=[101, 50], 거래량=[3, 4])),
+    ]
+
+    return kqdl.Panel.from_snapshots(snapshots, fields=['종가', '거래량', 'BPS'])
+
+class TestPanel:
+    def test_from_snapshots(self, panel):
+        assert panel.shape == (3, 2, 3)
+        assert panel.tickers.tolist() == ['000020', '000660', '005930']
+        assert panel.values[0, 1].tolist()[1:] == [50, 101]
+        assert np.isnan(panel.values[0, 1, 0])
+        assert np.isnan(panel.values[2, 1]).all()
+
+    def test_get_frame_is_view(self, panel):
+        wide = panel.get_frame('종가')
+
+        assert wide.loc['2021-01-04', '005930'] == 100
+        assert np.shares_memory(wide.to_numpy(), panel.values)
+
+    def test_to_multi_is_view(self, panel):
+        multi = panel.to_multi()
+
+        assert multi.shape == (6, 3)
+        assert multi.loc[('2021-01-05', '000660'), '거래량'] == 4
+        assert multi.loc[('2021-01-04', '000020'), 'BPS'] == 6
+        assert np.shares_memory(multi.to_numpy(), panel.values)
+
+    def test_select(self, panel):
+        selected = panel.select(tickers=['005930', '000660', '999999'], fields=['종가'])
+
+        assert selected.shape == (1, 2, 2)
+        assert selected.tickers.tolist() == ['000660', '005930']
+        assert np.shares_memory(selected.values, panel.values)
+
+    def test_empty(self):
+        panel = kqdl.Panel.from_snapshots([], fields=['종가'])
+
+        assert panel.get_frame('종가').empty
+        assert panel.to_multi().empty
+
+    def test_between(self, panel):
+        between = panel.between('2021-01-05', '2021-12-31')
+
+        assert between.dates.tolist() == [pd.Timestamp('2021-01-05')]
+        assert np.shares_memory(between.values, panel.values)
+
+    def test_select_keeps_field_order(self, panel):
+        assert panel.select(fields=['BPS', '종가']).fields.tolist() == ['BPS', '종가']
+
+    def test_save_and_load_mmap(self, panel, tmp_path):
+        panel.save(str(tmp_path / 'panel'))
+        panel.save(str(tmp_path / 'panel'))
+
+        loaded = kqdl.Panel.load(str(tmp_path / 'panel'))
+        wide = loaded.between('2021-01-05').get_frame('종가')
+
+        assert isinstance(loaded.values, np.memmap)
+        assert np.shares_memory(wide.to_numpy(), loaded.values)
+        assert loaded.fields.tolist() == ['종가', '거래량', 'BPS']
+        pd.testing.assert_frame_equal(loaded.to_multi(), panel.to_multi())
+        assert sorted(p.name for p in tmp_path.iterdir()) == ['panel']
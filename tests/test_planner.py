@@ -0,0 +1,56 @@
+import pytest
+
+import kor_quant_dataloader as kqdl
+from kor_quant_dataloader.datasource.pykrx_ import (
+    PykrxReader,
+    PykrxAdjPrice,
+    PykrxOHLCV,
+    PykrxMarketCap,
+    PykrxFunda,
+)
+
+class TestFetchPlanner:
+    def test_shared_fields_use_one_reader(self):
+        plan = kqdl.FetchPlanner(PykrxReader).plan(['종가', '거래량', '거래대금', '등락률'])
+
+        assert plan.assigned == {PykrxOHLCV: ['종가', '거래량', '거래대금', '등락률']}
+        assert plan.get_cost() == 1
+
+    def test_minimal_cover(self):
+        plan = kqdl.FetchPlanner(PykrxReader).plan(['변동폭', '종가', '고가', 'BPS', '시가총액'])
+
+        assert set(plan.readers) == {PykrxAdjPrice, PykrxOHLCV, PykrxFunda, PykrxMarketCap}
+        assert plan.assigned[PykrxAdjPrice] == ['변동폭']
+        assert plan.assigned[PykrxOHLCV] == ['종가', '고가']
+
+    def test_covering_reader_is_preferred(self):
+        plan = kqdl.FetchPlanner(PykrxReader).plan(['변동폭', '종가', '거래량'])
+
+        assert plan.assigned == {PykrxAdjPrice: ['변동폭', '종가', '거래량']}
+
+    def test_explain(self):
+        explanation = kqdl.FetchPlanner(PykrxReader).plan(['BPS', '종가', 'PER']).explain()
+
+        assert explanation['data'].tolist() == ['BPS', '종가', 'PER']
+        assert explanation['reader'].tolist() == ['PykrxFunda', 'PykrxOHLCV', 'PykrxFunda']
+        assert explanation.loc[0, 'shared_with'] == ['PER']
+        assert explanation.loc[1, 'alternatives'] == ['PykrxAdjPrice']
+
+    def test_not_available(self):
+        with pytest.raises(AttributeError):
+            kqdl.FetchPlanner(PykrxReader).plan(['종가', 'NOT_A_FIELD'])
+
+class TestFetchAxisPlanner:
+    def test_small_universe_is_fetched_per_ticker(self):
+        dates = [f'2021-01-{day:02d}' for day in range(4, 16)]
+        plan = kqdl.FetchAxisPlanner().plan(PykrxOHLCV, dates, ['005930', '000660'])
+
+        assert plan.axis == 'ticker'
+        assert plan.get_cost() == 2
+
+    def test_dates_by_default(self):
+        dates = ['2021-01-04', '2021-01-05']
+
+        assert kqdl.FetchAxisPlanner().plan(PykrxOHLCV, dates, ['005930', '000660', '000020']).axis == 'date'
+        assert kqdl.FetchAxisPlanner().plan(PykrxOHLCV, dates * 10).axis == 'date'
+        assert kqdl.FetchAxisPlanner().plan(PykrxAdjPrice, dates * 10, ['005930']).axis == 'date'
@@ -0,0 +1,67 @@
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+
+def make_panel() -> kqdl.Panel:
+    values = np.arange(2 * 3 * 4, dtype='float64').reshape(2, 3, 4)
+
+    return kqdl.Panel(values, pd.bdate_range('2021-01-04', periods=3), ['A', 'B', 'C', 'D'], ['종가', 'BPS'])
+
+def sum_shared_panel(name: str) -> tuple:
+    panel = kqdl.attach_panel(name)
+
+    return float(panel.get_frame('BPS').to_numpy().sum()), panel.values.flags.writeable
+
+class TestPanelServer:
+    def test_publish_and_attach(self):
+        panel = make_panel()
+        with kqdl.PanelServer() as server:
+            server.publish('test_attach', panel)
+            shared = kqdl.attach_panel('test_attach')
+
+            assert server.names == ['test_attach']
+            assert np.array_equal(shared.values, panel.values)
+            assert shared.dates.equals(panel.dates)
+            assert shared.tickers.tolist() == ['A', 'B', 'C', 'D']
+            assert shared.fields.tolist() == ['종가', 'BPS']
+            assert shared.get_frame('BPS').loc['2021-01-05', 'B'] == 17
+
+            with pytest.raises(ValueError):
+                shared.values[0, 0, 0] = 1.0
+
+    def test_attach_from_other_processes(self):
+        panel = make_panel()
+        with kqdl.PanelServer() as server:
+            server.publish('test_workers', panel)
+
+            with multiprocessing.get_context('spawn').Pool(2) as pool:
+                results = pool.map(sum_shared_panel, ['test_workers'] * 2)
+
+        assert results == [(float(panel.values[1].sum()), False)] * 2
+
+    def test_republish_and_detach(self):
+        panel = make_panel()
+        with kqdl.PanelServer() as server:
+            server.publish('test_refresh', panel)
+            shared = kqdl.attach_panel('test_refresh')
+            assert kqdl.attach_panel('test_refresh') is shared
+
+            # A refreshed panel under the same name replaces the attached one.
+            server.unpublish('test_refresh')
+            server.publish('test_refresh', kqdl.Panel(panel.values + 100, panel.dates, panel.tickers, panel.fields))
+            refreshed = kqdl.attach_panel('test_refresh')
+
+            assert refreshed.values[0, 0, 0] == 100
+            assert shared.values[0, 0, 0] == 0
+
+            kqdl.detach_panel('test_refresh')
+            assert kqdl.attach_panel('test_refresh') is not refreshed
+            assert refreshed.get_frame('BPS').loc['2021-01-04', 'A'] == 112
+
+    def test_unknown_name(self):
+        with pytest.raises(FileNotFoundError):
+            kqdl.attach_panel('test_not_published')
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import kor_quant_dataloader as kqdl
+
+class TestLiquidityUniverse:
+    def test_from_name(self):
+        universe = kqdl.LiquidityUniverse.from_name('top500_liquidity')
+
+        assert (universe.n, universe.window, universe.lag) == (500, 20, 1)
+        assert kqdl.LiquidityUniverse.from_name('top10_liquidity_w5_l0').name == 'top10_liquidity_w5_l0'
+
+        with pytest.raises(ValueError):
+            kqdl.LiquidityUniverse.from_name('top_liquidity')
+
+    def test_compute_is_point_in_time(self):
+        dates = pd.bdate_range('2021-01-04', periods=4)
+        trading_value = pd.DataFrame(
+            {
+                'A': [100.0, 100.0, 100.0, 100.0],
+                'B': [300.0, 300.0, np.nan, np.nan], # delisted after the second day
+                'C': [np.nan, 50.0, 50.0, 500.0],    # listed on the second day
+            },
+            index=dates,
+            )
+
+        membership = kqdl.LiquidityUniverse(n=1, window=2).compute(trading_value)
+
+        # Day 1 has no history; each later day ranks the previous days' mean among listed tickers.
+        assert membership.get_tickers(dates[0]).tolist() == []
+        assert membership.get_tickers(dates[1]).tolist() == ['B']
+        assert membership.get_tickers(dates[2]).tolist() == ['A']
+        assert membership.get_tickers(dates[3]).tolist() == ['A']
+
+class TestUniverseMembership:
+    def test_arrays_roundtrip(self):
+        mask = np.random.default_rng(0).random((3, 11)) > 0.5
+        membership = kqdl.UniverseMembership(
+            mask,
+            pd.bdate_range('2021-01-04', periods=3),
+            [f'{i:06d}' for i in range(11)],
+            start_date='2021-01-04',
+            end_date='2021-01-06',
+            )
+
+        arrays = membership.to_arrays()
+        loaded = kqdl.UniverseMembership.from_arrays(arrays)
+
+        assert arrays['bits'].nbytes == 3 * 2
+        assert (loaded.mask == mask).all()
+        assert loaded.tickers.equals(membership.tickers)
+        assert loaded.covers('2021-01-05', '2021-01-06')
+        assert not loaded.covers('2021-01-05', '2021-01-07')
+
+    def test_get_mask_unknown_labels(self):
+        membership = kqdl.UniverseMembership(np.ones((1, 1), dtype=bool), pd.to_datetime(['2021-01-04']), ['A'])
+
+        mask = membership.get_mask(pd.to_datetime(['2021-01-04', '2021-01-05']), pd.Index(['A', 'B']))
+
+        assert mask.tolist() == [[True, False], [False, False]]
@@ -1,3 +1,6 @@
+import time
+
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -23,6 +26,14 @@ class TestDateUtils:
                 '2022-01-05'
                 ]
     
+    def test_split_daterange(self):
+        assert kqdl.DateUtil.split_daterange('2021-12-25', '2022-02-03', 'M') == [
+            ('2021-12-25', '2021-12-31'),
+            ('2022-01-01', '2022-01-31'),
+            ('2022-02-01', '2022-02-03'),
+            ]
+        assert kqdl.DateUtil.split_daterange('2021-12-25', '2021-12-26', 'Y') == [('2021-12-25', '2021-12-26')]
+
     def test_intdate_to_strdate(self):
         assert kqdl.DateUtil.intdate_to_strdate(20211225) == '2021-12-25'
     
@@ -39,4 +50,70 @@ class TestDateUtils:
         assert kqdl.DateUtil.add_strdt('2021-12-25', 1) == '2021-12-26'
         assert kqdl.DateUtil.add_strdt('2021-12-25', -1) == '2021-12-24'
 
-        
\ No newline at end of file
+    def test_intdates_roundtrip(self):
+        intdates = np.array([20211225, 20200229, 19991231])
+        dates = kqdl.DateUtil.intdates_to_datetime64(intdates)
+
+        assert kqdl.DateUtil.datetime64_to_strdates(dates) == ['2021-12-25', '2020-02-29', '1999-12-31']
+        assert (kqdl.DateUtil.datetime64_to_intdates(dates) == intdates).all()
+
+        with pytest.raises(ValueError):
+            kqdl.DateUtil.intdates_to_datetime64([20210229])
+
+    def test_offset_dates(self):
+        calendar = kqdl.DateUtil.strdates_to_datetime64(['2021-01-04', '2021-01-05', '2021-01-08'])
+        dates = ['2021-01-05', '2021-01-06', '2021-01-08']
+
+        assert kqdl.DateUtil.datetime64_to_strdates(kqdl.DateUtil.offset_dates(calendar, dates, 1)[:2]) == ['2021-01-08', '2021-01-08']
+        assert kqdl.DateUtil.datetime64_to_strdates(kqdl.DateUtil.offset_dates(calendar, dates, 0)) == ['2021-01-05', '2021-01-05', '2021-01-08']
+        assert np.isnat(kqdl.DateUtil.offset_dates(calendar, dates, 1)[2])
+        assert kqdl.DateUtil.slice_calendar(calendar, '2021-01-05', '2021-01-07') == slice(1, 2)
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = kqdl.TokenBucket(rate=50, capacity=5)
+
+        start = time.monotonic()
+        for _ in range(10):
+            bucket.acquire()
+        elapsed = time.monotonic() - start
+
+        # 5 tokens burst, the other 5 arrive at 50 per second.
+        assert 0.08 <= elapsed < 1.0
+
+    def test_invalid_rate(self):
+        with pytest.raises(ValueError):
+            kqdl.TokenBucket(rate=0)
+
+class TestTickerDictionary:
+    def test_codes_are_stable(self):
+        codes = kqdl.TickerDictionary.encode(['__A', '__B'])
+        later = kqdl.TickerDictionary.encode(['__C', '__A'])
+
+        assert later[1] == codes[0]
+        assert kqdl.TickerDictionary.get_dtype().categories[later[0]] == '__C'
+
+class TestPdOps:
+    def test_concat_molten_keeps_categoricals(self):
+        first = pd.DataFrame({
+            'date': pd.to_datetime(['2021-01-04']),
+            'ticker': kqdl.TickerDictionary.to_categorical(['__A']),
+            'data': pd.Categorical(['종가']),
+            'value': [1.0],
+            })
+        second = pd.DataFrame({
+            'date': pd.to_datetime(['2021-01-05']),
+            'ticker': kqdl.TickerDictionary.to_categorical(['__D']),
+            'data': pd.Categorical(['BPS']),
+            'value': [2.0],
+            })
+
+        concat = kqdl.PdOps.concat_molten([first, second])
+
+        assert isinstance(concat['ticker'].dtype, pd.CategoricalDtype)
+        assert concat['ticker'].tolist() == ['__A', '__D']
+        assert concat['data'].tolist() == ['종가', 'BPS']
+        assert concat.columns.tolist() == kqdl.PdOps.MOLTEN_COLUMNS
+
+    def test_concat_molten_empty(self):
+        assert kqdl.PdOps.concat_molten([]).columns.tolist() == kqdl.PdOps.MOLTEN_COLUMNS